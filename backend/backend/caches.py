@@ -0,0 +1,22 @@
+# backend/backend/caches.py
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Backends whose contents each worker process keeps to itself.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_process_local(alias):
+    return isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+def shares_state(alias):
+    """
+    Whether state kept in cache `alias` (version counters, sticky-primary
+    markers) is seen by every worker. A process-local cache is accepted only
+    while ALLOW_PROCESS_LOCAL_CACHES is set, i.e. for a single-process
+    development server.
+    """
+    return settings.ALLOW_PROCESS_LOCAL_CACHES or not is_process_local(alias)
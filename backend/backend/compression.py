@@ -0,0 +1,169 @@
+# backend/backend/compression.py
+import gzip
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+def available_encodings():
+    # In order of preference when the client accepts several equally.
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(request):
+    """
+    The content-coding to use for `request` according to its
+    Accept-Encoding header, or None to send the response uncompressed.
+    """
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    weights = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available_encodings():
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(content, encoding, level=None):
+    if level is None:
+        level = settings.COMPRESSION_LEVELS[encoding]
+    if encoding == 'br':
+        return brotli.compress(content, quality=level)
+    # A zero mtime makes equal input give equal bytes.
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def _stream_compressor(encoding):
+    level = settings.COMPRESSION_LEVELS[encoding]
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def compress_stream(chunks, encoding):
+    # One compressor for the whole stream; output is yielded whenever the
+    # compressor has filled a block, so memory stays flat for any length.
+    process, finish = _stream_compressor(encoding)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_stream(chunks, encoding):
+    # compress_stream for the async iterators of async streaming responses.
+    process, finish = _stream_compressor(encoding)
+    async for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type.startswith(settings.COMPRESSION_CONTENT_TYPES)
+
+
+def encoded_etag(etag, encoding):
+    # A compressed body is a different representation, so a strong tag gets
+    # the coding appended (`"3-<digest>-gzip"`) rather than being weakened:
+    # it stays usable as If-Match. Weak tags match either way.
+    if etag.startswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def decoded_etag(etag):
+    # The tag of the identity representation behind `etag`.
+    for encoding in ('br', 'gzip'):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return f'{etag[:-len(suffix)]}"'
+    return etag
+
+
+def set_encoding(response, encoding):
+    response['Content-Encoding'] = encoding
+    etag = response.get('ETag')
+    if etag:
+        response['ETag'] = encoded_etag(etag, encoding)
+
+
+class CompressionMiddleware:
+    # Negotiated gzip (and brotli, when the `brotli` package is installed)
+    # for responses of COMPRESSION_CONTENT_TYPES (the API's JSON, NDJSON and
+    # CSV) of at least COMPRESSION_MIN_SIZE bytes.
+    # Streaming responses are compressed chunk by chunk. Responses that
+    # already carry a Content-Encoding, such as the pre-compressed payloads
+    # served by inventory.cache.CachedReadMixin, pass through untouched.
+    # Runs natively under both WSGI and ASGI.
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if not settings.COMPRESSION_ENABLED or not is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if response.has_header('Content-Encoding'):
+            return response
+
+        encoding = negotiate_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(response.streaming_content, encoding)
+            del response['Content-Length']
+            set_encoding(response, encoding)
+            return response
+
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        set_encoding(response, encoding)
+        return response
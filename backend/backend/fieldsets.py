@@ -0,0 +1,128 @@
+# backend/backend/fieldsets.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+
+
+class SparseFieldsetSerializerMixin:
+    # `Serializer(..., fields=('id', 'name'))` keeps only the named fields;
+    # the rest of the representation keeps its declared order.
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def readable_fields(serializer_class):
+    return [name for name, field in serializer_class().fields.items() if not field.write_only]
+
+
+def sparse_fields(request, serializer_class):
+    """
+    The field names requested with `?fields=a,b`, in declaration order, or
+    None when every field should be returned. Only reads are narrowed; a
+    write always answers with the full representation.
+    """
+    if request.method not in SAFE_METHODS:
+        return None
+    raw = request.query_params.get(FIELDS_PARAM, '')
+    requested = {name.strip() for name in raw.split(',') if name.strip()}
+    if not requested:
+        return None
+    available = readable_fields(serializer_class)
+    unknown = sorted(requested.difference(available))
+    if unknown:
+        raise serializers.ValidationError({
+            FIELDS_PARAM: [f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}."]
+        })
+    return tuple(name for name in available if name in requested)
+
+
+def _model_path(model, attrs):
+    # The ORM path for a dotted serializer source, or None when it is not a
+    # chain of concrete fields (a method, property or reverse relation).
+    for position, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete:
+            return None
+        if position < len(attrs) - 1:
+            if not field.is_relation or field.many_to_many:
+                return None
+            model = field.related_model
+    return '__'.join(attrs)
+
+
+def project_queryset(queryset, serializer_class, fields, dependencies=None, extra=()):
+    """
+    Restrict `queryset` with `.only()` to the columns the `fields` subset of
+    `serializer_class` reads, plus `extra` (e.g. pagination ordering).
+    `dependencies` maps a field whose source is not a column to the columns
+    it reads (Product.is_low_stock reads quantity and stock_threshold). A
+    field that cannot be mapped leaves the queryset unprojected.
+
+    Relations that are no longer read are dropped from select_related();
+    the ones still read stay joined.
+    """
+    if fields is None:
+        return queryset
+    dependencies = dependencies or {}
+    model = queryset.model
+    serializer_fields = serializer_class(fields=fields).fields
+    columns = []
+    for name, field in serializer_fields.items():
+        if name in dependencies:
+            columns.extend(dependencies[name])
+            continue
+        path = _model_path(model, field.source_attrs)
+        if path is None:
+            return queryset
+        columns.append(path)
+    columns.extend(name for name in extra if _model_path(model, name.split('__')) is not None)
+
+    relations = set()
+    for column in columns:
+        parts = column.split('__')
+        for depth in range(1, len(parts)):
+            relations.add('__'.join(parts[:depth]))
+    # A relation traversed by select_related() cannot also be deferred.
+    columns.extend(sorted(relations))
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*sorted(relations))
+    return queryset.only(*dict.fromkeys(columns))
+
+
+class SparseFieldsetMixin:
+    # Generic views: `?fields=` narrows get_serializer() and the filtered
+    # queryset. `field_dependencies` is passed through to project_queryset().
+
+    field_dependencies = {}
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = sparse_fields(self.request, self.get_serializer_class())
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        extra = ()
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            # Keyset cursors read the ordering columns from the last row.
+            extra = [field.lstrip('-') for field in self.paginator.get_ordering(self.request, queryset, self)]
+        return project_queryset(queryset, self.get_serializer_class(), fields, self.field_dependencies, extra)
@@ -0,0 +1,159 @@
+# backend/backend/replicas.py
+import hashlib
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+from .caches import shares_state
+
+PINNED_COOKIE = 'primary_until'
+
+# The replica a safe-method request reads from while it is handled, or
+# None. One per request, so every read of a response (its body and its
+# ETag/Last-Modified) sees the same point in the primary's history.
+_replica = ContextVar('replica', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+def reading_from_replicas():
+    return _replica.get() is not None
+
+
+def _pin_key(request):
+    # The client as the API sees it: its bearer token, else its session,
+    # else its address.
+    raw = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    return f'replicas:pinned:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+
+def _pinned_by_cookie(request):
+    try:
+        return float(request.COOKIES.get(PINNED_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def is_pinned(request):
+    if _pinned_by_cookie(request):
+        return True
+    return bool(caches[settings.DATABASE_REPLICA_STICKY_CACHE].get(_pin_key(request)))
+
+
+async def ais_pinned(request):
+    if _pinned_by_cookie(request):
+        return True
+    return bool(await caches[settings.DATABASE_REPLICA_STICKY_CACHE].aget(_pin_key(request)))
+
+
+def _set_pin_cookie(response, window):
+    response.set_cookie(PINNED_COOKIE, f'{time.time() + window:.3f}', max_age=window, httponly=True, samesite='Lax')
+
+
+def pin_to_primary(request, response):
+    # The client reads from the primary until the replicas have had time to
+    # catch up with its write. The cookie covers browsers across processes;
+    # the cache entry covers token clients that ignore cookies.
+    window = settings.DATABASE_REPLICA_STICKY_SECONDS
+    caches[settings.DATABASE_REPLICA_STICKY_CACHE].set(_pin_key(request), True, window)
+    _set_pin_cookie(response, window)
+
+
+async def apin_to_primary(request, response):
+    window = settings.DATABASE_REPLICA_STICKY_SECONDS
+    await caches[settings.DATABASE_REPLICA_STICKY_CACHE].aset(_pin_key(request), True, window)
+    _set_pin_cookie(response, window)
+
+
+class ReplicaRouter:
+    # Reads made while a replica-eligible request is handled go to the
+    # replica ReplicaRoutingMiddleware picked for it; everything else, and
+    # every write, uses the primary. Replicas get their schema through replication, so
+    # nothing is migrated on them.
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so an instance loaded from a replica is saved to the
+        # primary rather than back where it came from.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    # Marks safe-method requests under DATABASE_REPLICA_URL_PREFIXES as
+    # replica reads, unless the client wrote within the last
+    # DATABASE_REPLICA_STICKY_SECONDS. A successful write under those
+    # prefixes pins the client to the primary for that window. The pin of a
+    # token client lives in DATABASE_REPLICA_STICKY_CACHE; if that cache is
+    # per process, another worker would not see it, so every read stays on
+    # the primary. An eligible request reads from one replica, picked at
+    # random, for all of its queries. Runs natively under both WSGI and ASGI.
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def routes(self, request):
+        return (
+            bool(replica_aliases())
+            and request.path.startswith(tuple(settings.DATABASE_REPLICA_URL_PREFIXES))
+            and shares_state(settings.DATABASE_REPLICA_STICKY_CACHE)
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.routes(request):
+            return self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        token = _replica.set(random.choice(replica_aliases()) if safe and not is_pinned(request) else None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+        if not safe and response.status_code < 400:
+            pin_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        if not self.routes(request):
+            return await self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        token = _replica.set(random.choice(replica_aliases()) if safe and not await ais_pinned(request) else None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.reset(token)
+        if not safe and response.status_code < 400:
+            await apin_to_primary(request, response)
+        return response
@@ -35,6 +35,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.compression.CompressionMiddleware',
+    'backend.replicas.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,8 +70,58 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    # Write-behind sale queue (inventory/sale_queue.py); migrate it with
+    # `manage.py migrate --database sale_queue`.
+    'sale_queue': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('SALE_QUEUE_DB_PATH', BASE_DIR / 'sale_queue.sqlite3'),
+    },
+}
+
+# Read replicas (backend/replicas.py). DATABASE_REPLICA_PATHS lists SQLite
+# files, comma separated, that replicate `default` (for local testing, copies
+# of it); a PostgreSQL deployment adds its replica entries to DATABASES and
+# names them in DATABASE_REPLICAS instead. Safe requests under the URL
+# prefixes read from one random replica each, except for a client that wrote in
+# the last DATABASE_REPLICA_STICKY_SECONDS.
+DATABASE_REPLICAS = []
+for index, path in enumerate(filter(None, os.getenv('DATABASE_REPLICA_PATHS', '').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path.strip(),
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+DATABASE_REPLICA_URL_PREFIXES = ('/api/inventory/', '/api/user/users/', '/api/user/profile/')
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv('DATABASE_REPLICA_STICKY_SECONDS', 10))
+# Must be shared by all processes (e.g. Redis, see INVENTORY_CACHE_BACKENDS)
+# so the pin survives a request landing on another worker; with a
+# process-local cache reads stay on the primary (see ALLOW_PROCESS_LOCAL_CACHES).
+DATABASE_REPLICA_STICKY_CACHE = os.getenv('DATABASE_REPLICA_STICKY_CACHE', 'default')
+
+DATABASE_ROUTERS = ['inventory.routers.SaleQueueRouter', 'backend.replicas.ReplicaRouter']
+
+# DATABASE_PROFILE=production tunes every SQLite database for concurrent
+# use (backend/sqlite.py): WAL journaling, the pragmas below on each new
+# connection, and persistent connections that are health-checked before
+# reuse. The default profile keeps Django's stock settings.
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'development')
+DATABASE_CONN_MAX_AGE = int(os.getenv('DATABASE_CONN_MAX_AGE', 600))
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    # Durable at every checkpoint; a power loss can only drop the last
+    # commits, never corrupt the file.
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    # Negative cache_size is in KiB.
+    'cache_size': -int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'temp_store': 'MEMORY',
 }
+if DATABASE_PROFILE == 'production':
+    for database in DATABASES.values():
+        database.update(CONN_MAX_AGE=DATABASE_CONN_MAX_AGE, CONN_HEALTH_CHECKS=True, PRAGMAS=SQLITE_PRAGMAS)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -133,11 +185,15 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 REST_FRAMEWORK = {
+    # Dispatches on the Authorization scheme to Token, JWT (cached user),
+    # OAuth2 or Session authentication; see user_module/authentication.py.
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'user_module.authentication.SchemeDispatchAuthentication',
+    ],
+    # orjson-backed JSONRenderer with identical output; see inventory/renderers.py.
+    'DEFAULT_RENDERER_CLASSES': [
+        'inventory.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -154,6 +210,82 @@ REST_FRAMEWORK = {
     },
 }
 
+INVENTORY_PAGE_SIZE = int(os.getenv('INVENTORY_PAGE_SIZE', 50))
+INVENTORY_MAX_PAGE_SIZE = int(os.getenv('INVENTORY_MAX_PAGE_SIZE', 500))
+INVENTORY_BULK_SALE_MAX_ITEMS = int(os.getenv('INVENTORY_BULK_SALE_MAX_ITEMS', 10000))
+# List views serialize values_list rows with compiled serializers
+# (inventory/fast_serializers.py) instead of model instances.
+INVENTORY_FAST_SERIALIZATION = os.getenv('INVENTORY_FAST_SERIALIZATION', 'True') == 'True'
+# Checkout holds (inventory/reservations.py): default and longest TTL in
+# seconds, and how many expired holds the sweeper releases per transaction.
+INVENTORY_RESERVATION_TTL = int(os.getenv('INVENTORY_RESERVATION_TTL', 900))
+INVENTORY_RESERVATION_MAX_TTL = int(os.getenv('INVENTORY_RESERVATION_MAX_TTL', 3600))
+INVENTORY_RESERVATION_SWEEP_BATCH = int(os.getenv('INVENTORY_RESERVATION_SWEEP_BATCH', 500))
+# Async-accept mode for sale creation: validate against a cached stock
+# view, queue, answer 202 with a receipt, and let `manage.py
+# process_sale_queue` record the sales in batches.
+INVENTORY_SALE_QUEUE_ENABLED = os.getenv('INVENTORY_SALE_QUEUE_ENABLED', 'False') == 'True'
+INVENTORY_SALE_QUEUE_BATCH = int(os.getenv('INVENTORY_SALE_QUEUE_BATCH', 500))
+# A batch claimed this many seconds ago by a worker that never finished it
+# is looked at again.
+INVENTORY_SALE_QUEUE_CLAIM_TIMEOUT = int(os.getenv('INVENTORY_SALE_QUEUE_CLAIM_TIMEOUT', 300))
+
+# Response compression (backend/compression.py). Brotli is offered when the
+# `brotli` package is installed; gzip otherwise. Cached responses are stored
+# pre-compressed at the higher PRECOMPRESS levels.
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True') == 'True'
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+# API payloads only. HTML pages (admin, login, the browsable API) carry the
+# CSRF token, and compressing them without length masking would reopen
+# BREACH; the CSV exports hold no secrets.
+COMPRESSION_CONTENT_TYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+COMPRESSION_LEVELS = {'gzip': 6, 'br': 5}
+COMPRESSION_PRECOMPRESS_LEVELS = {'gzip': 9, 'br': 9}
+
+# State other workers must see (cache version counters, sticky-primary pins)
+# may live in a per-process cache (LocMem, Dummy) only on a single-process
+# development server; otherwise the features depending on it turn off.
+ALLOW_PROCESS_LOCAL_CACHES = os.getenv('ALLOW_PROCESS_LOCAL_CACHES', str(DEBUG)) == 'True'
+
+# Read-through response cache (inventory/cache.py). 'locmem' is per process,
+# so the cache is off under several workers unless ALLOW_PROCESS_LOCAL_CACHES;
+# 'file' and 'database' are shared by every worker on the host (or database),
+# 'redis' across hosts (needs the `redis` package). 'database' needs
+# `manage.py createcachetable`.
+INVENTORY_CACHE_ALIAS = 'inventory'
+INVENTORY_CACHE_ENABLED = os.getenv('INVENTORY_CACHE_ENABLED', 'True') == 'True'
+INVENTORY_CACHE_MAX_ENTRY_BYTES = int(os.getenv('INVENTORY_CACHE_MAX_ENTRY_BYTES', 512 * 1024))
+INVENTORY_CACHE_BACKEND = os.getenv('INVENTORY_CACHE_BACKEND', 'locmem')
+INVENTORY_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'inventory'),
+    'file': ('inventory.cache.LRUFileBasedCache', str(BASE_DIR / 'cache' / 'inventory')),
+    'database': ('django.core.cache.backends.db.DatabaseCache', 'inventory_cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    INVENTORY_CACHE_ALIAS: {
+        'BACKEND': INVENTORY_CACHE_BACKENDS[INVENTORY_CACHE_BACKEND][0],
+        'LOCATION': os.getenv('INVENTORY_CACHE_LOCATION', INVENTORY_CACHE_BACKENDS[INVENTORY_CACHE_BACKEND][1]),
+        'TIMEOUT': int(os.getenv('INVENTORY_CACHE_TIMEOUT', 600)),
+        # Redis evicts by its own maxmemory policy and takes OPTIONS as
+        # connection-pool arguments.
+        'OPTIONS': {} if INVENTORY_CACHE_BACKEND == 'redis' else {
+            'MAX_ENTRIES': int(os.getenv('INVENTORY_CACHE_MAX_ENTRIES', 5000)),
+            # Evict the least recently used tenth once full.
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+
+# CachedJWTAuthentication keeps resolved users in-process this many seconds
+# (0 disables); other workers see user edits within the TTL.
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 30))
+AUTH_USER_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_USER_CACHE_MAX_ENTRIES', 10000))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=14),
@@ -0,0 +1,34 @@
+# backend/backend/sqlite.py
+from django.conf import settings
+
+
+def pragma_statements(pragmas):
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def configure_connection(sender, connection, **kwargs):
+    """
+    connection_created receiver: applies the `PRAGMAS` mapping of a SQLite
+    entry in DATABASES (set by the production profile in settings) to every
+    new connection. journal_mode=WAL is stored in the database file; the
+    others are per connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(pragmas):
+            cursor.execute(statement)
+
+
+def production_profile(database):
+    # What DATABASE_PROFILE=production does to each DATABASES entry; used
+    # to build tuned aliases at runtime (e.g. benchmark_sqlite).
+    return {
+        **database,
+        'CONN_MAX_AGE': settings.DATABASE_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'PRAGMAS': dict(settings.SQLITE_PRAGMAS),
+    }
@@ -8,6 +8,7 @@ urlpatterns = [
 
     path('api/user/', include('user_module.urls')),
     path('api/inventory/', include('inventory.urls')),
+    path('api/inventory/async/', include('inventory.async_urls')),
 
     path('o/', include('oauth2_provider.urls', namespace='oauth2_provider')),
         
@@ -0,0 +1,186 @@
+# backend/inventory/analytics.py
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Sale, SaleDailySummary
+
+INTERVALS = {
+    'day': lambda: F('date'),
+    'week': lambda: TruncWeek('date'),
+    'month': lambda: TruncMonth('date'),
+}
+
+GROUPS = {
+    'product': ('product', 'product__name'),
+    'category': ('category', 'category__name'),
+    'user': ('sold_by', 'sold_by__username'),
+    'total': (),
+}
+
+REBUILD_BATCH_SIZE = 1000
+CENTS = Decimal('0.01')
+
+
+def rollup_sales(sales, sign=1, category_ids=None):
+    # Fold sales into their daily summary rows; sign=-1 takes them back out.
+    # `category_ids` maps product id -> category id when sales were built
+    # without a product instance (the bulk path).
+    deltas = defaultdict(lambda: [0, Decimal('0'), 0])
+    for sale in sales:
+        category_id = category_ids[sale.product_id] if category_ids else sale.product.category_id
+        key = (timezone.localdate(sale.sale_date), sale.product_id, category_id, sale.sold_by_id)
+        delta = deltas[key]
+        delta[0] += sign * sale.quantity_sold
+        delta[1] += sign * sale.total_price
+        delta[2] += sign
+    _apply_deltas(deltas)
+
+
+def _apply_deltas(deltas):
+    # One SELECT for the rows that exist, one CASE UPDATE for them and one
+    # INSERT for the rest, however many (date, product, seller) groups a
+    # batch of sales touches.
+    if not deltas:
+        return
+    existing = {
+        (summary.date, summary.product_id, summary.sold_by_id): summary
+        for summary in SaleDailySummary.objects.filter(
+            date__in={key[0] for key in deltas}, product_id__in={key[1] for key in deltas},
+        ).only('date', 'product_id', 'sold_by_id')
+    }
+    updated = []
+    created = []
+    for (date, product_id, category_id, sold_by_id), (units, revenue, count) in deltas.items():
+        summary = existing.get((date, product_id, sold_by_id))
+        if summary is None:
+            created.append(SaleDailySummary(
+                date=date, product_id=product_id, category_id=category_id, sold_by_id=sold_by_id,
+                units_sold=units, revenue=revenue, sale_count=count,
+            ))
+            continue
+        summary.units_sold = F('units_sold') + units
+        summary.revenue = F('revenue') + revenue
+        summary.sale_count = F('sale_count') + count
+        updated.append(summary)
+
+    if updated:
+        SaleDailySummary.objects.bulk_update(updated, ['units_sold', 'revenue', 'sale_count'])
+    if not created:
+        return
+    try:
+        with transaction.atomic():
+            SaleDailySummary.objects.bulk_create(created)
+    except IntegrityError:
+        # A concurrent sale created one of the rows first.
+        for summary in created:
+            _apply_delta(
+                summary.date, summary.product_id, summary.category_id, summary.sold_by_id,
+                summary.units_sold, summary.revenue, summary.sale_count,
+            )
+
+
+def _apply_delta(date, product_id, category_id, sold_by_id, units, revenue, count):
+    # The unique constraints make this match at most one row, including for
+    # sales whose seller was deleted (sold_by_id None).
+    summary = SaleDailySummary.objects.filter(date=date, product_id=product_id, sold_by_id=sold_by_id)
+    changes = {
+        'units_sold': F('units_sold') + units,
+        'revenue': F('revenue') + revenue,
+        'sale_count': F('sale_count') + count,
+    }
+    if summary.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            SaleDailySummary.objects.create(
+                date=date, product_id=product_id, category_id=category_id, sold_by_id=sold_by_id,
+                units_sold=units, revenue=revenue, sale_count=count,
+            )
+    except IntegrityError:
+        # A concurrent sale created the row first.
+        summary.update(**changes)
+
+
+@transaction.atomic
+def detach_seller_summaries(user_id):
+    # pre_delete receiver body for a user: folds their rows into the
+    # unattributed (sold_by NULL) rows of the same day and product, which is
+    # where their sales count once Sale.sold_by is set to NULL, instead of
+    # letting SET_NULL create a second NULL row per day and product.
+    rows = list(SaleDailySummary.objects.filter(sold_by_id=user_id))
+    if not rows:
+        return
+    _apply_deltas({
+        (row.date, row.product_id, row.category_id, None): (row.units_sold, row.revenue, row.sale_count)
+        for row in rows
+    })
+    SaleDailySummary.objects.filter(pk__in=[row.pk for row in rows]).delete()
+
+
+@transaction.atomic
+def rebuild_daily_summaries(date_from=None, date_to=None):
+    summaries = SaleDailySummary.objects.all()
+    sales = Sale.objects.annotate(day=TruncDate('sale_date'))
+    if date_from:
+        summaries = summaries.filter(date__gte=date_from)
+        sales = sales.filter(day__gte=date_from)
+    if date_to:
+        summaries = summaries.filter(date__lte=date_to)
+        sales = sales.filter(day__lte=date_to)
+    summaries.delete()
+
+    rows = (
+        sales.values('day', 'product', 'product__category', 'sold_by')
+        .annotate(units=Sum('quantity_sold'), revenue=Sum('total_price'), count=Count('id'))
+        .order_by()
+    )
+    created = 0
+    batch = []
+    for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+        batch.append(SaleDailySummary(
+            date=row['day'], product_id=row['product'], category_id=row['product__category'],
+            sold_by_id=row['sold_by'], units_sold=row['units'], revenue=row['revenue'], sale_count=row['count'],
+        ))
+        if len(batch) == REBUILD_BATCH_SIZE:
+            SaleDailySummary.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        SaleDailySummary.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def sales_summary(group_by='product', interval='day', date_from=None, date_to=None):
+    queryset = SaleDailySummary.objects.all()
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+
+    fields = GROUPS[group_by]
+    rows = (
+        queryset.annotate(period=INTERVALS[interval]())
+        .values('period', *fields)
+        .annotate(units_sold=Sum('units_sold'), revenue=Sum('revenue'), sale_count=Sum('sale_count'))
+        .filter(sale_count__gt=0)
+        .order_by('period', *fields[:1])
+    )
+    results = []
+    for row in rows:
+        item = {
+            'period': row['period'].isoformat() if hasattr(row['period'], 'isoformat') else row['period'],
+            'units_sold': row['units_sold'],
+            'revenue': str(Decimal(row['revenue']).quantize(CENTS)),
+            'sale_count': row['sale_count'],
+        }
+        if fields:
+            item[group_by] = row[fields[0]]
+            item[f'{group_by}_name'] = row[fields[1]]
+        results.append(item)
+    return results
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class InventoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'inventory'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from backend.sqlite import configure_connection
+        from . import signals  # noqa: F401
+
+        connection_created.connect(configure_connection, dispatch_uid='backend.sqlite.configure_connection')
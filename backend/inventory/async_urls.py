@@ -0,0 +1,21 @@
+# backend/inventory/async_urls.py
+from django.urls import path
+from .async_views import (
+    AsyncCategoryListAPIView, AsyncCategoryDetailAPIView,
+    AsyncProductListAPIView, AsyncProductDetailAPIView, AsyncLowStockProductsAPIView,
+    AsyncSaleListAPIView, AsyncSaleDetailAPIView
+)
+
+# GET-only mirrors of the inventory read endpoints, served natively under ASGI.
+urlpatterns = [
+
+    path('categories/', AsyncCategoryListAPIView.as_view(), name='async-category-list'),
+    path('categories/<int:pk>/', AsyncCategoryDetailAPIView.as_view(), name='async-category-detail'),
+
+    path('products/', AsyncProductListAPIView.as_view(), name='async-product-list'),
+    path('products/<int:pk>/', AsyncProductDetailAPIView.as_view(), name='async-product-detail'),
+    path('products/low-stock/', AsyncLowStockProductsAPIView.as_view(), name='async-product-low-stock'),
+
+    path('sales/', AsyncSaleListAPIView.as_view(), name='async-sale-list'),
+    path('sales/<int:pk>/', AsyncSaleDetailAPIView.as_view(), name='async-sale-detail'),
+]
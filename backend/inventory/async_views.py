@@ -0,0 +1,257 @@
+# backend/inventory/async_views.py
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count
+from django.http import Http404, HttpResponse
+from django.views import View
+from django_filters.utils import translate_validation
+from rest_framework import exceptions, permissions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .conditional import (
+    is_not_modified, make_validators, not_modified_etag, set_validators, validator_values, validators_queryset,
+)
+from .fast_serializers import compile_serializer
+from .filters import ProductFilter, SaleFilter
+from .models import Category, Product, Sale
+from .pagination import KeysetPagination
+from .renderers import ORJSONRenderer
+from .serializers import CategorySerializer, ProductSerializer, SaleSerializer
+from backend.fieldsets import project_queryset, sparse_fields
+from user_module.permissions import IsAdminUser
+
+
+class AsyncAPIView(View):
+    # ASGI-native counterpart of the read-only DRF views: authentication,
+    # permissions, filtering, ETags and the response envelope behave the
+    # same, but rows are fetched with the async ORM so a request waiting on
+    # the database does not hold a worker thread. Only GET is served; writes
+    # stay on the DRF views.
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = [permissions.IsAuthenticated]
+    queryset = None
+    serializer_class = None
+    filterset_class = None
+    conditional_related = ()
+    conditional_version = False
+    field_dependencies = {}
+    message = ''
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        try:
+            # Authenticators and filter validation are synchronous and may
+            # touch the database, so they share one hop to the sync thread.
+            self.base_queryset = await sync_to_async(self.initial)(self.request)
+            return await super().dispatch(request, *args, **kwargs)
+        except Http404 as exc:
+            return self.handle_exception(exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    def initial(self, request):
+        self.check_permissions(request)
+        self.fields = sparse_fields(request, self.serializer_class)
+        return self.project_queryset(self.filter_queryset(self.get_queryset()))
+
+    def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    def handle_exception(self, exc):
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(detail, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticators = self.request.authenticators
+            if authenticators:
+                response.status_code = status.HTTP_401_UNAUTHORIZED
+                response['WWW-Authenticate'] = authenticators[0].authenticate_header(self.request)
+            else:
+                response.status_code = status.HTTP_403_FORBIDDEN
+        return response
+
+    def render(self, data, status=status.HTTP_200_OK):
+        # Same renderer as the DRF views, so both stacks emit identical bytes.
+        return HttpResponse(ORJSONRenderer().render(data), status=status, content_type='application/json')
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def filter_queryset(self, queryset):
+        if self.filterset_class is None:
+            return queryset
+        filterset = self.filterset_class(self.request.query_params, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return filterset.qs
+
+    def project_queryset(self, queryset, extra=()):
+        return project_queryset(queryset, self.serializer_class, self.fields, self.field_dependencies, extra)
+
+    def serialize(self, instance, many=False):
+        if self.fields is None:
+            return self.serializer_class(instance, many=many).data
+        return self.serializer_class(instance, many=many, fields=self.fields).data
+
+    async def conditional_response(self, queryset, build):
+        values = validator_values(
+            await validators_queryset(
+                queryset, self.conditional_related, version=self.conditional_version and 'pk' in self.kwargs,
+            ).afirst(),
+            self.conditional_related,
+        )
+        if values['count'] == 0 and 'pk' in self.kwargs:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        etag, last_modified = make_validators(self.request, values, self.conditional_related)
+        if is_not_modified(self.request, etag, last_modified):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            etag = not_modified_etag(self.request, etag)
+        else:
+            response = self.render(await build())
+        set_validators(response, etag, last_modified)
+        return response
+
+
+class AsyncListAPIView(AsyncAPIView):
+    pagination_class = KeysetPagination
+    fast_value_sources = {}
+
+    def project_queryset(self, queryset):
+        extra = ()
+        if self.pagination_class is not None:
+            ordering = self.pagination_class().get_ordering(self.request, queryset, self)
+            extra = [field.lstrip('-') for field in ordering]
+        return super().project_queryset(queryset, extra)
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.base_queryset
+        return await self.conditional_response(queryset, lambda: self.list(queryset))
+
+    async def list(self, queryset):
+        paginator = self.pagination_class() if self.pagination_class is not None else None
+        if getattr(settings, 'INVENTORY_FAST_SERIALIZATION', True):
+            # Same compiled values_list path as FastListSerializationMixin.
+            compiled = compile_serializer(self.serializer_class, self.fast_value_sources, self.fields)
+            extra = [field.lstrip('-') for field in paginator.get_ordering(self.request, queryset, self)] if paginator else ()
+            queryset = compiled.values(queryset, extra)
+            serialize = compiled.many
+        else:
+            def serialize(rows):
+                return self.serialize(rows, many=True)
+
+        if paginator is None:
+            data = serialize([row async for row in queryset.aiterator()])
+            return {'success': True, 'message': self.message, 'data': data, 'count': len(data)}
+
+        page = await paginator.apaginate_queryset(queryset, self.request, self)
+        return {
+            'success': True,
+            'message': self.message,
+            'data': paginator.get_paginated_response(serialize(page)).data,
+        }
+
+
+class AsyncRetrieveAPIView(AsyncAPIView):
+
+    async def get(self, request, pk, *args, **kwargs):
+        queryset = self.base_queryset.filter(pk=pk)
+        return await self.conditional_response(queryset, lambda: self.retrieve(queryset))
+
+    async def retrieve(self, queryset):
+        try:
+            instance = await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        return {'success': True, 'message': self.message, 'data': self.serialize(instance)}
+
+
+class AsyncCategoryListAPIView(AsyncListAPIView):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    pagination_class = None
+    message = 'Categories retrieved successfully'
+
+
+class AsyncCategoryDetailAPIView(AsyncRetrieveAPIView):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    message = 'Category retrieved successfully'
+
+
+class AsyncProductListAPIView(AsyncListAPIView):
+    queryset = Product.objects.with_related()
+    serializer_class = ProductSerializer
+    filterset_class = ProductFilter
+    conditional_related = ('category',)
+    fast_value_sources = {'is_low_stock': 'low_stock'}
+    field_dependencies = {'low_stock': ('quantity', 'stock_threshold')}
+    message = 'Products retrieved successfully'
+
+    def get_pagination_ordering(self):
+        if self.request.query_params.get('search', '').strip():
+            return ('-search_rank', '-id')
+        return KeysetPagination.ordering
+
+
+class AsyncProductDetailAPIView(AsyncRetrieveAPIView):
+    queryset = Product.objects.with_related()
+    serializer_class = ProductSerializer
+    conditional_related = ('category',)
+    conditional_version = True
+    field_dependencies = {'low_stock': ('quantity', 'stock_threshold')}
+    message = 'Product retrieved successfully'
+
+
+class AsyncLowStockProductsAPIView(AsyncListAPIView):
+    queryset = Product.objects.with_related().low_stock()
+    serializer_class = ProductSerializer
+    pagination_class = None
+    conditional_related = ('category',)
+    fast_value_sources = {'is_low_stock': 'low_stock'}
+    field_dependencies = {'low_stock': ('quantity', 'stock_threshold')}
+    message = 'Low stock products retrieved successfully'
+
+    async def list(self, queryset):
+        body = await super().list(queryset)
+        category_counts = (
+            Product.objects.low_stock()
+            .values('category', 'category__name')
+            .annotate(count=Count('id'))
+            .order_by('category__name')
+        )
+        body['category_counts'] = [
+            {'category': row['category'], 'category_name': row['category__name'], 'count': row['count']}
+            async for row in category_counts
+        ]
+        return body
+
+
+class AsyncSaleListAPIView(AsyncListAPIView):
+    queryset = Sale.objects.with_related()
+    serializer_class = SaleSerializer
+    permission_classes = [IsAdminUser]
+    filterset_class = SaleFilter
+    conditional_related = ('product', 'sold_by')
+    message = 'Sales retrieved successfully'
+
+    def filter_queryset(self, queryset):
+        # SearchFilter on product__name, as on SaleListCreateAPIView.
+        queryset = super().filter_queryset(queryset)
+        search = self.request.query_params.get(api_settings.SEARCH_PARAM, '')
+        for term in search.replace(',', ' ').split():
+            queryset = queryset.filter(product__name__icontains=term)
+        return queryset
+
+
+class AsyncSaleDetailAPIView(AsyncRetrieveAPIView):
+    queryset = Sale.objects.with_related()
+    serializer_class = SaleSerializer
+    permission_classes = [IsAdminUser]
+    conditional_related = ('product', 'sold_by')
+    conditional_version = True
+    message = 'Sale retrieved successfully'
@@ -0,0 +1,277 @@
+# backend/inventory/benchmarks.py
+import random
+import statistics
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Category, Product, Sale, StockMovement
+from . import ledger
+from .analytics import rebuild_daily_summaries
+from .search import get_search_backend
+
+User = get_user_model()
+
+BENCHMARK_ADMIN_EMAIL = 'benchmark-admin@example.com'
+ADJECTIVES = ('Compact', 'Wireless', 'Portable', 'Smart', 'Premium', 'Rugged', 'Classic', 'Digital')
+NOUNS = ('Widget', 'Phone', 'Laptop', 'Charger', 'Speaker', 'Monitor', 'Keyboard', 'Camera', 'Router', 'Lamp')
+CHUNK_SIZE = 2000
+
+
+def generate_dataset(categories=20, products=10000, sales=20000, users=50, seed=1, password='benchmark'):
+    """
+    Create a reproducible data set: `categories` categories, `products`
+    products spread over them, `sales` sales of those products and `users`
+    regular users, plus the admin the scenarios authenticate as. Stock,
+    the stock ledger, the daily sales rollup and the search index are left
+    consistent, as if everything had gone through the API. Returns counts.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    with transaction.atomic():
+        admin = User.objects.filter(email=BENCHMARK_ADMIN_EMAIL).first()
+        if admin is None:
+            admin = User.objects.create_user(
+                username='benchmark-admin', email=BENCHMARK_ADMIN_EMAIL, password=password, role='admin'
+            )
+        password_hash = make_password(password)
+        user_rows = User.objects.bulk_create([
+            User(username=f'benchmark-{seed}-{index}', email=f'benchmark-{seed}-{index}@example.com',
+                 password=password_hash, role='user')
+            for index in range(users)
+        ], batch_size=CHUNK_SIZE)
+        seller_ids = [admin.pk] + [user.pk for user in user_rows]
+
+        category_rows = Category.objects.bulk_create([
+            Category(name=f'Benchmark {seed}-{index}', description=f'Benchmark category {index}')
+            for index in range(categories)
+        ])
+
+        stock = {}
+        product_rows = []
+        for index in range(products):
+            quantity = rng.randint(0, 500)
+            threshold = rng.randint(5, 20)
+            product_rows.append(Product(
+                name=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index}',
+                category=rng.choice(category_rows),
+                price=Decimal(rng.randint(100, 200000)) / 100,
+                quantity=quantity,
+                stock_threshold=threshold,
+                low_stock=quantity <= threshold,
+                sku=f'BENCH-{seed}-{index:07d}',
+            ))
+        product_rows = Product.objects.bulk_create(product_rows, batch_size=CHUNK_SIZE)
+        for product in product_rows:
+            stock[product.pk] = product.quantity
+        ledger.record_many((product.pk, StockMovement.RECEIPT, product.quantity, None) for product in product_rows)
+
+        in_stock = [product for product in product_rows if product.quantity]
+        sale_rows = []
+        for _ in range(sales if in_stock else 0):
+            product = rng.choice(in_stock)
+            quantity_sold = rng.randint(1, 5)
+            if stock[product.pk] < quantity_sold:
+                continue
+            stock[product.pk] -= quantity_sold
+            sale_rows.append(Sale(
+                product=product,
+                quantity_sold=quantity_sold,
+                sold_by_id=rng.choice(seller_ids),
+                total_price=product.price * quantity_sold,
+            ))
+        sale_rows = Sale.objects.bulk_create(sale_rows, batch_size=CHUNK_SIZE)
+        ledger.record_many(
+            (sale.product_id, StockMovement.SALE, -sale.quantity_sold, sale) for sale in sale_rows
+        )
+
+        for product in product_rows:
+            product.quantity = stock[product.pk]
+            product.low_stock = product.is_low_stock()
+            product.updated_at = now
+        Product.objects.bulk_update(product_rows, ['quantity', 'low_stock', 'updated_at'], batch_size=CHUNK_SIZE)
+        rebuild_daily_summaries()
+        backend = get_search_backend()
+        for start in range(0, len(product_rows), CHUNK_SIZE):
+            backend.index(product_rows[start:start + CHUNK_SIZE])
+
+    return {
+        'categories': len(category_rows),
+        'products': len(product_rows),
+        'sales': len(sale_rows),
+        'users': len(user_rows),
+    }
+
+
+class ScenarioContext:
+    # What the scenarios pick their requests from, read once per run.
+
+    def __init__(self, password, seed=1):
+        self.admin = User.objects.filter(email=BENCHMARK_ADMIN_EMAIL).first()
+        if self.admin is None:
+            self.admin = User.objects.filter(role='admin', is_active=True).order_by('pk').first()
+        self.password = password
+        self.authorization = f'Bearer {AccessToken.for_user(self.admin)}' if self.admin else None
+        self.category_ids = list(Category.objects.values_list('pk', flat=True)[:1000])
+        self.product_ids = list(Product.objects.filter(quantity__gt=0).values_list('pk', flat=True)[:1000])
+        self.seed = seed
+
+
+# name -> builds (method, path, payload, authenticated) for one request.
+SCENARIOS = {
+    'login': lambda ctx, rng: (
+        'post', '/api/user/auth/login/', {'email': ctx.admin.email, 'password': ctx.password}, False
+    ),
+    'product_list': lambda ctx, rng: ('get', '/api/inventory/products/', None, True),
+    'product_search': lambda ctx, rng: (
+        'get', '/api/inventory/products/', {'search': f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}'}, True
+    ),
+    'product_filter': lambda ctx, rng: (
+        'get', '/api/inventory/products/',
+        {'category': rng.choice(ctx.category_ids), 'min_price': 100, 'max_price': 500}, True
+    ),
+    'low_stock': lambda ctx, rng: ('get', '/api/inventory/products/low-stock/', None, True),
+    'sale_create': lambda ctx, rng: (
+        'post', '/api/inventory/sales/', {'product': rng.choice(ctx.product_ids), 'quantity_sold': 1}, True
+    ),
+    'user_list': lambda ctx, rng: ('get', '/api/user/users/', None, True),
+}
+
+# Scenarios that need rows to pick from.
+REQUIRES = {
+    'product_filter': 'category_ids',
+    'sale_create': 'product_ids',
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _send(client, ctx, build, rng):
+    method, path, payload, authenticated = build(ctx, rng)
+    headers = {'HTTP_AUTHORIZATION': ctx.authorization} if authenticated else {}
+    if method == 'get':
+        return client.get(path, payload, **headers)
+    return client.post(path, payload, content_type='application/json', **headers)
+
+
+def run_scenario(name, ctx, requests=200, concurrency=1, warmup=5):
+    """
+    Drive one scenario in-process through the full middleware stack.
+    `warmup` sequential requests first count the queries per request, then
+    `requests` requests are spread over `concurrency` threads, each with its
+    own client and database connection.
+    """
+    build = SCENARIOS[name]
+    rng = random.Random(f'{ctx.seed}-{name}')
+
+    client = Client(raise_request_exception=False)
+    with CaptureQueriesContext(connection) as context:
+        for _ in range(warmup):
+            _send(client, ctx, build, rng)
+    queries = len(context.captured_queries) / warmup if warmup else None
+
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    shares = [requests // concurrency + (1 if index < requests % concurrency else 0) for index in range(concurrency)]
+
+    def worker(count, worker_rng):
+        worker_client = Client(raise_request_exception=False)
+        timings = []
+        codes = Counter()
+        for _ in range(count):
+            started = time.perf_counter()
+            response = _send(worker_client, ctx, build, worker_rng)
+            timings.append(time.perf_counter() - started)
+            codes[response.status_code] += 1
+        with lock:
+            latencies.extend(timings)
+            statuses.update(codes)
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        worker(requests, rng)
+    else:
+        def threaded(count, worker_rng):
+            try:
+                worker(count, worker_rng)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=threaded, args=(count, random.Random(f'{ctx.seed}-{name}-{index}')))
+            for index, count in enumerate(shares)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'scenario': name,
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'queries_per_request': round(queries, 2) if queries is not None else None,
+        'errors': sum(count for code, count in statuses.items() if code >= 400),
+        'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def run_metadata():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': timezone.now().isoformat(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'dataset': {
+            'categories': Category.objects.count(),
+            'products': Product.objects.count(),
+            'sales': Sale.objects.count(),
+            'users': User.objects.count(),
+        },
+    }
+
+
+def compare(results, baseline):
+    """Per scenario, the percentage change from `baseline` (a previous run's JSON)."""
+    previous = {row['scenario']: row for row in baseline.get('scenarios', [])}
+    changes = defaultdict(dict)
+    for row in results['scenarios']:
+        before = previous.get(row['scenario'])
+        if before is None:
+            continue
+        for metric in ('throughput', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request'):
+            if before.get(metric) and row.get(metric) is not None:
+                changes[row['scenario']][metric] = round((row[metric] - before[metric]) / before[metric] * 100, 1)
+    return dict(changes)
@@ -0,0 +1,230 @@
+# backend/inventory/cache.py
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.response import Response
+
+from backend.caches import shares_state
+from backend.compression import compress, negotiate_encoding
+from backend.replicas import reading_from_replicas
+
+CACHE_KEY_PREFIX = 'inventory'
+
+
+class LRUFileBasedCache(FileBasedCache):
+    # FileBasedCache culls a random sample once MAX_ENTRIES is reached. Here
+    # a hit refreshes the file's mtime and culling drops the stalest files,
+    # which makes eviction least-recently-used like LocMemCache.
+
+    def get(self, key, default=None, version=None):
+        fname = self._key_to_file(key, version)
+        value = super().get(key, default, version)
+        if value is not default:
+            try:
+                os.utime(fname)
+            except OSError:
+                pass
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def mtime(fname):
+            try:
+                return os.path.getmtime(fname)
+            except OSError:
+                return 0
+
+        filelist.sort(key=mtime)
+        for fname in filelist[:num_entries // self._cull_frequency]:
+            self._delete(fname)
+
+
+class CacheStats:
+    # Per-process counters; every worker reports its own.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.skipped = 0
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'skipped': self.skipped,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+stats = CacheStats()
+
+
+def get_cache():
+    return caches[settings.INVENTORY_CACHE_ALIAS]
+
+
+def cache_enabled():
+    # The version counters must be shared: with a per-process cache a write
+    # bumps only its own worker's counter and the others keep serving the
+    # entries it made stale.
+    return settings.INVENTORY_CACHE_ENABLED and shares_state(settings.INVENTORY_CACHE_ALIAS)
+
+
+def _version_key(model):
+    return f'{CACHE_KEY_PREFIX}:version:{model._meta.label_lower}'
+
+
+def _initial_version():
+    # Seeded from the clock rather than 1: if a counter is evicted, the
+    # restarted series cannot collide with keys cached under the old one.
+    return time.time_ns()
+
+
+def get_versions(models):
+    cache = get_cache()
+    keys = {model: _version_key(model) for model in models}
+    found = cache.get_many(list(keys.values()))
+    versions = []
+    for model, key in keys.items():
+        if key not in found:
+            cache.add(key, _initial_version(), timeout=None)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return versions
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), timeout=None)
+
+
+def bump_version(*models):
+    # Bumped immediately so this process stops serving the old entry, and
+    # again on commit so a concurrent reader cannot cache pre-commit rows
+    # under the new version.
+    keys = [_version_key(model) for model in models]
+    for key in keys:
+        _bump(key)
+    transaction.on_commit(lambda: [_bump(key) for key in keys])
+
+
+def entry_timeout():
+    # Rows read from a replica may trail the version counter they are cached
+    # under; such entries lapse once the replica has had time to catch up.
+    return settings.DATABASE_REPLICA_STICKY_SECONDS if reading_from_replicas() else DEFAULT_TIMEOUT
+
+
+def normalized_params(request):
+    return sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+
+
+def response_cache_key(request, versions):
+    raw = repr((request.path, normalized_params(request), versions)).encode()
+    return f'{CACHE_KEY_PREFIX}:response:{hashlib.sha1(raw).hexdigest()}'
+
+
+class CachedReadMixin:
+    # Read-through cache for GET handlers. `cache_models` lists every model
+    # whose writes can change the response; the key embeds their version
+    # counters, so a write makes old entries unreachable instead of deleting
+    # them and LRU eviction reclaims the space.
+
+    cache_models = ()
+
+    def cache_key(self, request):
+        return response_cache_key(request, get_versions(self.cache_models))
+
+    def cached_data(self, request, build, key=None):
+        if not cache_enabled():
+            return build(), None
+
+        cache = get_cache()
+        key = key or self.cache_key(request)
+        payload = cache.get(key)
+        if payload is not None:
+            stats.record('hits')
+            return pickle.loads(payload), 'HIT'
+
+        stats.record('misses')
+        data = build()
+        payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        if len(payload) <= settings.INVENTORY_CACHE_MAX_ENTRY_BYTES:
+            cache.set(key, payload, entry_timeout())
+        else:
+            stats.record('skipped')
+        return data, 'MISS'
+
+    def cached_response(self, request, build):
+        # `build` returns the whole response body. When the client accepts a
+        # content-coding and the rendered body is worth compressing, the
+        # compressed bytes are cached next to the data, so a repeat hit skips
+        # unpickling, rendering and compressing; CompressionMiddleware passes
+        # the already-encoded response through.
+        encoding = self.precompressed_encoding(request)
+        if encoding is None:
+            body, cache_status = self.cached_data(request, build)
+            return Response(body, headers={'X-Cache': cache_status} if cache_status else None)
+
+        cache = get_cache()
+        key = self.cache_key(request)
+        encoded_key = f'{key}:{encoding}'
+        payload = cache.get(encoded_key)
+        if payload is not None:
+            stats.record('hits')
+            return self.encoded_response(request, payload, encoding, 'HIT')
+
+        body, cache_status = self.cached_data(request, build, key)
+        content = request.accepted_renderer.render(body, request.accepted_media_type, self.get_renderer_context())
+        if len(content) < settings.COMPRESSION_MIN_SIZE:
+            return Response(body, headers={'X-Cache': cache_status})
+        payload = compress(content, encoding, settings.COMPRESSION_PRECOMPRESS_LEVELS[encoding])
+        if len(payload) <= settings.INVENTORY_CACHE_MAX_ENTRY_BYTES:
+            cache.set(encoded_key, payload, entry_timeout())
+        return self.encoded_response(request, payload, encoding, cache_status)
+
+    def precompressed_encoding(self, request):
+        if not (cache_enabled() and settings.COMPRESSION_ENABLED):
+            return None
+        if getattr(request, 'accepted_renderer', None) is None or request.accepted_renderer.format != 'json':
+            return None
+        return negotiate_encoding(request)
+
+    def encoded_response(self, request, payload, encoding, cache_status):
+        response = HttpResponse(payload, content_type=request.accepted_renderer.media_type)
+        response['Content-Encoding'] = encoding
+        response['X-Cache'] = cache_status
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
@@ -0,0 +1,203 @@
+# backend/inventory/conditional.py
+import hashlib
+
+from django.db.models import Func, IntegerField, Subquery
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from backend.compression import decoded_etag, encoded_etag
+
+from .cache import normalized_params
+
+
+def validators_queryset(queryset, related=(), version=False):
+    # One statement of scalar subqueries rather than a single aggregate:
+    # SQLite answers COUNT(*) and the newest updated_at from indexes
+    # separately, but computing both in one aggregate forces a row scan.
+    # A related model contributes the newest updated_at across its whole
+    # table, which over-invalidates but never serves stale data.
+    queryset = queryset.order_by()
+    subqueries = {
+        'count': Subquery(
+            queryset.annotate(validator_count=Func(template='COUNT(*)', output_field=IntegerField()))
+            .values('validator_count')
+        ),
+        'last_modified': Subquery(queryset.order_by('-updated_at').values('updated_at')[:1]),
+    }
+    for relation in related:
+        related_model = queryset.model._meta.get_field(relation).related_model
+        subqueries[relation] = Subquery(related_model.objects.order_by('-updated_at').values('updated_at')[:1])
+    if version:
+        # Detail views of versioned rows: the queryset is that one row.
+        subqueries['version'] = Subquery(queryset.values('version')[:1])
+    annotations = {f'validator_{name}': subquery for name, subquery in subqueries.items()}
+    # Evaluated with first(): any row of the table will do as the outer FROM.
+    return queryset.model.objects.annotate(**annotations).values(*annotations)
+
+
+def validator_values(row, related=()):
+    # No row means the table is empty.
+    if row is None:
+        return {'count': 0, 'last_modified': None, 'version': None, **{relation: None for relation in related}}
+    return {'version': None, **{name.removeprefix('validator_'): value for name, value in row.items()}}
+
+
+def make_validators(request, values, related=()):
+    timestamps = [values[name] for name in ('last_modified', *related) if values[name]]
+    last_modified = max(timestamps) if timestamps else None
+    raw = repr((
+        request.path,
+        normalized_params(request),
+        values['count'],
+        [timestamp.isoformat() for timestamp in timestamps],
+    )).encode()
+    digest = hashlib.sha1(raw).hexdigest()
+    if values['version'] is not None:
+        # Strong, and led by the row version, so a client can send the tag
+        # it got back as If-Match (see if_match_version).
+        return f'"{values["version"]}-{digest}"', last_modified
+    return f'W/"{digest}"', last_modified
+
+
+def is_not_modified(request, etag, last_modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag.removeprefix('W/') in [decoded_etag(tag.removeprefix('W/')) for tag in etags]
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return (
+        if_modified_since is not None and last_modified is not None
+        and int(last_modified.timestamp()) <= if_modified_since
+    )
+
+
+def not_modified_etag(request, etag):
+    # A 304 names the representation the client holds, which is a
+    # compressed one when its If-None-Match carries an encoded tag.
+    for tag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        if decoded_etag(tag) == etag:
+            return tag
+    return etag
+
+
+def set_validators(response, etag, last_modified):
+    # A pre-compressed body (inventory.cache) is tagged as
+    # CompressionMiddleware would tag it.
+    if response.has_header('Content-Encoding'):
+        etag = encoded_etag(etag, response['Content-Encoding'])
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+
+
+class ConditionalGetMixin:
+    # ETag / Last-Modified for GET handlers, derived from one query over the
+    # filtered queryset: max(updated_at) catches edits, the row count
+    # catches deletes. `conditional_related` names relations whose
+    # updated_at also shows up in the response (e.g. category_name).
+    # Matching If-None-Match / If-Modified-Since answer 304 before anything
+    # is serialized.
+
+    conditional_related = ()
+    # Versioned detail views emit a strong ETag carrying the row version.
+    conditional_version = False
+
+    def is_detail(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.is_detail():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_validators(self, request):
+        values = validator_values(
+            validators_queryset(
+                self.get_conditional_queryset(), self.conditional_related,
+                version=self.conditional_version and self.is_detail(),
+            ).first(),
+            self.conditional_related,
+        )
+        if values['count'] == 0 and self.is_detail():
+            # Leave the 404 to the handler.
+            return None, None
+        return make_validators(request, values, self.conditional_related)
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+
+        if is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            etag = not_modified_etag(request, etag)
+        else:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            set_validators(response, etag, last_modified)
+        return response
+
+
+class InvalidIfMatch(ValueError):
+    pass
+
+
+def if_match_version(request):
+    # The version an If-Match header names: a versioned detail view's ETag
+    # `"3-<digest>"` (`"3-<digest>-gzip"` when it was compressed), or just
+    # `"3"`. Only the version is compared, since the
+    # write is conditional on the row alone; the digest also covers related
+    # rows (e.g. the category name). `*` (or no header) means no
+    # precondition. A weak tag is well formed but never matches (RFC 9110
+    # strong comparison), so it is reported as version 0, which no row
+    # carries; anything else is not a tag this API emits.
+    header = request.META.get('HTTP_IF_MATCH')
+    if not header:
+        return None
+    tags = parse_etags(header)
+    if tags == ['*']:
+        return None
+    if not tags:
+        raise InvalidIfMatch('If-Match must be a list of entity tags.')
+    for tag in tags:
+        if tag.startswith('W/'):
+            continue
+        version = tag.strip('"').split('-', 1)[0]
+        if not version.isdigit():
+            raise InvalidIfMatch(f'{tag} is not an entity tag of this resource.')
+        return int(version)
+    return 0
+
+
+class VersionedUpdateMixin:
+    # Optimistic concurrency for update views. The version an edit is based
+    # on comes from If-Match or, failing that, the payload's `version`; the
+    # serializer's update() makes the write conditional on it.
+
+    def get_expected_version(self, serializer):
+        header = if_match_version(self.request)
+        if header is not None:
+            return header
+        return serializer.validated_data.get('version')
+
+    def perform_update(self, serializer):
+        serializer.save(expected_version=self.get_expected_version(serializer))
+
+    def invalid_if_match_response(self, exc, message):
+        return Response({
+            'success': False,
+            'message': message,
+            'errors': {'if_match': [str(exc)]},
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    def version_conflict_response(self, exc, message):
+        return Response({
+            'success': False,
+            'message': message,
+            'errors': {'version': [str(exc)]},
+            'current_version': exc.instance.version,
+        }, status=status.HTTP_412_PRECONDITION_FAILED)
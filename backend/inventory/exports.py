@@ -0,0 +1,89 @@
+# backend/inventory/exports.py
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 2000
+
+PRODUCT_EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('category', 'category_id'),
+    ('category_name', 'category__name'),
+    ('price', 'price'),
+    ('quantity', 'quantity'),
+    ('description', 'description'),
+    ('stock_threshold', 'stock_threshold'),
+    ('sku', 'sku'),
+    ('is_active', 'is_active'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+SALE_EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('product', 'product_id'),
+    ('product_name', 'product__name'),
+    ('quantity_sold', 'quantity_sold'),
+    ('sale_date', 'sale_date'),
+    ('sold_by', 'sold_by_id'),
+    ('sold_by_username', 'sold_by__username'),
+    ('total_price', 'total_price'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+
+class Echo:
+    # csv.writer only needs an object with write(); hand each line straight back.
+
+    def write(self, value):
+        return value
+
+
+def _format_datetime(value):
+    # Same representation as DRF's DateTimeField.
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return _format_datetime(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _rows(queryset, columns, chunk_size):
+    lookups = [lookup for _, lookup in columns]
+    return queryset.order_by('pk').values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def stream_csv(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in columns])
+    for row in _rows(queryset, columns, chunk_size):
+        yield writer.writerow([
+            _format_datetime(value) if isinstance(value, datetime) else value
+            for value in row
+        ])
+
+
+def stream_ndjson(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    names = [name for name, _ in columns]
+    encoder = json.JSONEncoder(default=_json_default, ensure_ascii=False, separators=(',', ':'))
+    for row in _rows(queryset, columns, chunk_size):
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
@@ -0,0 +1,190 @@
+# backend/inventory/fast_serializers.py
+import decimal
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.settings import ISO_8601, api_settings
+
+# Values that come back from the database already in their JSON form.
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _decimal_formatter(field):
+    if not getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING):
+        return field.to_representation
+    if field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def format_decimal(value):
+        return f'{value.quantize(exponent, rounding=rounding, context=context):f}'
+    return format_decimal
+
+
+def _datetime_formatter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    # The database backend hands back datetimes in UTC; skip the conversion
+    # when the output zone is UTC as well.
+    utc = field_timezone is dt_timezone.utc or getattr(field_timezone, 'key', None) == 'UTC'
+
+    def format_datetime(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        if not (utc and value.tzinfo is dt_timezone.utc):
+            value = value.astimezone(field_timezone)
+        text = value.isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return format_datetime
+
+
+def _formatter(field):
+    if isinstance(field, serializers.BigIntegerField):
+        return None if not getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING) else str
+    if isinstance(field, IDENTITY_FIELDS) and type(field).to_representation in (
+        serializers.BooleanField.to_representation,
+        serializers.CharField.to_representation,
+        serializers.IntegerField.to_representation,
+        serializers.PrimaryKeyRelatedField.to_representation,
+    ):
+        return None
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_formatter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_formatter(field)
+    return field.to_representation
+
+
+class CompiledSerializer:
+    # Read-only fast path for a ModelSerializer: each field is compiled once
+    # into a `values_list()` column and a formatter, so a row becomes a dict
+    # without model instances, attribute lookups or per-field dispatch. The
+    # output matches `serializer_class(instances, many=True).data` exactly.
+    #
+    # `value_sources` maps a field source that is not a column (a method such
+    # as Product.is_low_stock) to the column holding the same value.
+
+    def __init__(self, serializer_class, value_sources=None, fields=None):
+        value_sources = value_sources or {}
+        self.name = serializer_class.__name__
+        self.columns = []
+        self.fields = []
+        serializer = serializer_class() if fields is None else serializer_class(fields=fields)
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)):
+                raise ImproperlyConfigured(f'{serializer_class.__name__}.{name} cannot be compiled.')
+            source = value_sources.get(field.source, '__'.join(field.source_attrs))
+            # DRF omits a read-only field whose source crosses a null relation
+            # (e.g. sold_by.username without a seller); keep the same shape.
+            guard = None
+            if len(field.source_attrs) > 1 and field.default is empty and not field.allow_null and not field.required:
+                guard = self._column('__'.join(field.source_attrs[:-1]))
+            self.fields.append((name, self._column(source), _formatter(field), guard))
+        self.build_row = self._compile_row_builder()
+
+    def _column(self, name):
+        if name not in self.columns:
+            self.columns.append(name)
+        return self.columns.index(name)
+
+    def values(self, queryset, extra=()):
+        # Named rows, so keyset pagination can read ordering values by name.
+        columns = self.columns + [name for name in extra if name not in self.columns]
+        return queryset.values_list(*columns, named=True)
+
+    def to_representation(self, row):
+        return self.build_row(row)
+
+    def many(self, rows):
+        return list(map(self.build_row, rows))
+
+    def _compile_row_builder(self):
+        # Generate one function per serializer:
+        #
+        #     def build_row(row):
+        #         data = {'id': row[0], 'price': None if row[3] is None else f3(row[3]), ...}
+        #         if row[7] is None: del data['sold_by_username']
+        #         return data
+        #
+        # A dict display is much cheaper than per-field assignment, and
+        # deleting a guarded key keeps the order of the others.
+        namespace = {}
+        items, guards = [], []
+        for position, (name, index, formatter, guard) in enumerate(self.fields):
+            value = f'row[{index}]'
+            if formatter is not None:
+                namespace[f'f{position}'] = formatter
+                value = f'(None if {value} is None else f{position}({value}))'
+            items.append(f'{name!r}: {value}')
+            if guard is not None:
+                guards.append(f'    if row[{guard}] is None: del data[{name!r}]')
+        source = '\n'.join([
+            'def build_row(row):',
+            f"    data = {{{', '.join(items)}}}",
+            *guards,
+            '    return data',
+        ])
+        exec(compile(source, f'<compiled {self.name}>', 'exec'), namespace)
+        return namespace['build_row']
+
+
+@lru_cache(maxsize=1024)
+def _compile(serializer_class, value_sources, fields, timezone_name):
+    return CompiledSerializer(serializer_class, dict(value_sources), fields)
+
+
+def compile_serializer(serializer_class, value_sources=None, fields=None):
+    # Datetime formatters bind the active time zone, so it is part of the key.
+    # `fields` is a sparse fieldset (backend/fieldsets.py) as a tuple.
+    return _compile(
+        serializer_class, tuple(sorted((value_sources or {}).items())), fields,
+        timezone.get_current_timezone_name(),
+    )
+
+
+class FastListSerializationMixin:
+    # List views opt in by setting `fast_value_sources` (may be empty). With
+    # INVENTORY_FAST_SERIALIZATION on, the listing is fetched as values_list
+    # rows and serialized by the compiled serializer.
+
+    fast_value_sources = {}
+
+    def use_fast_serialization(self):
+        return getattr(settings, 'INVENTORY_FAST_SERIALIZATION', True)
+
+    def get_fast_serializer(self):
+        fields = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else None
+        return compile_serializer(self.get_serializer_class(), self.fast_value_sources, fields)
+
+    def fast_queryset(self, queryset):
+        if not self.use_fast_serialization():
+            return queryset
+        extra = ()
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            extra = [field.lstrip('-') for field in self.paginator.get_ordering(self.request, queryset, self)]
+        return self.get_fast_serializer().values(queryset, extra)
+
+    def serialize_many(self, rows):
+        if not self.use_fast_serialization():
+            return self.get_serializer(rows, many=True).data
+        return self.get_fast_serializer().many(rows)
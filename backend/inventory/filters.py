@@ -1,7 +1,7 @@
 # backend/inventory/filters.py
 import django_filters
-from django.db.models import F, Q
-from .models import Product
+from .models import Product, Sale
+from .search import get_search_backend
 
 class ProductFilter(django_filters.FilterSet):
     
@@ -18,15 +18,19 @@ class ProductFilter(django_filters.FilterSet):
 
     def filter_low_stock(self, queryset, name, value):
         if value:
-            return queryset.filter(quantity__lte=F('stock_threshold'))
+            return queryset.low_stock()
         return queryset
     
     def filter_search(self, queryset, name, value):
         if value:
-            return queryset.filter(
-                Q(name__icontains=value) | 
-                Q(description__icontains=value) |
-                Q(sku__icontains=value) |
-                Q(category__name__icontains=value)
-            )
-        return queryset
\ No newline at end of file
+            return get_search_backend().search(queryset, value)
+        return queryset
+
+class SaleFilter(django_filters.FilterSet):
+
+    date_from = django_filters.DateTimeFilter(field_name="sale_date", lookup_expr='gte')
+    date_to = django_filters.DateTimeFilter(field_name="sale_date", lookup_expr='lte')
+
+    class Meta:
+        model = Sale
+        fields = ['product', 'sold_by']
@@ -0,0 +1,218 @@
+# backend/inventory/importers.py
+import csv
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import ledger
+from .cache import bump_version
+from .models import Category, Product, StockMovement
+from .search import get_search_backend
+
+PRODUCT_UPDATE_FIELDS = [
+    'name', 'category', 'price', 'quantity', 'description',
+    'stock_threshold', 'is_active', 'low_stock', 'updated_at',
+]
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'f'}
+MAX_REPORTED_ERRORS = 100
+MAX_PRICE = Decimal('100000000')
+SKU_MAX_LENGTH = Product._meta.get_field('sku').max_length
+
+
+class ProductImportResult:
+
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'imported': self.imported,
+            'failed': self.failed,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'errors': self.errors,
+        }
+
+
+def _parse_bool(value, default=True):
+    value = (value or '').strip().lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f'Invalid boolean "{value}".')
+
+
+def _parse_int(value, name, default):
+    value = (value or '').strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a whole number.')
+    if number < 0:
+        raise ValueError(f'{name} must be zero or greater.')
+    return number
+
+
+def _parse_row(row):
+    # PostgreSQL rejects NUL in text, which would fail the whole chunk.
+    for column, value in row.items():
+        if isinstance(value, str) and '\x00' in value:
+            raise ValueError(f'{column} contains a NUL character.')
+    sku = (row.get('sku') or '').strip()
+    name = (row.get('name') or '').strip()
+    category = (row.get('category') or '').strip()
+    if not sku:
+        raise ValueError('sku is required.')
+    if len(sku) > SKU_MAX_LENGTH:
+        # Truncating could merge distinct skus, so the row is refused.
+        raise ValueError(f'sku must be at most {SKU_MAX_LENGTH} characters.')
+    if not name:
+        raise ValueError('name is required.')
+    if not category:
+        raise ValueError('category is required.')
+    try:
+        price = Decimal((row.get('price') or '').strip())
+    except InvalidOperation:
+        raise ValueError('price must be a decimal number.')
+    if not price.is_finite() or price < 0 or price >= MAX_PRICE or price.as_tuple().exponent < -2:
+        raise ValueError('price must be zero or greater, below 100000000, with at most 2 decimal places.')
+    return {
+        'sku': sku,
+        'name': name[:200],
+        'category': category[:100],
+        'price': price,
+        'quantity': _parse_int(row.get('quantity'), 'quantity', 0),
+        'description': (row.get('description') or '').strip() or None,
+        'stock_threshold': _parse_int(row.get('stock_threshold'), 'stock_threshold', 5),
+        'is_active': _parse_bool(row.get('is_active')),
+    }
+
+
+def _resolve_categories(names, category_ids):
+    missing = [name for name in names if name not in category_ids]
+    if missing:
+        Category.objects.bulk_create([Category(name=name) for name in missing], ignore_conflicts=True)
+        category_ids.update(Category.objects.filter(name__in=missing).values_list('name', 'id'))
+
+
+def _upsert_chunk(rows, category_ids):
+    # Later rows win when a sku repeats inside the chunk; a single upsert
+    # statement may not touch the same row twice. Returns the products
+    # written and (line, error) for rows that were not.
+    by_sku = {row['sku']: row for row in rows}
+    _resolve_categories({row['category'] for row in by_sku.values()}, category_ids)
+    now = timezone.now()
+    rejected = []
+    with transaction.atomic():
+        # Locked so no reservation can grow between the check and the upsert.
+        previous = {}
+        for sku, quantity, reserved in (
+            Product.objects.select_for_update().filter(sku__in=by_sku).values_list('sku', 'quantity', 'reserved')
+        ):
+            if by_sku[sku]['quantity'] < reserved:
+                row = by_sku.pop(sku)
+                rejected.append((row['line'], (
+                    f"{reserved} units of {sku} are held by active reservations; "
+                    f"quantity cannot go below that (got {row['quantity']})."
+                )))
+            else:
+                previous[sku] = quantity
+        if not by_sku:
+            return [], rejected
+        products = [
+            Product(
+                sku=row['sku'],
+                name=row['name'],
+                category_id=category_ids[row['category']],
+                price=row['price'],
+                quantity=row['quantity'],
+                description=row['description'],
+                stock_threshold=row['stock_threshold'],
+                is_active=row['is_active'],
+                low_stock=row['quantity'] <= row['stock_threshold'],
+                updated_at=now,
+            )
+            for row in by_sku.values()
+        ]
+        Product.objects.bulk_create(
+            products,
+            update_conflicts=True,
+            unique_fields=['sku'],
+            update_fields=PRODUCT_UPDATE_FIELDS,
+        )
+        # The upsert can only copy the incoming values, so versions move on
+        # in a second statement.
+        Product.objects.filter(sku__in=by_sku).update(version=F('version') + 1)
+        # New skus are receipts; re-imported ones adjust to the file's count.
+        ledger.record_many(
+            (pk, StockMovement.ADJUSTMENT if sku in previous else StockMovement.RECEIPT,
+             quantity - previous.get(sku, 0), None)
+            for sku, pk, quantity in Product.objects.filter(sku__in=by_sku).values_list('sku', 'pk', 'quantity')
+        )
+        # bulk_create skips post_save, so the search index is fed explicitly.
+        get_search_backend().index(Product.objects.filter(sku__in=by_sku).select_related('category'))
+        bump_version(Category, Product)
+    return products, rejected
+
+
+def _read_chunks(reader, chunk_size):
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_products_csv(text_stream, chunk_size=2000, on_chunk=None):
+    # Rows are read and written `chunk_size` at a time, so memory stays
+    # bounded by the chunk rather than the file.
+    result = ProductImportResult()
+    reader = csv.DictReader(text_stream)
+    category_ids = dict(Category.objects.values_list('name', 'id'))
+
+    for chunk in _read_chunks(reader, chunk_size):
+        rows = []
+        for line, row in chunk:
+            result.rows += 1
+            try:
+                rows.append({**_parse_row(row), 'line': line})
+            except (ValueError, AttributeError) as exc:
+                result.add_error(line, str(exc))
+        if rows:
+            products, rejected = _upsert_chunk(rows, category_ids)
+            result.imported += len(products)
+            for line, message in rejected:
+                result.add_error(line, message)
+        result.seconds = time.perf_counter() - result.started
+        if on_chunk is not None:
+            on_chunk(result)
+
+    result.seconds = time.perf_counter() - result.started
+    return result
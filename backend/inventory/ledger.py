@@ -0,0 +1,111 @@
+# backend/inventory/ledger.py
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Product, StockMovement, StockSnapshot
+
+
+def record(product_id, kind, delta, sale=None):
+    return StockMovement.objects.create(product_id=product_id, kind=kind, delta=delta, sale=sale)
+
+
+def record_many(movements):
+    # `movements` are (product_id, kind, delta, sale) tuples.
+    return StockMovement.objects.bulk_create([
+        StockMovement(product_id=product_id, kind=kind, delta=delta, sale=sale)
+        for product_id, kind, delta, sale in movements
+        if delta
+    ])
+
+
+def _latest_snapshot():
+    return StockSnapshot.objects.filter(product=OuterRef('pk')).order_by('-taken_at', '-id')
+
+
+def with_ledger_quantity(queryset, up_to_movement=None):
+    """
+    Annotate products with `ledger_quantity`: their latest snapshot plus
+    the movements after it (up to movement id `up_to_movement`), computed
+    by correlated subqueries over the (product, id) indexes.
+    """
+    snapshot = _latest_snapshot()
+    queryset = queryset.annotate(
+        snapshot_quantity=Coalesce(Subquery(snapshot.values('quantity')[:1]), Value(0)),
+        snapshot_mark=Coalesce(Subquery(snapshot.values('last_movement_id')[:1]), Value(0)),
+    )
+    movements = StockMovement.objects.filter(product=OuterRef('pk'), id__gt=OuterRef('snapshot_mark'))
+    if up_to_movement is not None:
+        movements = movements.filter(id__lte=up_to_movement)
+    delta = movements.order_by().values('product').annotate(total=Sum('delta')).values('total')
+    return queryset.annotate(ledger_quantity=F('snapshot_quantity') + Coalesce(Subquery(delta), Value(0)))
+
+
+def stock_at(product, when):
+    """
+    Stock of `product` at `when`: the newest snapshot taken by then plus
+    the movements recorded after it and no later than `when`.
+    """
+    snapshot = product.stock_snapshots.filter(taken_at__lte=when).order_by('-taken_at', '-id').first()
+    movements = product.stock_movements.filter(created_at__lte=when)
+    if snapshot is not None:
+        movements = movements.filter(id__gt=snapshot.last_movement_id)
+    summary = movements.aggregate(delta=Sum('delta'), count=Count('id'))
+    quantity = (snapshot.quantity if snapshot else 0) + (summary['delta'] or 0)
+    return quantity, snapshot, summary['count']
+
+
+def committed_watermark():
+    """
+    The newest movement id below which every movement is committed, and
+    the time it was read. Max('id') alone is not that on PostgreSQL, where
+    sequence values are handed out before commit: a lower id can still be in
+    flight while a higher one is visible, and a snapshot at the higher one
+    would skip it for good. A SHARE lock waits for every open writer of the
+    ledger and holds off new ones while the max is read. SQLite has a single
+    writer, whose uncommitted rows always sort above every committed id.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {connection.ops.quote_name(StockMovement._meta.db_table)} IN SHARE MODE')
+        mark = StockMovement.objects.aggregate(mark=Max('id'))['mark'] or 0
+        return mark, timezone.now()
+
+
+def take_snapshots(now=None):
+    """
+    Snapshot the ledger quantity of every product that has moved since the
+    previous run, as of the newest committed movement. Run periodically
+    (`manage.py snapshot_stock`) so stock lookups only sum a short tail of
+    movements. Returns the number of snapshots written.
+    """
+    previous = StockSnapshot.objects.aggregate(mark=Max('last_movement_id'))['mark'] or 0
+    mark, taken_at = committed_watermark()
+    now = now or taken_at
+    moved = StockMovement.objects.filter(id__gt=previous, id__lte=mark).values('product')
+    rows = with_ledger_quantity(Product.objects.filter(pk__in=moved), up_to_movement=mark)
+    snapshots = [
+        StockSnapshot(product_id=pk, quantity=quantity, last_movement_id=mark, taken_at=now)
+        for pk, quantity in rows.values_list('pk', 'ledger_quantity').iterator(2000)
+    ]
+    StockSnapshot.objects.bulk_create(snapshots, batch_size=2000)
+    return len(snapshots)
+
+
+def discrepancies(product_ids=None):
+    """(product_id, quantity, ledger_quantity) for products whose stock column and ledger disagree."""
+    products = Product.objects.all()
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+    rows = with_ledger_quantity(products).values_list('pk', 'quantity', 'ledger_quantity')
+    return [row for row in rows.iterator(2000) if row[1] != row[2]]
+
+
+def repair(rows):
+    # Bring the ledger in line with the stock column for `discrepancies()` rows.
+    return record_many(
+        (pk, StockMovement.ADJUSTMENT, quantity - ledger_quantity, None)
+        for pk, quantity, ledger_quantity in rows
+    )
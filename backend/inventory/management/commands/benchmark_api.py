@@ -0,0 +1,94 @@
+# backend/inventory/management/commands/benchmark_api.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.benchmarks import REQUIRES, SCENARIOS, ScenarioContext, compare, run_metadata, run_scenario
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the REST API scenarios in-process through the full middleware stack and reports '
+        'throughput, p50/p95/p99 latency and queries per request, as a table or as JSON that can be '
+        'compared with a run from another commit (see generate_benchmark_data)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', choices=sorted(SCENARIOS),
+            help='Scenario to run; repeat for several (default: all)',
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=1, help='Threads sending requests')
+        parser.add_argument(
+            '--sale-concurrency', type=int, default=8,
+            help='Threads for sale_create, which exercises concurrent stock decrements',
+        )
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests that count queries')
+        parser.add_argument('--password', default='benchmark', help='Password of the benchmark admin')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Also write the JSON results to this file')
+        parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1 or options['sale_concurrency'] < 1:
+            raise CommandError('--requests and the concurrency options must be at least 1.')
+        ctx = ScenarioContext(options['password'], seed=options['seed'])
+        if ctx.admin is None:
+            raise CommandError('No admin user to authenticate as; run generate_benchmark_data first.')
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        names = options['scenario'] or list(SCENARIOS)
+        scenarios = []
+        for name in names:
+            if name in REQUIRES and not getattr(ctx, REQUIRES[name]):
+                self.stderr.write(f'Skipping {name}: no {REQUIRES[name].replace("_ids", "")} rows to use.')
+                continue
+            concurrency = options['sale_concurrency'] if name == 'sale_create' else options['concurrency']
+            scenarios.append(run_scenario(name, ctx, options['requests'], concurrency, options['warmup']))
+
+        results = {
+            'meta': {**run_metadata(), 'options': {
+                key: options[key] for key in ('requests', 'concurrency', 'sale_concurrency', 'warmup', 'seed')
+            }},
+            'scenarios': scenarios,
+        }
+        if baseline is not None:
+            results['comparison'] = {'baseline': baseline.get('meta', {}).get('commit'), **compare(results, baseline)}
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        meta = results['meta']
+        self.stdout.write(
+            f"commit {meta['commit'] or 'unknown'} on {meta['database']}: "
+            + ', '.join(f'{count} {name}' for name, count in meta['dataset'].items())
+        )
+        self.stdout.write(
+            f"{'scenario':<15} {'conc':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'queries':>8} {'errors':>7}"
+        )
+        for row in scenarios:
+            self.stdout.write(
+                f"{row['scenario']:<15} {row['concurrency']:>4} {row['throughput']:>8.1f} {row['p50_ms']:>8.1f} "
+                f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['queries_per_request'] or 0:>8.1f} "
+                f"{row['errors']:>7}"
+            )
+        if baseline is not None:
+            self.stdout.write(f"\nchange vs {results['comparison']['baseline'] or 'baseline'}:")
+            for name, changes in results['comparison'].items():
+                if name == 'baseline':
+                    continue
+                self.stdout.write(f'{name:<15} ' + '  '.join(
+                    f'{metric} {change:+.1f}%' for metric, change in changes.items()
+                ))
@@ -0,0 +1,149 @@
+# backend/inventory/management/commands/benchmark_asgi.py
+import asyncio
+import json
+import statistics
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+ENDPOINTS = {
+    'products': ('/api/inventory/products/', '/api/inventory/async/products/'),
+    'categories': ('/api/inventory/categories/', '/api/inventory/async/categories/'),
+    'low-stock': ('/api/inventory/products/low-stock/', '/api/inventory/async/products/low-stock/'),
+    'sales': ('/api/inventory/sales/', '/api/inventory/async/sales/'),
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Drives the ASGI application in-process with many concurrent connections and compares '
+        'latency and throughput of the sync DRF views against the async views'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='products')
+        parser.add_argument('--connections', type=int, default=1000, help='Concurrent connections')
+        parser.add_argument('--requests', type=int, default=5, help='Sequential requests per connection')
+        parser.add_argument('--query', default='', help='Query string added to every request')
+        parser.add_argument('--email', help='User to authenticate as (default: first active user)')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        user = users.filter(email=options['email']).first() if options['email'] else users.order_by('pk').first()
+        if user is None:
+            raise CommandError('No active user to authenticate as; create one or pass --email.')
+        authorization = f'Bearer {AccessToken.for_user(user)}'.encode()
+
+        application = get_asgi_application()
+        results = []
+        for stack, path in zip(('sync', 'async'), ENDPOINTS[options['endpoint']]):
+            results.append(asyncio.run(self.run_stack(
+                application, stack, path, options['query'].encode(), authorization,
+                options['connections'], options['requests'],
+            )))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{options['endpoint']}: {options['connections']} connections x {options['requests']} requests"
+        )
+        self.stdout.write(
+            f"{'stack':<6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'in flight':>10} {'threads':>8} {'errors':>7}"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['stack']:<6} {row['throughput']:>9.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                f"{row['p99_ms']:>9.1f} {row['peak_in_flight']:>10} {row['peak_threads']:>8} {row['errors']:>7}"
+            )
+
+    async def run_stack(self, application, stack, path, query, authorization, connections, requests):
+        state = {'in_flight': 0, 'peak_in_flight': 0, 'peak_threads': threading.active_count()}
+        latencies = []
+        errors = 0
+
+        async def connection():
+            nonlocal errors
+            for _ in range(requests):
+                state['in_flight'] += 1
+                state['peak_in_flight'] = max(state['peak_in_flight'], state['in_flight'])
+                started = time.perf_counter()
+                status = await self.request(application, path, query, authorization)
+                latencies.append(time.perf_counter() - started)
+                state['in_flight'] -= 1
+                state['peak_threads'] = max(state['peak_threads'], threading.active_count())
+                if status != 200:
+                    errors += 1
+
+        # Warm up imports, URL resolution and the user cache.
+        await self.request(application, path, query, authorization)
+        started = time.perf_counter()
+        await asyncio.gather(*(connection() for _ in range(connections)))
+        elapsed = time.perf_counter() - started
+
+        return {
+            'stack': stack,
+            'path': path,
+            'requests': len(latencies),
+            'seconds': round(elapsed, 3),
+            'throughput': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(statistics.median(latencies) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+            'peak_in_flight': state['peak_in_flight'],
+            'peak_threads': state['peak_threads'],
+            'errors': errors,
+        }
+
+    async def request(self, application, path, query, authorization):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query,
+            'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'authorization', authorization)],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+        done = asyncio.Event()
+        sent_body = False
+        status = None
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Django listens for a disconnect while the view runs; the
+            # client stays connected until the response is complete.
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body' and not message.get('more_body', False):
+                done.set()
+
+        await application(scope, receive, send)
+        done.set()
+        return status
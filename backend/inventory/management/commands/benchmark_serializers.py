@@ -0,0 +1,69 @@
+# backend/inventory/management/commands/benchmark_serializers.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from inventory.fast_serializers import compile_serializer
+from inventory.models import Product, Sale
+from inventory.renderers import ORJSONRenderer
+from inventory.serializers import ProductSerializer, SaleSerializer
+
+TARGETS = {
+    'products': (Product.objects.with_related, ProductSerializer, {'is_low_stock': 'low_stock'}),
+    'sales': (Sale.objects.with_related, SaleSerializer, {}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares ModelSerializer + JSONRenderer against compiled values_list serialization + '
+        'the orjson renderer for a list of rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(TARGETS), default='products')
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per variant; the median is reported')
+
+    def handle(self, *args, **options):
+        manager_method, serializer_class, value_sources = TARGETS[options['model']]
+        queryset = manager_method().order_by('-created_at', '-id')[:options['rows']]
+        compiled = compile_serializer(serializer_class, value_sources)
+
+        instances = list(queryset)
+        rows = list(compiled.values(queryset))
+        if not instances:
+            raise CommandError(f"No {options['model']} to serialize; load some data first.")
+        if ORJSONRenderer().render(compiled.many(rows)) != JSONRenderer().render(serializer_class(instances, many=True).data):
+            raise CommandError('Compiled output differs from the ModelSerializer output.')
+
+        variants = [
+            # Serialization only, over rows that are already fetched.
+            ('serialize', 'ModelSerializer', lambda: serializer_class(instances, many=True).data),
+            ('serialize', 'compiled', lambda: compiled.many(rows)),
+            # Serialization and rendering, over fetched rows.
+            ('render', 'ModelSerializer + json',
+             lambda: JSONRenderer().render(serializer_class(instances, many=True).data)),
+            ('render', 'compiled + orjson', lambda: ORJSONRenderer().render(compiled.many(rows))),
+            # Query, serialization and rendering.
+            ('end-to-end', 'ModelSerializer + json',
+             lambda: JSONRenderer().render(serializer_class(queryset.all(), many=True).data)),
+            ('end-to-end', 'compiled + orjson',
+             lambda: ORJSONRenderer().render(compiled.many(compiled.values(queryset.all())))),
+        ]
+
+        self.stdout.write(f"{options['model']}: {len(instances)} rows, median of {options['repeat']} runs")
+        self.stdout.write(f"{'stage':<11} {'variant':<24} {'ms':>9} {'speedup':>8}")
+        baseline = None
+        for stage, name, run in variants:
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+            ms = statistics.median(timings) * 1000
+            if name.startswith('ModelSerializer'):
+                baseline = ms
+            self.stdout.write(f'{stage:<11} {name:<24} {ms:>9.1f} {baseline / ms:>7.1f}x')
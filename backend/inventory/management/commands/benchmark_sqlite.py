@@ -0,0 +1,160 @@
+# backend/inventory/management/commands/benchmark_sqlite.py
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+
+from backend.sqlite import production_profile
+from inventory.models import Product, Sale
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(latencies):
+    return {
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs concurrent product reads and sale writes against two copies of a SQLite database, one '
+        'with Django\'s default settings and one with the production profile (WAL, pragmas, persistent '
+        'connections), and compares throughput and latency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Alias of the SQLite database to copy')
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duration of each run')
+        parser.add_argument('--readers', type=int, default=8, help='Threads listing products')
+        parser.add_argument('--writers', type=int, default=2, help='Threads recording sales')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        source = connections[options['database']]
+        if source.vendor != 'sqlite' or source.is_in_memory_db():
+            raise CommandError(f"'{options['database']}' is not a file-backed SQLite database.")
+        products = list(
+            Product.objects.using(options['database']).filter(quantity__gt=0).values_list('pk', 'price')[:1000]
+        )
+        if not products:
+            raise CommandError('No products in stock to sell; load some data first.')
+
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in ('default', 'production'):
+                path = os.path.join(directory, f'{profile}.sqlite3')
+                self.copy_database(source.settings_dict['NAME'], path)
+                database = {**source.settings_dict, 'NAME': path}
+                if profile == 'production':
+                    database = production_profile(database)
+                alias = f'benchmark_{profile}'
+                connections.settings[alias] = database
+                try:
+                    results.append(self.run(alias, profile, products, options))
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{options['readers']} readers + {options['writers']} writers for {options['seconds']:.0f}s per profile"
+        )
+        self.stdout.write(
+            f"{'profile':<11} {'reads/s':>9} {'writes/s':>9} {'read p95':>9} {'read p99':>9} "
+            f"{'write p95':>10} {'write p99':>10} {'errors':>7}"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['profile']:<11} {row['reads_per_second']:>9.1f} {row['writes_per_second']:>9.1f} "
+                f"{row['read']['p95_ms']:>9.1f} {row['read']['p99_ms']:>9.1f} "
+                f"{row['write']['p95_ms']:>10.1f} {row['write']['p99_ms']:>10.1f} {row['errors']:>7}"
+            )
+
+    def copy_database(self, source_path, path):
+        # The backup API copies a consistent image even while the source is
+        # in use; the copy starts in rollback-journal mode either way.
+        with sqlite3.connect(source_path) as source, sqlite3.connect(path) as target:
+            source.backup(target)
+            target.execute('PRAGMA journal_mode = DELETE')
+
+    def run(self, alias, profile, products, options):
+        deadline = time.perf_counter() + options['seconds']
+        latencies = {'read': [], 'write': []}
+        errors = []
+        lock = threading.Lock()
+
+        def read():
+            list(
+                Product.objects.using(alias).select_related('category')
+                .order_by('-created_at', '-id')
+                .values('id', 'name', 'price', 'quantity', 'category__name')[:50]
+            )
+
+        def write():
+            pk, price = random.choice(products)
+            with transaction.atomic(using=alias):
+                sold = Product.objects.using(alias).filter(pk=pk, quantity__gte=F('reserved') + 1).update(
+                    quantity=F('quantity') - 1, version=F('version') + 1,
+                )
+                if sold:
+                    Sale.objects.using(alias).bulk_create([Sale(product_id=pk, quantity_sold=1, total_price=price)])
+
+        def worker(kind, operation):
+            timings = []
+            failures = 0
+            connection = connections[alias]
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    operation()
+                except DatabaseError:
+                    failures += 1
+                else:
+                    timings.append(time.perf_counter() - started)
+                # What Django does at the end of every request: without
+                # CONN_MAX_AGE the connection is closed and reopened.
+                connection.close_if_unusable_or_obsolete()
+            connection.close()
+            with lock:
+                latencies[kind].extend(timings)
+                errors.append(failures)
+
+        threads = [threading.Thread(target=worker, args=('read', read)) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=worker, args=('write', write)) for _ in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'profile': profile,
+            'seconds': round(elapsed, 2),
+            'reads': len(latencies['read']),
+            'writes': len(latencies['write']),
+            'reads_per_second': round(len(latencies['read']) / elapsed, 1),
+            'writes_per_second': round(len(latencies['write']) / elapsed, 1),
+            'read': summarize(latencies['read']),
+            'write': summarize(latencies['write']),
+            'mean_write_ms': round(statistics.fmean(latencies['write']) * 1000, 2) if latencies['write'] else 0.0,
+            'errors': sum(errors),
+        }
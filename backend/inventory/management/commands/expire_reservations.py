@@ -0,0 +1,23 @@
+# backend/inventory/management/commands/expire_reservations.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory.reservations import expire_reservations
+
+
+class Command(BaseCommand):
+    help = 'Expires active stock reservations whose TTL has passed and returns their units to sale'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Reservations per transaction (default INVENTORY_RESERVATION_SWEEP_BATCH)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        expired = expire_reservations(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Expired {expired} reservations in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,39 @@
+# backend/inventory/management/commands/generate_benchmark_data.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.benchmarks import BENCHMARK_ADMIN_EMAIL, generate_dataset
+from inventory.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a reproducible data set of categories, products, sales and users for '
+        'benchmark_api; the same --seed always produces the same data'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--products', type=int, default=10000)
+        parser.add_argument('--sales', type=int, default=20000)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--password', default='benchmark', help='Password of the generated users')
+
+    def handle(self, *args, **options):
+        if min(options['categories'], options['products']) < 1 or min(options['sales'], options['users']) < 0:
+            raise CommandError('Need at least one category and one product; counts cannot be negative.')
+        if Product.objects.filter(sku__startswith=f"BENCH-{options['seed']}-").exists():
+            raise CommandError(f"A data set for seed {options['seed']} already exists; pass another --seed.")
+
+        started = time.perf_counter()
+        counts = generate_dataset(
+            categories=options['categories'], products=options['products'], sales=options['sales'],
+            users=options['users'], seed=options['seed'], password=options['password'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['categories']} categories, {counts['products']} products, {counts['sales']} sales "
+            f"and {counts['users']} users in {time.perf_counter() - started:.1f}s "
+            f"(admin: {BENCHMARK_ADMIN_EMAIL})"
+        ))
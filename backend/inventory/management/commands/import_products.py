@@ -0,0 +1,35 @@
+# backend/inventory/management/commands/import_products.py
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.importers import import_products_csv
+
+
+class Command(BaseCommand):
+    help = 'Upserts products from a CSV file keyed on sku (columns: sku, name, category, price, quantity, description, stock_threshold, is_active)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the CSV file')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows written per batch')
+        parser.add_argument('--encoding', default='utf-8-sig', help='File encoding')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] <= 0:
+            raise CommandError('--chunk-size must be greater than zero')
+
+        def report(result):
+            self.stdout.write(
+                f'{result.rows} rows processed ({result.rows_per_second:.0f} rows/sec)'
+            )
+
+        try:
+            with open(options['path'], encoding=options['encoding'], newline='') as csv_file:
+                result = import_products_csv(csv_file, chunk_size=options['chunk_size'], on_chunk=report)
+        except OSError as exc:
+            raise CommandError(f'Cannot read {options["path"]}: {exc}')
+
+        for error in result.errors:
+            self.stdout.write(self.style.WARNING(f'Line {error["line"]}: {error["error"]}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.imported} products from {result.rows} rows '
+            f'({result.failed} failed) in {result.seconds:.2f}s - {result.rows_per_second:.0f} rows/sec'
+        ))
@@ -0,0 +1,42 @@
+# backend/inventory/management/commands/process_sale_queue.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.sale_queue import drain
+
+
+class Command(BaseCommand):
+    help = 'Records the sales accepted by the write-behind queue, in batched transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Sales per transaction (default INVENTORY_SALE_QUEUE_BATCH)'
+        )
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    recorded, rejected = drain(options['batch_size'])
+                except Exception as exc:
+                    # The failed batch went back to pending; keep serving the queue.
+                    if options['once']:
+                        raise CommandError(f'Queue batch failed: {exc}')
+                    self.stderr.write(f'Queue batch failed: {exc!r}')
+                    time.sleep(options['interval'])
+                    continue
+                if recorded or rejected or options['once']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Recorded {recorded} and rejected {rejected} queued sales '
+                        f'in {time.perf_counter() - started:.2f}s'
+                    ))
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
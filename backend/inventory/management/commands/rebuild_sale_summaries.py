@@ -0,0 +1,28 @@
+# backend/inventory/management/commands/rebuild_sale_summaries.py
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.analytics import rebuild_daily_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the SaleDailySummary rollup from Sale rows, optionally for a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', help='Last day to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options['date_from']) if options['date_from'] else None
+            date_to = date.fromisoformat(options['date_to']) if options['date_to'] else None
+        except ValueError as exc:
+            raise CommandError(f'Invalid date: {exc}')
+
+        started = time.perf_counter()
+        created = rebuild_daily_summaries(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {created} daily summary rows in {time.perf_counter() - started:.2f}s'
+        ))
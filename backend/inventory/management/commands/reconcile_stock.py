@@ -0,0 +1,27 @@
+# backend/inventory/management/commands/reconcile_stock.py
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.ledger import discrepancies, repair
+
+
+class Command(BaseCommand):
+    help = 'Compares each product\'s stock column with its movement ledger (snapshot + movements)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help='Record an adjustment movement for each product whose ledger disagrees with its stock'
+        )
+
+    def handle(self, *args, **options):
+        rows = discrepancies()
+        for pk, quantity, ledger_quantity in rows:
+            self.stdout.write(f'Product {pk}: stock {quantity}, ledger {ledger_quantity}')
+        if not rows:
+            self.stdout.write(self.style.SUCCESS('Stock and ledger agree for every product'))
+            return
+        if options['fix']:
+            repair(rows)
+            self.stdout.write(self.style.SUCCESS(f'Recorded {len(rows)} adjustment movements'))
+            return
+        raise CommandError(f'{len(rows)} products disagree with the ledger; rerun with --fix to adjust')
@@ -0,0 +1,17 @@
+# backend/inventory/management/commands/snapshot_stock.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory.ledger import take_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Snapshots the ledger stock of every product that has moved since the previous snapshot'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created = take_snapshots()
+        self.stdout.write(self.style.SUCCESS(
+            f'Took {created} stock snapshots in {time.perf_counter() - started:.2f}s'
+        ))
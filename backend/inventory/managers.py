@@ -0,0 +1,19 @@
+# backend/inventory/managers.py
+from django.db import models
+
+
+class ProductQuerySet(models.QuerySet):
+
+    def with_related(self):
+        # ProductSerializer.category_name reads category.name
+        return self.select_related('category')
+
+    def low_stock(self):
+        return self.filter(low_stock=True)
+
+
+class SaleQuerySet(models.QuerySet):
+
+    def with_related(self):
+        # SaleSerializer reads product.name and sold_by.username
+        return self.select_related('product', 'sold_by')
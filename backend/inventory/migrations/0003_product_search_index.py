@@ -0,0 +1,61 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import inventory.models
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS inventory_product_fts USING fts5("
+    "name, description, sku, category_name, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "INSERT INTO inventory_product_fts (rowid, name, description, sku, category_name) "
+    "SELECT p.id, p.name, COALESCE(p.description, ''), COALESCE(p.sku, ''), c.name "
+    "FROM inventory_product p JOIN inventory_category c ON c.id = p.category_id",
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS inventory_product_fts"]
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS inventory_product_search ("
+    "product_id bigint PRIMARY KEY REFERENCES inventory_product (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS inventory_product_search_gin ON inventory_product_search USING GIN (document)",
+    "INSERT INTO inventory_product_search (product_id, document) "
+    "SELECT p.id, "
+    "setweight(to_tsvector('simple', p.name), 'A') || "
+    "setweight(to_tsvector('simple', COALESCE(p.sku, '')), 'A') || "
+    "setweight(to_tsvector('simple', c.name), 'B') || "
+    "setweight(to_tsvector('simple', COALESCE(p.description, '')), 'C') "
+    "FROM inventory_product p JOIN inventory_category c ON c.id = p.category_id",
+]
+POSTGRES_DROP = ["DROP TABLE IF EXISTS inventory_product_search"]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_filter_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSearchEntry',
+            fields=[
+                ('product', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='inventory.product')),
+                ('document', inventory.models.FTS5DocumentField(db_column='inventory_product_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'inventory_product_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}),
+            run_for_vendor({'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}),
+        ),
+    ]
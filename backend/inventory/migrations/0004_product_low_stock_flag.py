@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:32
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_low_stock(apps, schema_editor):
+    Product = apps.get_model('inventory', 'Product')
+    Product.objects.filter(quantity__lte=F('stock_threshold')).update(low_stock=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_product_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_low_stock_idx',
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='low_stock',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_low_stock, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('low_stock', True)), fields=['category', 'name'], name='product_low_stock_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('inventory', '0004_product_low_stock_flag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaleDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('units_sold', models.BigIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('sale_count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='inventory.category')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='inventory.product')),
+                ('sold_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'category'], name='sale_summary_date_cat_idx'), models.Index(fields=['date', 'sold_by'], name='sale_summary_date_user_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='saledailysummary',
+            constraint=models.UniqueConstraint(fields=('date', 'product', 'sold_by'), name='sale_summary_unique_key'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def open_ledger(apps, schema_editor):
+    # One opening adjustment per product, so the ledger sums to the current
+    # quantity from here on.
+    Product = apps.get_model('inventory', 'Product')
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    now = timezone.now()
+    batch = []
+    for product_id, quantity in Product.objects.exclude(quantity=0).values_list('id', 'quantity').iterator(2000):
+        batch.append(StockMovement(product_id=product_id, kind='adjustment', delta=quantity, created_at=now))
+        if len(batch) == 2000:
+            StockMovement.objects.bulk_create(batch)
+            batch = []
+    StockMovement.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0007_row_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('last_movement_id', models.BigIntegerField()),
+                ('taken_at', models.DateTimeField()),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='inventory.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'taken_at'], name='stock_snapshot_product_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('receipt', 'Receipt'), ('sale', 'Sale'), ('adjustment', 'Adjustment'), ('reversal', 'Reversal')], max_length=10)),
+                ('delta', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='inventory.product')),
+                ('sale', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='inventory.sale')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'id'], name='stock_movement_product_idx')],
+            },
+        ),
+        migrations.RunPython(open_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:23
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_stock_reservations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='receipt',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='QueuedSale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('receipt', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('product_id', models.BigIntegerField()),
+                ('quantity_sold', models.PositiveIntegerField()),
+                ('sold_by_id', models.BigIntegerField(null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('recorded', 'Recorded'), ('rejected', 'Rejected')], default='pending', max_length=10)),
+                ('claim', models.UUIDField(blank=True, null=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('sale_id', models.BigIntegerField(blank=True, null=True)),
+                ('errors', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['id'], name='queued_sale_pending_idx'), models.Index(fields=['product_id', 'status'], name='queued_sale_product_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:43
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_unattributed_rows(apps, schema_editor):
+    # Sellers deleted before this migration left one NULL-seller row each
+    # per day and product; fold them into the oldest.
+    SaleDailySummary = apps.get_model('inventory', 'SaleDailySummary')
+    duplicates = (
+        SaleDailySummary.objects.filter(sold_by__isnull=True)
+        .values('date', 'product')
+        .annotate(rows=Count('id'), keep=Min('id'), units=Sum('units_sold'), revenue=Sum('revenue'), count=Sum('sale_count'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for row in duplicates:
+        group = SaleDailySummary.objects.filter(sold_by__isnull=True, date=row['date'], product=row['product'])
+        group.exclude(pk=row['keep']).delete()
+        group.filter(pk=row['keep']).update(units_sold=row['units'], revenue=row['revenue'], sale_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0010_sale_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_unattributed_rows, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='saledailysummary',
+            name='sale_summary_unique_key',
+        ),
+        migrations.AddConstraint(
+            model_name='saledailysummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('sold_by__isnull', False)), fields=('date', 'product', 'sold_by'), name='sale_summary_unique_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='saledailysummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('sold_by__isnull', True)), fields=('date', 'product'), name='sale_summary_unique_unattributed'),
+        ),
+    ]
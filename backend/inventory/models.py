@@ -1,7 +1,11 @@
 # backend/inventory/models.py
+import uuid
+
 from django.db import models
+from django.db.models import F, Lookup, Q
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from .managers import ProductQuerySet, SaleQuerySet
 
 
 class BaseModel(models.Model):
@@ -12,6 +16,27 @@ class BaseModel(models.Model):
     class Meta:
         abstract = True
 
+class VersionedModel(BaseModel):
+    # Optimistic concurrency: every write bumps `version` by one, so a client
+    # that read version N can make its edit conditional on the row still
+    # being N (inventory.services.save_versioned). Queryset updates in
+    # services bump it themselves; plain save() does it here.
+
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        self.version = F('version') + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
+
 class Category(BaseModel):
 
     name = models.CharField(max_length=100, unique=True)
@@ -24,7 +49,7 @@ class Category(BaseModel):
         verbose_name_plural = "Categories"
         ordering = ['name']
 
-class Product(BaseModel):
+class Product(VersionedModel):
 
     name = models.CharField(max_length=200)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='products')
@@ -34,6 +59,14 @@ class Product(BaseModel):
     stock_threshold = models.PositiveIntegerField(default=5)
     sku = models.CharField(max_length=100, unique=True, blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # Materialised `quantity <= stock_threshold`, kept current by save() and
+    # by every stock UPDATE in inventory.services.
+    low_stock = models.BooleanField(default=False, editable=False)
+    # Units held by active StockReservations, kept current by
+    # inventory.reservations; sales may only take `quantity - reserved`.
+    reserved = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ProductQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -41,30 +74,281 @@ class Product(BaseModel):
     def is_low_stock(self):
         return self.quantity <= self.stock_threshold
 
+    def available_quantity(self):
+        return self.quantity - self.reserved
+
+    def save(self, *args, **kwargs):
+        self.low_stock = self.is_low_stock()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'quantity', 'stock_threshold'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'low_stock'}
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['name']
+        indexes = [
+            # is_active=True compiles to a bare `WHERE is_active`, which only a
+            # partial index can serve on SQLite. Trailing (created_at, id)
+            # matches the keyset pagination order.
+            models.Index(
+                fields=['category', 'created_at', 'id'],
+                name='product_active_cat_idx',
+                condition=Q(is_active=True),
+            ),
+            models.Index(fields=['price'], name='product_price_idx'),
+            models.Index(fields=['quantity'], name='product_quantity_idx'),
+            models.Index(fields=['created_at', 'id'], name='product_created_id_idx'),
+            # Serves the conditional-GET aggregate: max(updated_at) is a seek
+            # and count(*) scans this narrow index instead of the table.
+            models.Index(fields=['updated_at'], name='product_updated_idx'),
+            # Partial index on backends that support one (PostgreSQL, SQLite);
+            # it only holds the low-stock rows.
+            models.Index(
+                fields=['category', 'name'],
+                name='product_low_stock_idx',
+                condition=Q(low_stock=True),
+            ),
+        ]
 
 
-class Sale(BaseModel):
+class Sale(VersionedModel):
 
-    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='sales')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='sales', db_index=False)
     quantity_sold = models.PositiveIntegerField()
     sale_date = models.DateTimeField(auto_now_add=True)
-    sold_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='sales')
+    sold_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='sales', db_index=False)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    # Set when the sale came through the write-behind queue, so a batch the
+    # worker replays after a crash is recognised as already recorded.
+    receipt = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+
+    objects = SaleQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.product.name} - {self.quantity_sold} units sold on {self.sale_date.strftime('%Y-%m-%d')}"
 
     def clean(self):
-        if self.quantity_sold > self.product.quantity:
-            raise ValidationError(f"Cannot sell {self.quantity_sold} units. Only {self.product.quantity} available in stock.")
+        if self.quantity_sold > self.product.available_quantity():
+            raise ValidationError(f"Cannot sell {self.quantity_sold} units. Only {self.product.available_quantity()} available in stock.")
+
+    class Meta:
+        indexes = [
+            # The composites lead with the foreign keys, so the plain FK
+            # indexes are dropped to keep sale inserts cheap.
+            models.Index(fields=['product', 'created_at', 'id'], name='sale_product_created_idx'),
+            models.Index(fields=['sold_by', 'created_at', 'id'], name='sale_sold_by_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='sale_created_id_idx'),
+            models.Index(fields=['sale_date'], name='sale_date_idx'),
+            models.Index(fields=['updated_at'], name='sale_updated_idx'),
+        ]
 
     def save(self, *args, **kwargs):
+        # Stock is adjusted by inventory.services, never here.
         if not self.total_price:
             self.total_price = self.product.price * self.quantity_sold
 
-        self.product.quantity -= self.quantity_sold
-        self.product.save()
+        super().save(*args, **kwargs)
+
+
+class FTS5DocumentField(models.TextField):
+    # The hidden FTS5 column named after its table; only usable with MATCH.
+    pass
+
+
+@FTS5DocumentField.register_lookup
+class FTS5Match(Lookup):
+    lookup_name = 'fts5_match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class ProductSearchEntry(models.Model):
+    # Read-only mapping of the SQLite FTS5 index created in migration 0003,
+    # so searches join it instead of running MATCH per product row.
+
+    product = models.OneToOneField(
+        Product, primary_key=True, db_column='rowid', db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name='search_entry'
+    )
+    document = FTS5DocumentField(db_column='inventory_product_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'inventory_product_fts'
+
+
+class SaleDailySummary(models.Model):
+    # Per day, product and seller rollup of Sale, maintained incrementally by
+    # inventory.analytics and rebuilt by `manage.py rebuild_sale_summaries`.
+
+    date = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_summaries')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='daily_summaries')
+    sold_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='daily_summaries'
+    )
+    units_sold = models.BigIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    sale_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # NULLs are distinct in a plain unique constraint, so the rows of
+            # sales whose seller was deleted get their own.
+            models.UniqueConstraint(
+                fields=['date', 'product', 'sold_by'], condition=Q(sold_by__isnull=False),
+                name='sale_summary_unique_key',
+            ),
+            models.UniqueConstraint(
+                fields=['date', 'product'], condition=Q(sold_by__isnull=True),
+                name='sale_summary_unique_unattributed',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'category'], name='sale_summary_date_cat_idx'),
+            models.Index(fields=['date', 'sold_by'], name='sale_summary_date_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.product_id} - {self.units_sold} units"
+
 
-        super().save(*args, **kwargs)
\ No newline at end of file
+class StockMovement(models.Model):
+    # Append-only ledger of every change to Product.quantity, written by
+    # inventory.services in the same transaction as the stock UPDATE. The
+    # quantity column stays the authoritative, guard-checked current value;
+    # the ledger gives its history (see inventory.ledger).
+
+    RECEIPT = 'receipt'
+    SALE = 'sale'
+    ADJUSTMENT = 'adjustment'
+    REVERSAL = 'reversal'
+    KIND_CHOICES = [
+        (RECEIPT, 'Receipt'),
+        (SALE, 'Sale'),
+        (ADJUSTMENT, 'Adjustment'),
+        (REVERSAL, 'Reversal'),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_movements', db_index=False)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    delta = models.IntegerField()
+    # Indexed: deleting a sale nulls its movements with `WHERE sale_id IN`,
+    # which would otherwise scan the whole ledger.
+    sale = models.ForeignKey(Sale, on_delete=models.SET_NULL, null=True, blank=True, related_name='stock_movements')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Movements since a snapshot are `product = %s AND id > %s`.
+            models.Index(fields=['product', 'id'], name='stock_movement_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} {self.kind} {self.delta:+d}"
+
+
+class StockSnapshot(models.Model):
+    # Product.quantity as the ledger had it once every movement up to and
+    # including `last_movement_id` was applied. Stock at any later point is
+    # the snapshot plus the movements after it.
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_snapshots', db_index=False)
+    quantity = models.IntegerField()
+    last_movement_id = models.BigIntegerField()
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['product', 'taken_at'], name='stock_snapshot_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} = {self.quantity} at {self.taken_at:%Y-%m-%d %H:%M}"
+
+
+class StockReservation(BaseModel):
+    # A checkout hold on `quantity` units of a product until `expires_at`.
+    # Active holds are counted in Product.reserved; confirming one turns it
+    # into a Sale, releasing or expiring it gives the units back (see
+    # inventory.reservations).
+
+    ACTIVE = 'active'
+    CONFIRMED = 'confirmed'
+    RELEASED = 'released'
+    EXPIRED = 'expired'
+    STATUS_CHOICES = [
+        (ACTIVE, 'Active'),
+        (CONFIRMED, 'Confirmed'),
+        (RELEASED, 'Released'),
+        (EXPIRED, 'Expired'),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservations', db_index=False)
+    quantity = models.PositiveIntegerField()
+    reserved_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='reservations', db_index=False
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=ACTIVE)
+    expires_at = models.DateTimeField()
+    sale = models.OneToOneField(
+        Sale, on_delete=models.SET_NULL, null=True, blank=True, related_name='reservation'
+    )
+
+    class Meta:
+        indexes = [
+            # The sweeper's `status = 'active' AND expires_at <= now` scan
+            # only touches the live holds.
+            models.Index(fields=['expires_at'], name='reservation_active_exp_idx', condition=Q(status='active')),
+            models.Index(fields=['product', 'status'], name='reservation_product_idx'),
+            models.Index(fields=['reserved_by', 'created_at', 'id'], name='reservation_user_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='reservation_created_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} x{self.quantity} {self.status} until {self.expires_at:%Y-%m-%d %H:%M}"
+
+
+class QueuedSale(models.Model):
+    # A sale accepted with 202 and waiting for `manage.py process_sale_queue`.
+    # Lives in the `sale_queue` database (inventory.routers.SaleQueueRouter),
+    # so accepting a sale never waits on the main database's writer; product
+    # and user are therefore plain ids rather than foreign keys.
+
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    RECORDED = 'recorded'
+    REJECTED = 'rejected'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (PROCESSING, 'Processing'),
+        (RECORDED, 'Recorded'),
+        (REJECTED, 'Rejected'),
+    ]
+
+    receipt = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    product_id = models.BigIntegerField()
+    quantity_sold = models.PositiveIntegerField()
+    sold_by_id = models.BigIntegerField(null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    claim = models.UUIDField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sale_id = models.BigIntegerField(null=True, blank=True)
+    errors = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker's FIFO scan only touches rows still waiting.
+            models.Index(fields=['id'], name='queued_sale_pending_idx', condition=Q(status='pending')),
+            # Units accepted but not yet recorded, per product.
+            models.Index(fields=['product_id', 'status'], name='queued_sale_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.receipt} {self.status}"
@@ -0,0 +1,176 @@
+# backend/inventory/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # Pages are fetched with a `(created_at, id) < (...)` predicate instead of
+    # an OFFSET, so deep pages cost the same as the first one.
+
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        page_size = getattr(settings, 'INVENTORY_PAGE_SIZE', 50)
+        max_page_size = getattr(settings, 'INVENTORY_MAX_PAGE_SIZE', 500)
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        if requested <= 0:
+            return page_size
+        return min(requested, max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        if hasattr(view, 'get_pagination_ordering'):
+            return tuple(view.get_pagination_ordering())
+        return getattr(view, 'pagination_ordering', self.ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([row async for row in queryset.aiterator()])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        # One row past the page tells whether another page follows.
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request, queryset)
+        self.reverse = self.cursor is not None and self.cursor['d'] == 'p'
+
+        ordering = [self._invert(field) for field in self.ordering] if self.reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self._after(ordering, self.cursor['v']))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'page_size': self.page_size,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'page_size': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], 'n')
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], 'p')
+
+    def _link(self, row, direction):
+        values = [self._get_value(row, field.lstrip('-')) for field in self.ordering]
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(direction, values))
+
+    def _get_value(self, row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def encode_cursor(self, direction, values):
+        encoded = []
+        for value in values:
+            if isinstance(value, datetime):
+                encoded.append({'dt': value.isoformat()})
+            else:
+                encoded.append(value)
+        payload = json.dumps({'d': direction, 'v': encoded}, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request, queryset):
+        # Each value is coerced by its ordering field, so a tampered cursor
+        # is a 404 here rather than an error from the page query.
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            if cursor['d'] not in ('n', 'p') or len(cursor['v']) != len(self.ordering):
+                raise ValueError
+            values = []
+            for field, value in zip(self.ordering, cursor['v']):
+                if isinstance(value, dict):
+                    value = parse_datetime(value['dt'])
+                if value is None:
+                    raise ValueError
+                values.append(self._ordering_field(queryset, field.lstrip('-')).to_python(value))
+        except (TypeError, ValueError, KeyError, AttributeError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        cursor['v'] = values
+        return cursor
+
+    @staticmethod
+    def _ordering_field(queryset, name):
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ValueError(name)
+
+    def _after(self, ordering, values):
+        # (a, b) > (x, y)  ->  a > x OR (a = x AND b > y)
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f'{name}__{lookup}': values[index]})
+            for previous, value in zip(ordering[:index], values[:index]):
+                clause &= Q(**{previous.lstrip('-'): value})
+            condition |= clause
+        return condition
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
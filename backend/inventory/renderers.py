@@ -0,0 +1,50 @@
+# backend/inventory/renderers.py
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    # Drop-in JSONRenderer that encodes with orjson when it is installed. The
+    # bytes are the same as JSONRenderer's compact output: datetimes and other
+    # non-native types go through DRF's JSONEncoder.default, and U+2028/U+2029
+    # are escaped. The one difference is the exponent form of very large or
+    # very small floats (1e16 rather than 1e+16), which parses to the same
+    # value. Indented output, non-default JSON settings and anything orjson
+    # rejects (e.g. integers beyond 64 bits) fall back to JSONRenderer.
+
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not (self.compact and not self.ensure_ascii):
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=self.options)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ExportRenderer(renderers.BaseRenderer):
+    # Lets content negotiation accept the media types the export views
+    # stream themselves. Only error responses are ever rendered through
+    # these, and ExportAPIView sends those as JSON.
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return ORJSONRenderer().render(data, accepted_media_type, renderer_context)
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
@@ -0,0 +1,172 @@
+# backend/inventory/reservations.py
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, When
+from django.utils import timezone
+
+from .models import Product, Sale, StockMovement, StockReservation
+from . import ledger
+from .analytics import rollup_sales
+from .cache import bump_version
+from .services import STOCK_UPDATE_CHUNK, InsufficientStockError, _low_stock_after
+
+
+class ReservationStateError(Exception):
+
+    def __init__(self, reservation, action):
+        self.reservation = reservation
+        state = reservation.status
+        if state == StockReservation.ACTIVE and reservation.expires_at <= timezone.now():
+            state = StockReservation.EXPIRED
+        super().__init__(f"Cannot {action} reservation {reservation.pk}: it is {state}.")
+
+
+def reservation_ttl(seconds=None):
+    default = getattr(settings, 'INVENTORY_RESERVATION_TTL', 900)
+    maximum = getattr(settings, 'INVENTORY_RESERVATION_MAX_TTL', 3600)
+    return timedelta(seconds=min(seconds or default, maximum))
+
+
+def _claim(reservation, status, now, require_unexpired=False):
+    # Moves an active hold to `status` with one conditional UPDATE, so of a
+    # concurrent confirm, release and sweep exactly one wins.
+    queryset = StockReservation.objects.filter(pk=reservation.pk, status=StockReservation.ACTIVE)
+    if require_unexpired:
+        queryset = queryset.filter(expires_at__gt=now)
+    if not queryset.update(status=status, updated_at=now):
+        reservation.refresh_from_db(fields=['status', 'expires_at', 'updated_at'])
+        return False
+    reservation.status = status
+    reservation.updated_at = now
+    return True
+
+
+@transaction.atomic
+def reserve(product, quantity, reserved_by=None, ttl=None):
+    """
+    Hold `quantity` units of `product` for `ttl` seconds (default
+    INVENTORY_RESERVATION_TTL). Raises InsufficientStockError when fewer
+    units are available, counting the holds that already exist.
+    """
+    now = timezone.now()
+    # Same guard as a sale: the hold must fit in quantity - reserved.
+    updated = Product.objects.filter(pk=product.pk, quantity__gte=F('reserved') + quantity).update(
+        reserved=F('reserved') + quantity,
+        version=F('version') + 1,
+        updated_at=now,
+    )
+    if not updated:
+        product.refresh_from_db(fields=['quantity', 'reserved'])
+        raise InsufficientStockError(product, quantity, action='reserve')
+    reservation = StockReservation.objects.create(
+        product=product,
+        quantity=quantity,
+        reserved_by=reserved_by,
+        expires_at=now + reservation_ttl(ttl),
+    )
+    # Product.reserved is part of the product representation, so the row
+    # version above moves too and an If-Match based on it goes stale.
+    bump_version(Product)
+    return reservation
+
+
+@transaction.atomic
+def confirm(reservation, sold_by=None):
+    """
+    Turn an unexpired active hold into a Sale of the held units. The stock
+    was set aside when the hold was made, but a write that bypassed the
+    reserved check can still have taken it; InsufficientStockError then
+    rolls the claim back.
+    """
+    now = timezone.now()
+    if not _claim(reservation, StockReservation.CONFIRMED, now, require_unexpired=True):
+        raise ReservationStateError(reservation, 'confirm')
+
+    product = reservation.product
+    quantity = reservation.quantity
+    updated = Product.objects.filter(pk=product.pk, quantity__gte=quantity, reserved__gte=quantity).update(
+        quantity=F('quantity') - quantity,
+        reserved=F('reserved') - quantity,
+        low_stock=_low_stock_after(-quantity),
+        version=F('version') + 1,
+        updated_at=now,
+    )
+    if not updated:
+        product.refresh_from_db(fields=['quantity', 'reserved'])
+        raise InsufficientStockError(product, quantity, action='confirm')
+    sale = Sale.objects.create(
+        product=product,
+        quantity_sold=quantity,
+        sold_by=sold_by or reservation.reserved_by,
+        total_price=product.price * quantity,
+    )
+    StockReservation.objects.filter(pk=reservation.pk).update(sale=sale)
+    reservation.sale = sale
+    ledger.record(product.pk, StockMovement.SALE, -quantity, sale)
+    rollup_sales([sale])
+    return sale
+
+
+@transaction.atomic
+def release(reservation):
+    now = timezone.now()
+    if not _claim(reservation, StockReservation.RELEASED, now):
+        raise ReservationStateError(reservation, 'release')
+    Product.objects.filter(pk=reservation.product_id).update(
+        reserved=F('reserved') - reservation.quantity,
+        version=F('version') + 1,
+        updated_at=now,
+    )
+    bump_version(Product)
+    return reservation
+
+
+def _expire_batch(now, batch_size):
+    with transaction.atomic():
+        # Rows another worker is confirming or expiring are skipped, not
+        # waited for (a no-op on SQLite, which serializes writers anyway).
+        batch = list(
+            StockReservation.objects.select_for_update(skip_locked=True)
+            .filter(status=StockReservation.ACTIVE, expires_at__lte=now)
+            .order_by('expires_at')
+            .values_list('pk', 'product_id', 'quantity')[:batch_size]
+        )
+        if not batch:
+            return 0
+        StockReservation.objects.filter(pk__in=[pk for pk, _, _ in batch]).update(
+            status=StockReservation.EXPIRED, updated_at=now,
+        )
+        held = defaultdict(int)
+        for _, product_id, quantity in batch:
+            held[product_id] += quantity
+        pks = list(held)
+        for start in range(0, len(pks), STOCK_UPDATE_CHUNK):
+            chunk = pks[start:start + STOCK_UPDATE_CHUNK]
+            Product.objects.filter(pk__in=chunk).update(
+                reserved=Case(*[When(pk=pk, then=F('reserved') - held[pk]) for pk in chunk]),
+                version=F('version') + 1,
+                updated_at=now,
+            )
+        bump_version(Product)
+        return len(batch)
+
+
+def expire_reservations(now=None, batch_size=None):
+    """
+    Expire every active hold whose TTL has passed and give its units back,
+    `batch_size` holds per transaction: one indexed scan and one grouped
+    Product UPDATE per batch. Run periodically (`manage.py
+    expire_reservations`); until then an expired hold still counts against
+    availability but can no longer be confirmed. Returns the number expired.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'INVENTORY_RESERVATION_SWEEP_BATCH', 500)
+    expired = 0
+    while True:
+        count = _expire_batch(now, batch_size)
+        expired += count
+        if count < batch_size:
+            return expired
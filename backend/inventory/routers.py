@@ -0,0 +1,27 @@
+# backend/inventory/routers.py
+SALE_QUEUE_DATABASE = 'sale_queue'
+
+
+class SaleQueueRouter:
+    # QueuedSale lives in its own SQLite file so that accepting a sale is a
+    # write to a database nothing else writes to; every other model stays
+    # out of it.
+
+    def _is_queue(self, model):
+        return model._meta.label_lower == 'inventory.queuedsale'
+
+    def db_for_read(self, model, **hints):
+        return SALE_QUEUE_DATABASE if self._is_queue(model) else None
+
+    def db_for_write(self, model, **hints):
+        return SALE_QUEUE_DATABASE if self._is_queue(model) else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == SALE_QUEUE_DATABASE:
+            return app_label == 'inventory' and model_name == 'queuedsale'
+        if app_label == 'inventory' and model_name == 'queuedsale':
+            return False
+        return None
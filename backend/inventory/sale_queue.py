@@ -0,0 +1,183 @@
+# backend/inventory/sale_queue.py
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Product, QueuedSale, Sale
+from . import services
+from .cache import CACHE_KEY_PREFIX, cache_enabled, get_cache, get_versions
+
+OPEN_STATUSES = [QueuedSale.PENDING, QueuedSale.PROCESSING]
+
+
+def queue_db():
+    return router.db_for_write(QueuedSale)
+
+
+def stock_view(product_id):
+    """
+    (name, available quantity) of a product, or None if it does not exist.
+    Cached under the Product and Sale version counters, so between two
+    worker batches every enqueue for a product is answered from the cache.
+    """
+    if not cache_enabled():
+        return _read_stock_view(product_id)
+    cache = get_cache()
+    versions = '-'.join(str(version) for version in get_versions((Product, Sale)))
+    key = f'{CACHE_KEY_PREFIX}:stock:{versions}:{product_id}'
+    view = cache.get(key)
+    if view is None:
+        view = _read_stock_view(product_id)
+        if view is None:
+            return None
+        cache.set(key, view)
+    return view
+
+
+def _read_stock_view(product_id):
+    product = Product.objects.filter(pk=product_id).only('name', 'quantity', 'reserved').first()
+    if product is None:
+        return None
+    return (product.name, product.available_quantity())
+
+
+def queued_quantity(product_id):
+    # Units already accepted for this product but not yet recorded.
+    return QueuedSale.objects.filter(product_id=product_id, status__in=OPEN_STATUSES).aggregate(
+        total=Sum('quantity_sold')
+    )['total'] or 0
+
+
+def enqueue(product_id, quantity_sold, sold_by=None):
+    return QueuedSale.objects.create(
+        product_id=product_id,
+        quantity_sold=quantity_sold,
+        sold_by_id=sold_by.pk if sold_by is not None else None,
+    )
+
+
+def _claim_batch(batch_size, now):
+    # The claim token marks this worker's rows, so two workers never take
+    # the same sale.
+    token = uuid.uuid4()
+    with transaction.atomic(using=queue_db()):
+        pks = list(
+            QueuedSale.objects.filter(status=QueuedSale.PENDING)
+            .order_by('id').values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return token, []
+        QueuedSale.objects.filter(pk__in=pks, status=QueuedSale.PENDING).update(
+            status=QueuedSale.PROCESSING, claim=token, claimed_at=now,
+        )
+    return token, list(QueuedSale.objects.filter(claim=token).order_by('id'))
+
+
+def _release_claim(token):
+    QueuedSale.objects.filter(claim=token, status=QueuedSale.PROCESSING).update(
+        status=QueuedSale.PENDING, claim=None, claimed_at=None,
+    )
+
+
+def _finish(claimed, entries, sale_ids, errors):
+    # Settles the `entries` that `claimed` still selects. A row recovered
+    # from this worker meanwhile belongs to another claim, and its outcome
+    # to that worker. The touch UPDATE comes first so the rows (the whole
+    # database, on SQLite) are locked before reading which are still ours.
+    now = timezone.now()
+    with transaction.atomic(using=queue_db()):
+        rows = claimed.filter(pk__in=[entry.pk for entry in entries])
+        rows.update(processed_at=now)
+        owned = set(rows.values_list('pk', flat=True))
+        entries = [entry for entry in entries if entry.pk in owned]
+        for entry in entries:
+            entry.claim = None
+            entry.processed_at = now
+            if entry.receipt in sale_ids:
+                entry.status = QueuedSale.RECORDED
+                entry.sale_id = sale_ids[entry.receipt]
+            else:
+                entry.status = QueuedSale.REJECTED
+                entry.errors = errors.get(entry.receipt)
+        QueuedSale.objects.bulk_update(entries, ['status', 'claim', 'processed_at', 'sale_id', 'errors'], batch_size=500)
+
+
+def process_batch(batch_size=None):
+    """
+    Record up to `batch_size` queued sales in one main-database transaction
+    (services.record_sales_bulk, with its stock guard) and store each
+    receipt's outcome. Returns (recorded, rejected).
+    """
+    batch_size = batch_size or settings.INVENTORY_SALE_QUEUE_BATCH
+    token, entries = _claim_batch(batch_size, timezone.now())
+    if not entries:
+        return 0, 0
+
+    User = get_user_model()
+    user_ids = {entry.sold_by_id for entry in entries if entry.sold_by_id is not None}
+    # A seller deleted while their sale waited would fail the foreign key.
+    users = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+    items = [
+        {
+            'product': entry.product_id,
+            'quantity_sold': entry.quantity_sold,
+            'sold_by': entry.sold_by_id if entry.sold_by_id in users else None,
+            'receipt': entry.receipt,
+        }
+        for entry in entries
+    ]
+    try:
+        sales, item_errors = services.record_sales_bulk(items)
+    except Exception:
+        _release_claim(token)
+        raise
+
+    errors = {items[index]['receipt']: item_error for index, item_error in item_errors.items()}
+    sale_ids = {sale.receipt: sale.pk for sale in sales}
+    # Receipts record_sales_bulk skipped were recorded by an earlier claim.
+    skipped = [entry.receipt for entry in entries if entry.receipt not in sale_ids and entry.receipt not in errors]
+    if skipped:
+        sale_ids.update(Sale.objects.filter(receipt__in=skipped).values_list('receipt', 'pk'))
+    _finish(QueuedSale.objects.filter(claim=token), entries, sale_ids, errors)
+    return len(entries) - len(errors), len(errors)
+
+
+def recover_stale_claims(now=None):
+    """
+    Settle batches whose worker died after claiming them. A sale that made it
+    into the main database is marked recorded; the rest go back to pending.
+    A worker that was only slow is safe to overtake: its late outcome is
+    dropped (see _finish) and its receipts are not recorded twice (see
+    services.record_sales_bulk).
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=settings.INVENTORY_SALE_QUEUE_CLAIM_TIMEOUT)
+    stale = QueuedSale.objects.filter(status=QueuedSale.PROCESSING, claimed_at__lt=cutoff)
+    entries = list(stale)
+    if not entries:
+        return 0
+    sale_ids = dict(Sale.objects.filter(receipt__in=[entry.receipt for entry in entries]).values_list('receipt', 'pk'))
+    recorded = [entry for entry in entries if entry.receipt in sale_ids]
+    if recorded:
+        _finish(stale, recorded, sale_ids, {})
+    stale.filter(pk__in=[entry.pk for entry in entries if entry.receipt not in sale_ids]).update(
+        status=QueuedSale.PENDING, claim=None, claimed_at=None,
+    )
+    return len(entries)
+
+
+def drain(batch_size=None):
+    """Process batches until the queue is empty. Returns (recorded, rejected)."""
+    recover_stale_claims()
+    recorded = rejected = 0
+    while True:
+        batch_recorded, batch_rejected = process_batch(batch_size)
+        if not batch_recorded and not batch_rejected:
+            return recorded, rejected
+        recorded += batch_recorded
+        rejected += batch_rejected
@@ -0,0 +1,177 @@
+# backend/inventory/search.py
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Product
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+REINDEX_CHUNK_SIZE = 1000
+
+_backend = None
+
+
+def search_terms(query):
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def empty_results(queryset):
+    # Still annotated, so callers can order by search_rank unconditionally.
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+
+class ProductSearchBackend:
+    # Keeps a product search index in sync and answers ranked queries.
+    # `search` must return the queryset filtered to matches and annotated
+    # with `search_rank`, higher meaning more relevant.
+
+    def index(self, products):
+        pass
+
+    def remove(self, product_ids):
+        pass
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def index_category(self, category):
+        self._index_queryset(Product.objects.filter(category=category))
+
+    def rebuild(self):
+        self._index_queryset(Product.objects.all())
+
+    def _index_queryset(self, queryset):
+        batch = []
+        for product in queryset.select_related('category').iterator(chunk_size=REINDEX_CHUNK_SIZE):
+            batch.append(product)
+            if len(batch) == REINDEX_CHUNK_SIZE:
+                self.index(batch)
+                batch = []
+        if batch:
+            self.index(batch)
+
+
+class ContainsSearchBackend(ProductSearchBackend):
+    # Unindexed fallback for databases without a full-text engine.
+
+    def search(self, queryset, query):
+        if not query.strip():
+            return empty_results(queryset)
+        return queryset.filter(
+            Q(name__icontains=query) |
+            Q(description__icontains=query) |
+            Q(sku__icontains=query) |
+            Q(category__name__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5SearchBackend(ProductSearchBackend):
+    # FTS5 virtual table keyed by product id (rowid); see migration 0003.
+
+    table = 'inventory_product_fts'
+
+    def index(self, products):
+        rows = [
+            (product.pk, product.name, product.description or '', product.sku or '', product.category.name)
+            for product in products
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (rowid, name, description, sku, category_name) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, product_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(pk,) for pk in product_ids])
+
+    def match_expression(self, query):
+        # Every term is quoted (so FTS syntax in user input is inert) and
+        # prefix-matched; terms are ANDed.
+        return ' '.join(f'"{term}"*' for term in search_terms(query))
+
+    def search(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return empty_results(queryset)
+        # Joining the FTS table lets it drive the query and score each match
+        # once; bm25 is lower-is-better, so it is negated to rank descending.
+        return queryset.filter(search_entry__document__fts5_match=expression).annotate(
+            search_rank=-F('search_entry__rank')
+        )
+
+
+class PostgresSearchBackend(ProductSearchBackend):
+    # Weighted tsvector per product in a side table with a GIN index; see
+    # migration 0003.
+
+    table = 'inventory_product_search'
+    config = 'simple'
+
+    def index(self, products):
+        rows = [
+            (product.pk, product.name, product.sku or '', product.category.name, product.description or '')
+            for product in products
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (product_id, document) VALUES (%s, '
+                f"setweight(to_tsvector('{self.config}', %s), 'A') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'A') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'B') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'C')) "
+                'ON CONFLICT (product_id) DO UPDATE SET document = EXCLUDED.document',
+                rows,
+            )
+
+    def remove(self, product_ids):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE product_id = ANY(%s)', [list(product_ids)])
+
+    def tsquery(self, query):
+        return ' & '.join(f'{term}:*' for term in search_terms(query))
+
+    def search(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return empty_results(queryset)
+        product_table = Product._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT product_id FROM {self.table} WHERE document @@ to_tsquery('{self.config}', %s)",
+                [tsquery],
+            )
+        ).annotate(search_rank=RawSQL(
+            f"(SELECT ts_rank_cd(document, to_tsquery('{self.config}', %s)) FROM {self.table} "
+            f'WHERE product_id = "{product_table}"."id")',
+            [tsquery],
+            output_field=FloatField(),
+        ))
+
+
+DEFAULT_BACKENDS = {
+    'sqlite': SQLiteFTS5SearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'INVENTORY_SEARCH_BACKEND', None)
+        if path:
+            backend_class = import_string(path)
+        else:
+            backend_class = DEFAULT_BACKENDS.get(connection.vendor, ContainsSearchBackend)
+        _backend = backend_class()
+    return _backend
@@ -1,62 +1,192 @@
 # backend/inventory/serializers.py
 from rest_framework import serializers
-from .models import Category, Product, Sale
 
-class CategorySerializer(serializers.ModelSerializer):
+from backend.fieldsets import SparseFieldsetSerializerMixin
+from .models import Category, Product, QueuedSale, Sale, StockReservation, StockSnapshot
+from . import reservations, sale_queue, services
+
+class CategorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Category
         fields = ('id', 'name', 'description', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
 
     category_name = serializers.CharField(source='category.name', read_only=True)
     low_stock = serializers.BooleanField(source='is_low_stock', read_only=True)
+    # Sent back on update as the version the edit is based on; see
+    # VersionedUpdateMixin.
+    version = serializers.IntegerField(required=False, min_value=1)
 
     class Meta:
         model = Product
         fields = (
             'id', 'name', 'category', 'category_name', 'price', 'quantity',
-            'description', 'stock_threshold', 'low_stock', 'sku', 'is_active',
-            'created_at', 'updated_at'
+            'description', 'stock_threshold', 'low_stock', 'reserved', 'sku', 'is_active',
+            'version', 'created_at', 'updated_at'
         )
-        read_only_fields = ('id', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'reserved', 'created_at', 'updated_at')
 
-class SaleSerializer(serializers.ModelSerializer):
+    def validate_quantity(self, value):
+        if self.instance is not None and value < self.instance.reserved:
+            raise serializers.ValidationError(
+                f"{self.instance.reserved} units are held by active reservations; quantity cannot go below that."
+            )
+        return value
+
+    def create(self, validated_data):
+        validated_data.pop('version', None)
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        validated_data.pop('version', None)
+        expected_version = validated_data.pop('expected_version', None)
+        return services.update_product(instance, validated_data, expected_version)
+
+class SaleSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
     sold_by_username = serializers.CharField(source='sold_by.username', read_only=True)
+    version = serializers.IntegerField(required=False, min_value=1)
 
     class Meta:
         model = Sale
         fields = (
             'id', 'product', 'product_name', 'quantity_sold', 'sale_date',
-            'sold_by', 'sold_by_username', 'total_price', 'created_at', 'updated_at'
+            'sold_by', 'sold_by_username', 'total_price', 'version', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'sold_by', 'total_price', 'created_at', 'updated_at')
 
     def validate(self, data):
-        product = data['product']
-        quantity_sold = data['quantity_sold']
+        product = data.get('product', getattr(self.instance, 'product', None))
+        quantity_sold = data.get('quantity_sold', getattr(self.instance, 'quantity_sold', None))
 
         if quantity_sold <= 0:
             raise serializers.ValidationError({
                 "quantity_sold": ["Quantity sold must be greater than zero."]
             })
 
-        if quantity_sold > product.quantity:
+        # Fast-fail on the current read; the authoritative check is the
+        # conditional UPDATE in inventory.services.
+        available = product.available_quantity()
+        if self.instance is not None and self.instance.product_id == product.pk:
+            available += self.instance.quantity_sold
+
+        if quantity_sold > available:
             raise serializers.ValidationError({
-                "quantity_sold": [f"Cannot sell {quantity_sold} units of {product.name}. Only {product.quantity} available in stock."]
+                "quantity_sold": [f"Cannot sell {quantity_sold} units of {product.name}. Only {available} available in stock."]
             })
 
         return data
 
     def create(self, validated_data):
-        product = validated_data['product']
-        quantity_sold = validated_data['quantity_sold']
-        
-        validated_data['total_price'] = product.price * quantity_sold
-
-        sale = Sale.objects.create(**validated_data)
-        
-        return sale
\ No newline at end of file
+        return services.record_sale(
+            validated_data['product'],
+            validated_data['quantity_sold'],
+            sold_by=validated_data.get('sold_by'),
+        )
+
+    def update(self, instance, validated_data):
+        return services.update_sale(
+            instance,
+            validated_data.get('product', instance.product),
+            validated_data.get('quantity_sold', instance.quantity_sold),
+            expected_version=validated_data.get('expected_version'),
+        )
+
+
+class StockReservationSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    # Seconds to hold the stock; capped at INVENTORY_RESERVATION_MAX_TTL.
+    ttl = serializers.IntegerField(write_only=True, required=False, min_value=1)
+
+    class Meta:
+        model = StockReservation
+        fields = (
+            'id', 'product', 'product_name', 'quantity', 'reserved_by', 'status',
+            'expires_at', 'sale', 'ttl', 'created_at', 'updated_at'
+        )
+        read_only_fields = ('id', 'reserved_by', 'status', 'expires_at', 'sale', 'created_at', 'updated_at')
+
+    def validate_quantity(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Quantity must be greater than zero.")
+        return value
+
+    def create(self, validated_data):
+        return reservations.reserve(
+            validated_data['product'],
+            validated_data['quantity'],
+            reserved_by=validated_data.get('reserved_by'),
+            ttl=validated_data.get('ttl'),
+        )
+
+
+class QueuedSaleCreateSerializer(serializers.Serializer):
+    # Async-accept counterpart of SaleSerializer: checked against the cached
+    # stock view less the units already queued, without touching the main
+    # database's writer. The worker's stock guard has the final say.
+    product = serializers.IntegerField()
+    quantity_sold = serializers.IntegerField(min_value=1)
+
+    def validate(self, data):
+        view = sale_queue.stock_view(data['product'])
+        if view is None:
+            raise serializers.ValidationError({
+                "product": [f"Invalid pk \"{data['product']}\" - object does not exist."]
+            })
+        name, available = view
+        available -= sale_queue.queued_quantity(data['product'])
+        if data['quantity_sold'] > available:
+            raise serializers.ValidationError({
+                "quantity_sold": [f"Cannot sell {data['quantity_sold']} units of {name}. Only {max(available, 0)} available in stock."]
+            })
+        return data
+
+    def create(self, validated_data):
+        return sale_queue.enqueue(
+            validated_data['product'],
+            validated_data['quantity_sold'],
+            sold_by=validated_data.get('sold_by'),
+        )
+
+
+class QueuedSaleSerializer(serializers.ModelSerializer):
+    product = serializers.IntegerField(source='product_id', read_only=True)
+    sale = serializers.IntegerField(source='sale_id', read_only=True)
+
+    class Meta:
+        model = QueuedSale
+        fields = ('receipt', 'status', 'product', 'quantity_sold', 'sale', 'errors', 'created_at', 'processed_at')
+        read_only_fields = fields
+
+
+class SaleBulkItemSerializer(serializers.Serializer):
+    # Products are resolved in one query by services.record_sales_bulk.
+    product = serializers.IntegerField()
+    quantity_sold = serializers.IntegerField(min_value=1)
+
+
+class SalesAnalyticsQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=['product', 'category', 'user', 'total'], default='product')
+    interval = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if data.get('date_from') and data.get('date_to') and data['date_from'] > data['date_to']:
+            raise serializers.ValidationError({
+                "date_to": ["date_to must not be before date_from."]
+            })
+        return data
+
+
+class StockSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StockSnapshot
+        fields = ['quantity', 'last_movement_id', 'taken_at']
+
+
+class StockAtQuerySerializer(serializers.Serializer):
+    at = serializers.DateTimeField(required=False)
@@ -0,0 +1,295 @@
+# backend/inventory/services.py
+import copy
+from collections import defaultdict
+
+from django.db import router, transaction
+from django.db.models import BooleanField, Case, ExpressionWrapper, F, Q, Value, When
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import Product, Sale, StockMovement
+from . import ledger
+from .analytics import rollup_sales
+from .cache import bump_version
+
+# Three query parameters per product keeps a CASE update under SQLite's limit.
+STOCK_UPDATE_CHUNK = 300
+
+
+class InsufficientStockError(Exception):
+
+    def __init__(self, product, requested, action='sell'):
+        self.product = product
+        self.requested = requested
+        super().__init__(
+            f"Cannot {action} {requested} units of {product.name}. "
+            f"Only {product.available_quantity()} available in stock."
+        )
+
+
+class ReservedStockError(Exception):
+    # Stock set below the units active reservations hold.
+
+    def __init__(self, product, quantity):
+        self.product = product
+        self.quantity = quantity
+        super().__init__(
+            f"{product.reserved} units of {product.name} are held by active reservations; "
+            f"quantity cannot go below that (got {quantity})."
+        )
+
+
+class VersionConflictError(Exception):
+
+    def __init__(self, instance, expected_version):
+        self.instance = instance
+        self.expected_version = expected_version
+        super().__init__(
+            f"{type(instance).__name__} {instance.pk} is at version {instance.version}, not {expected_version}; "
+            "fetch it again and reapply the change."
+        )
+
+
+def changed_fields(instance, data):
+    return {name: value for name, value in data.items() if getattr(instance, name) != value}
+
+
+def save_versioned(instance, changes, expected_version=None, extra=None, refresh=(), guard=None, on_guard=None):
+    # One UPDATE that writes only `changes` (plus derived `extra` columns)
+    # and bumps `version`. With `expected_version` it is conditional on the
+    # row still being at that version, so a stale edit raises
+    # VersionConflictError instead of overwriting a newer one. A `guard` Q
+    # is a further condition on the stored row; when it is what failed,
+    # `on_guard()` is raised. post_save is sent by hand so the search index
+    # and response cache follow along.
+    model = type(instance)
+    queryset = model.objects.filter(pk=instance.pk)
+    if expected_version is not None:
+        queryset = queryset.filter(version=expected_version)
+    if guard is not None:
+        queryset = queryset.filter(guard)
+    if not changes:
+        if expected_version is not None and instance.version != expected_version:
+            raise VersionConflictError(instance, expected_version)
+        return instance
+
+    now = timezone.now()
+    with transaction.atomic():
+        if not queryset.update(**changes, **(extra or {}), version=F('version') + 1, updated_at=now):
+            instance.refresh_from_db(fields=['version'])
+            if guard is not None and expected_version in (None, instance.version):
+                raise on_guard()
+            raise VersionConflictError(instance, expected_version)
+        for name, value in changes.items():
+            setattr(instance, name, value)
+        instance.updated_at = now
+        instance.refresh_from_db(fields=['version', *refresh])
+        post_save.send(
+            sender=model, instance=instance, created=False, update_fields=frozenset(changes),
+            raw=False, using=router.db_for_write(model),
+        )
+    return instance
+
+
+@transaction.atomic
+def update_product(product, data, expected_version=None):
+    changes = changed_fields(product, data)
+    previous_quantity = None
+    if 'quantity' in changes:
+        # Read inside the transaction that writes the new value, so the
+        # ledger adjustment is the exact difference.
+        previous_quantity = Product.objects.select_for_update().values_list('quantity', flat=True).get(pk=product.pk)
+    extra = {}
+    guard = None
+    quantity, threshold = changes.get('quantity'), changes.get('stock_threshold')
+    if quantity is not None:
+        # Active reservations hold `reserved` of the units; the serializer
+        # checks this too, but against a copy that may be stale by now.
+        guard = Q(reserved__lte=quantity)
+    # The flag must follow the stored row, not this request's possibly stale
+    # copy of the column that is not being written.
+    if quantity is not None and threshold is not None:
+        extra['low_stock'] = Value(quantity <= threshold)
+    elif quantity is not None:
+        extra['low_stock'] = ExpressionWrapper(Q(stock_threshold__gte=quantity), output_field=BooleanField())
+    elif threshold is not None:
+        extra['low_stock'] = ExpressionWrapper(Q(quantity__lte=threshold), output_field=BooleanField())
+    save_versioned(
+        product, changes, expected_version, extra, refresh=('quantity', 'low_stock'),
+        guard=guard, on_guard=lambda: _reserved_stock_error(product, quantity),
+    )
+    if previous_quantity is not None:
+        ledger.record(product.pk, StockMovement.ADJUSTMENT, product.quantity - previous_quantity)
+    return product
+
+
+def _reserved_stock_error(product, quantity):
+    product.refresh_from_db(fields=['reserved'])
+    return ReservedStockError(product, quantity)
+
+
+def _low_stock_after(delta):
+    # SET expressions read the pre-update row, so compare the new quantity.
+    return ExpressionWrapper(Q(stock_threshold__gte=F('quantity') + delta), output_field=BooleanField())
+
+
+def refresh_low_stock(product_ids):
+    Product.objects.filter(pk__in=product_ids).update(
+        low_stock=ExpressionWrapper(Q(quantity__lte=F('stock_threshold')), output_field=BooleanField())
+    )
+
+
+def decrement_stock(product, quantity):
+    # Single conditional UPDATE: the `quantity - reserved >= n` guard and the
+    # write happen atomically in the database, so concurrent sales can never
+    # oversell or take units held by a reservation.
+    updated = Product.objects.filter(pk=product.pk, quantity__gte=F('reserved') + quantity).update(
+        quantity=F('quantity') - quantity,
+        low_stock=_low_stock_after(-quantity),
+        version=F('version') + 1,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        product.refresh_from_db(fields=['quantity', 'reserved'])
+        raise InsufficientStockError(product, quantity)
+
+
+def increment_stock(product, quantity):
+    Product.objects.filter(pk=product.pk).update(
+        quantity=F('quantity') + quantity,
+        low_stock=_low_stock_after(quantity),
+        version=F('version') + 1,
+        updated_at=timezone.now(),
+    )
+
+
+def adjust_stock(product, delta):
+    if delta < 0:
+        decrement_stock(product, -delta)
+    elif delta > 0:
+        increment_stock(product, delta)
+
+
+@transaction.atomic
+def record_sale(product, quantity_sold, sold_by=None):
+    decrement_stock(product, quantity_sold)
+    sale = Sale.objects.create(
+        product=product,
+        quantity_sold=quantity_sold,
+        sold_by=sold_by,
+        total_price=product.price * quantity_sold,
+    )
+    ledger.record(product.pk, StockMovement.SALE, -quantity_sold, sale)
+    rollup_sales([sale])
+    return sale
+
+
+@transaction.atomic
+def update_sale(sale, product, quantity_sold, expected_version=None):
+    # The stock and rollup corrections are computed from this copy of the
+    # sale, so the write is always conditional on the version it was read
+    # at: two edits of one sale cannot both apply their delta.
+    previous = copy.copy(sale)
+    save_versioned(
+        sale,
+        changed_fields(sale, {
+            'product': product,
+            'quantity_sold': quantity_sold,
+            'total_price': product.price * quantity_sold,
+        }),
+        sale.version if expected_version is None else expected_version,
+    )
+    rollup_sales([previous], sign=-1)
+    if product.pk == previous.product_id:
+        adjust_stock(product, previous.quantity_sold - quantity_sold)
+    else:
+        increment_stock(previous.product, previous.quantity_sold)
+        decrement_stock(product, quantity_sold)
+    if (product.pk, quantity_sold) != (previous.product_id, previous.quantity_sold):
+        ledger.record_many([
+            (previous.product_id, StockMovement.REVERSAL, previous.quantity_sold, sale),
+            (product.pk, StockMovement.SALE, -quantity_sold, sale),
+        ])
+    rollup_sales([sale])
+    return sale
+
+
+@transaction.atomic
+def delete_sale(sale):
+    # Restocks only if this call removed the row, so a repeated or
+    # concurrent delete of the same sale can't return its stock twice.
+    # Returns whether it did.
+    current = Sale.objects.select_for_update().select_related('product').filter(pk=sale.pk).first()
+    if current is None:
+        return False
+    _, deleted = Sale.objects.filter(pk=sale.pk).delete()
+    if not deleted.get(Sale._meta.label):
+        return False
+    increment_stock(current.product, current.quantity_sold)
+    ledger.record(current.product_id, StockMovement.REVERSAL, current.quantity_sold)
+    rollup_sales([current], sign=-1)
+    return True
+
+
+@transaction.atomic
+def record_sales_bulk(items, sold_by=None, batch_size=500):
+    # `items` are shape-validated dicts of product id and quantity_sold,
+    # optionally with their own `sold_by` user id and queue `receipt`.
+    # Returns the created sales and an {index: errors} map of rejected items.
+    errors = {}
+    sold_by_id = sold_by.pk if sold_by is not None else None
+    product_ids = {item['product'] for item in items}
+    # Lock the affected rows so the quantities read below stay authoritative
+    # until the stock UPDATE at the end of this transaction.
+    products = Product.objects.select_for_update().in_bulk(product_ids)
+
+    # A queue receipt is recorded once. One can come back when its batch was
+    # recovered from a worker that was slow rather than dead; that worker
+    # held the product locks taken above until it committed, so the check
+    # sees its sales. Such items are skipped, neither created nor rejected.
+    receipts = [item['receipt'] for item in items if item.get('receipt')]
+    recorded = set(Sale.objects.filter(receipt__in=receipts).values_list('receipt', flat=True)) if receipts else set()
+
+    remaining = {pk: product.available_quantity() for pk, product in products.items()}
+    deltas = defaultdict(int)
+    sales = []
+    for index, item in enumerate(items):
+        if item.get('receipt') in recorded:
+            continue
+        product = products.get(item['product'])
+        quantity_sold = item['quantity_sold']
+        if product is None:
+            errors[index] = {'product': [f"Invalid pk \"{item['product']}\" - object does not exist."]}
+            continue
+        if quantity_sold > remaining[product.pk]:
+            errors[index] = {'quantity_sold': [
+                f"Cannot sell {quantity_sold} units of {product.name}. Only {remaining[product.pk]} available in stock."
+            ]}
+            continue
+        remaining[product.pk] -= quantity_sold
+        deltas[product.pk] += quantity_sold
+        sales.append(Sale(
+            product_id=product.pk,
+            quantity_sold=quantity_sold,
+            sold_by_id=item.get('sold_by', sold_by_id),
+            receipt=item.get('receipt'),
+            total_price=product.price * quantity_sold,
+        ))
+
+    if deltas:
+        pks = list(deltas)
+        for start in range(0, len(pks), STOCK_UPDATE_CHUNK):
+            chunk = pks[start:start + STOCK_UPDATE_CHUNK]
+            Product.objects.filter(pk__in=chunk).update(
+                quantity=Case(*[When(pk=pk, then=F('quantity') - deltas[pk]) for pk in chunk]),
+                version=F('version') + 1,
+                updated_at=timezone.now(),
+            )
+            refresh_low_stock(chunk)
+        sales = Sale.objects.bulk_create(sales, batch_size=batch_size)
+        ledger.record_many((sale.product_id, StockMovement.SALE, -sale.quantity_sold, sale) for sale in sales)
+        rollup_sales(sales, category_ids={pk: product.category_id for pk, product in products.items()})
+        # bulk_create and queryset updates send no signals.
+        bump_version(Product, Sale)
+
+    return sales, errors
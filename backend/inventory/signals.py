@@ -0,0 +1,52 @@
+# backend/inventory/signals.py
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import ledger
+from .analytics import detach_seller_summaries
+from .cache import bump_version
+from .models import Category, Product, Sale, StockMovement
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index([instance])
+
+
+@receiver(post_save, sender=Product)
+def record_initial_stock(sender, instance, created=False, raw=False, **kwargs):
+    # Later quantity changes are recorded by inventory.services.
+    if created and not raw and instance.quantity:
+        ledger.record(instance.pk, StockMovement.RECEIPT, instance.quantity)
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def detach_seller(sender, instance, **kwargs):
+    # Runs before SET_NULL clears sold_by on the user's sales and summaries.
+    detach_seller_summaries(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def reindex_category(sender, instance, created=False, raw=False, **kwargs):
+    # A new category has no products yet; a rename changes category_name on
+    # every product in it.
+    if not created and not raw:
+        get_search_backend().index_category(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+def invalidate_cached_reads(sender, **kwargs):
+    bump_version(sender)
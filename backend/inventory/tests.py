@@ -1,3 +1,1704 @@
-from django.test import TestCase
+import asyncio
+import base64
+import gzip
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, close_old_connections, connection, connections
+from django.http import StreamingHttpResponse
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from backend import compression
+from backend.sqlite import production_profile
+
+from .models import (
+    Category, Product, QueuedSale, Sale, SaleDailySummary, StockMovement, StockReservation, StockSnapshot
+)
+from . import ledger, reservations, sale_queue, services
+from .importers import import_products_csv
+from .cache import LRUFileBasedCache, get_cache, stats as cache_stats
+
+User = get_user_model()
+
+
+class InventoryTestMixin:
+
+    def _pre_setup(self):
+        # Version counters outlive the per-test rollback, so start each test
+        # with an empty response cache.
+        super()._pre_setup()
+        get_cache().clear()
+        cache_stats.reset()
+
+    def create_user(self, email='admin@example.com', role='admin'):
+        return User.objects.create_user(
+            username=email, email=email, password=None, role=role
+        )
+
+    def create_category(self, name='General'):
+        return Category.objects.create(name=name)
+
+    def create_product(self, category, name='Widget', quantity=100, **kwargs):
+        kwargs.setdefault('price', Decimal('9.99'))
+        return Product.objects.create(category=category, name=name, quantity=quantity, **kwargs)
+
+    def authenticate(self, user):
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+
+@override_settings(INVENTORY_PAGE_SIZE=3, INVENTORY_MAX_PAGE_SIZE=5)
+class KeysetPaginationTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        category = self.create_category()
+        self.products = [self.create_product(category, name=f'Product {i}') for i in range(8)]
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.data['success'])
+            page = response.data['data']
+            ids.extend(item['id'] for item in page['results'])
+            url = page['next']
+        return ids
+
+    def test_walks_every_row_once_newest_first(self):
+        ids = self.collect(reverse('product-list-create'))
+        self.assertEqual(ids, [product.id for product in reversed(self.products)])
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get(reverse('product-list-create')).data['data']
+        second = self.client.get(first['next']).data['data']
+        back = self.client.get(second['previous']).data['data']
+        self.assertEqual(
+            [item['id'] for item in back['results']],
+            [item['id'] for item in first['results']]
+        )
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse('product-list-create'), {'page_size': 100})
+        self.assertEqual(len(response.data['data']['results']), 5)
+
+    def test_ties_on_created_at_are_broken_by_id(self):
+        Product.objects.update(created_at=self.products[0].created_at)
+        ids = self.collect(reverse('product-list-create'))
+        self.assertEqual(ids, sorted((product.id for product in self.products), reverse=True))
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('sale-list-create'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_values_are_rejected(self):
+        created_at = {'dt': self.products[0].created_at.isoformat()}
+        cases = [
+            ('product-list-create', {}, ['abc', 1]),
+            ('product-list-create', {}, [created_at, 'x']),
+            ('product-list-create', {}, [created_at, None]),
+            ('product-list-create', {}, [created_at, [1]]),
+            ('async-product-list', {}, [created_at, 'x']),
+            ('product-list-create', {'search': 'product'}, ['high', 1]),
+        ]
+        for name, params, values in cases:
+            with self.subTest(name=name, values=values):
+                payload = json.dumps({'d': 'n', 'v': values}).encode()
+                cursor = base64.urlsafe_b64encode(payload).decode().rstrip('=')
+                response = self.client.get(reverse(name), {**params, 'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+class QueryCountTests(InventoryTestMixin, TestCase):
+    # Each endpoint must run a fixed number of queries regardless of row count.
+    # Every count includes the conditional-GET aggregate (ETag/Last-Modified).
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category()
+
+    def add_rows(self, count):
+        for _ in range(count):
+            category = self.create_category(name=f'Category {Category.objects.count()}')
+            product = self.create_product(category, name=f'Product {Product.objects.count()}', quantity=50, stock_threshold=60)
+            seller = self.create_user(email=f'seller{User.objects.count()}@example.com', role='user')
+            Sale.objects.create(product=product, quantity_sold=1, sold_by=seller, total_price=product.price)
+
+    def assertConstantQueries(self, url, expected):
+        for rows in (1, 10):
+            self.add_rows(rows)
+            with self.assertNumQueries(expected):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_product_list(self):
+        self.assertConstantQueries(reverse('product-list-create'), 2)
+
+    def test_low_stock_list(self):
+        self.assertConstantQueries(reverse('product-low-stock'), 3)
+
+    def test_sale_list(self):
+        self.assertConstantQueries(reverse('sale-list-create'), 2)
+
+    def test_sale_detail(self):
+        self.add_rows(1)
+        sale = Sale.objects.first()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('sale-detail', args=[sale.pk]))
+        self.assertEqual(response.data['data']['product_name'], sale.product.name)
+
+
+class SaleStockTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.product = self.create_product(self.create_category(), quantity=10)
+
+    def test_create_decrements_stock_once(self):
+        response = self.client.post(reverse('sale-list-create'), {'product': self.product.pk, 'quantity_sold': 3})
+        self.assertEqual(response.status_code, 201)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 7)
+        self.assertEqual(response.data['data']['total_price'], '29.97')
+
+    def test_update_and_delete_restore_stock(self):
+        sale = services.record_sale(self.product, 4, sold_by=self.user)
+        response = self.client.patch(reverse('sale-detail', args=[sale.pk]), {'quantity_sold': 6})
+        self.assertEqual(response.status_code, 200)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 4)
+
+        self.client.delete(reverse('sale-detail', args=[sale.pk]))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 10)
+
+    def test_repeated_delete_restocks_once(self):
+        sale = services.record_sale(self.product, 4, sold_by=self.user)
+        # Both callers loaded the sale before either deleted it.
+        stale = Sale.objects.get(pk=sale.pk)
+        self.assertTrue(services.delete_sale(sale))
+        self.assertFalse(services.delete_sale(stale))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 10)
+        self.assertEqual(StockMovement.objects.filter(kind=StockMovement.REVERSAL).count(), 1)
+        self.assertEqual(SaleDailySummary.objects.get().sale_count, 0)
+
+    def test_guard_rejects_oversell_from_stale_read(self):
+        stale = Product.objects.get(pk=self.product.pk)
+        services.record_sale(self.product, 8)
+        with self.assertRaises(services.InsufficientStockError):
+            services.record_sale(stale, 5)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 2)
+        self.assertEqual(Sale.objects.count(), 1)
+
+
+class ConcurrentSaleStressTests(InventoryTestMixin, TransactionTestCase):
+
+    threads = 8
+    attempts_per_thread = 25
+    initial_stock = 120
+
+    def test_no_lost_updates_or_negative_stock(self):
+        product = self.create_product(self.create_category(), quantity=self.initial_stock)
+        results = {'sold': 0, 'rejected': 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.threads)
+
+        def worker():
+            barrier.wait()
+            try:
+                for _ in range(self.attempts_per_thread):
+                    while True:
+                        try:
+                            services.record_sale(Product.objects.get(pk=product.pk), 1)
+                            outcome = 'sold'
+                        except services.InsufficientStockError:
+                            outcome = 'rejected'
+                        except OperationalError:
+                            # SQLite reports writer contention instead of blocking; retry.
+                            continue
+                        break
+                    with lock:
+                        results[outcome] += 1
+            finally:
+                close_old_connections()
+
+        workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        product.refresh_from_db()
+        self.assertEqual(results['sold'], self.initial_stock)
+        self.assertEqual(results['rejected'], self.threads * self.attempts_per_thread - self.initial_stock)
+        self.assertEqual(Sale.objects.count(), self.initial_stock)
+        self.assertEqual(product.quantity, 0)
+
+
+class SaleBulkCreateTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        category = self.create_category()
+        self.first = self.create_product(category, name='First', quantity=5)
+        self.second = self.create_product(category, name='Second', quantity=10)
+
+    def test_json_batch_reports_per_item_errors(self):
+        payload = [
+            {'product': self.first.pk, 'quantity_sold': 3},
+            {'product': self.first.pk, 'quantity_sold': 3},
+            {'product': self.second.pk, 'quantity_sold': 4},
+            {'product': 999999, 'quantity_sold': 1},
+            {'product': self.second.pk, 'quantity_sold': 0},
+        ]
+        response = self.client.post(reverse('sale-bulk-create'), payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created'], 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 3, 4])
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.quantity, self.second.quantity), (2, 6))
+        self.assertEqual(Sale.objects.filter(sold_by=self.user).count(), 2)
+
+    def test_ndjson_stream(self):
+        body = '\n'.join(
+            f'{{"product": {self.second.pk}, "quantity_sold": 1}}' for _ in range(10)
+        )
+        # Six for the sales themselves, one for their stock movements, four
+        # to open the day's summary row.
+        with self.assertNumQueries(11):
+            response = self.client.post(reverse('sale-bulk-create'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created'], 10)
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.quantity, 0)
+
+
+class ProductImportTests(InventoryTestMixin, TestCase):
+
+    csv_text = (
+        'sku,name,category,price,quantity,description,stock_threshold,is_active\n'
+        'SKU-1,Hammer,Tools,12.50,10,Steel hammer,3,true\n'
+        'SKU-2,Wrench,Tools,8.00,4,,,\n'
+        'SKU-3,Broken,Tools,not-a-price,1,,,\n'
+        'SKU-4,Lamp,Lighting,20,2,,,no\n'
+    )
+
+    def test_upserts_on_sku_in_chunks(self):
+        existing = self.create_product(self.create_category('Tools'), name='Old hammer', sku='SKU-1', quantity=1)
+
+        result = import_products_csv(io.StringIO(self.csv_text), chunk_size=2)
+
+        self.assertEqual((result.rows, result.imported, result.failed), (4, 3, 1))
+        self.assertEqual(result.errors[0]['line'], 4)
+        existing.refresh_from_db()
+        self.assertEqual((existing.name, existing.quantity, existing.stock_threshold), ('Hammer', 10, 3))
+        self.assertEqual(Product.objects.count(), 3)
+        lamp = Product.objects.get(sku='SKU-4')
+        self.assertEqual((lamp.category.name, lamp.is_active), ('Lighting', False))
+
+    def test_rejects_rows_the_database_would(self):
+        csv_text = (
+            'sku,name,category,price\n'
+            f'{"S" * 101},Long sku,Tools,1\n'
+            'SKU-5,Nul\x00name,Tools,1\n'
+            'SKU-6,Negative,Tools,-1\n'
+            'SKU-7,Free,Tools,0\n'
+        )
+        result = import_products_csv(io.StringIO(csv_text))
+        self.assertEqual((result.imported, result.failed), (1, 3))
+        self.assertEqual([error['line'] for error in result.errors], [2, 3, 4])
+        self.assertIn('at most 100 characters', result.errors[0]['error'])
+        self.assertIn('NUL', result.errors[1]['error'])
+        self.assertIn('zero or greater', result.errors[2]['error'])
+        self.assertEqual(Product.objects.get().price, Decimal('0'))
+
+    def test_management_command_reports_throughput(self):
+        path = self.write_csv()
+        out = io.StringIO()
+        call_command('import_products', path, '--chunk-size', '2', stdout=out)
+        self.assertIn('rows/sec', out.getvalue())
+        self.assertEqual(Product.objects.count(), 3)
+
+    def test_upload_endpoint_is_admin_only(self):
+        upload = SimpleUploadedFile('products.csv', self.csv_text.encode('utf-8'), content_type='text/csv')
+        self.authenticate(self.create_user(email='user@example.com', role='user'))
+        response = self.client.post(reverse('product-import'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 403)
+
+        upload.seek(0)
+        self.authenticate(self.create_user())
+        response = self.client.post(reverse('product-import'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['imported'], 3)
+
+    def write_csv(self):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+        with handle:
+            handle.write(self.csv_text)
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+
+class ExportTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        category = self.create_category()
+        self.hammer = self.create_product(category, name='Hammer', quantity=20)
+        self.lamp = self.create_product(category, name='Lamp', quantity=20, is_active=False)
+        services.record_sale(self.hammer, 2, sold_by=self.user)
+        services.record_sale(self.lamp, 1, sold_by=self.user)
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_product_csv_honours_product_filter(self):
+        response = self.client.get(reverse('product-export'), {'is_active': 'true'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = self.read(response).splitlines()
+        self.assertEqual(lines[0].split(',')[:4], ['id', 'name', 'category', 'category_name'])
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Hammer', lines[1])
+
+    def test_sale_ndjson_matches_api_representation(self):
+        response = self.client.get(reverse('sale-export'), {'export_format': 'ndjson', 'product': self.hammer.pk})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        api_row = self.client.get(reverse('sale-list-create'), {'product': self.hammer.pk}).data['data']['results'][0]
+        self.assertEqual(len(rows), 1)
+        for key, value in rows[0].items():
+            self.assertEqual(value, api_row[key], key)
+
+    def test_sale_date_range(self):
+        response = self.client.get(reverse('sale-export'), {'date_from': '2000-01-01', 'date_to': '2000-12-31'})
+        self.assertEqual(len(self.read(response).splitlines()), 1)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(reverse('sale-export'), {'export_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_accept_header_selects_format(self):
+        for media_type, first_line in (('text/csv', 'id,name'), ('application/x-ndjson', '{"id":')):
+            with self.subTest(media_type=media_type):
+                response = self.client.get(reverse('product-export'), HTTP_ACCEPT=media_type)
+                self.assertEqual((response.status_code, response['Content-Type']), (200, media_type))
+                self.assertTrue(self.read(response).startswith(first_line))
+
+        # Errors are still JSON when the client only accepts an export type.
+        response = self.client.get(reverse('sale-export'), {'export_format': 'xml'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual((response.status_code, response['Content-Type']), (400, 'application/json'))
+        self.assertIn('export_format', response.json()['errors'])
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class IndexUsageTests(InventoryTestMixin, TestCase):
+    # Runs each endpoint, then EXPLAINs the query it issued against the table
+    # it lists and checks the planner picks the expected index.
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='admin')
+        cls.category = Category.objects.create(name='General')
+        product = Product.objects.create(category=cls.category, name='Widget', price=Decimal('5'), quantity=3)
+        services.record_sale(product, 1, sold_by=cls.user)
+
+    def setUp(self):
+        self.authenticate(self.user)
+
+    def plan_for(self, url, params, table):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        # Skip the conditional-GET validators; the listing query is the one under test.
+        sql = next(
+            query['sql'] for query in context.captured_queries
+            if f'FROM "{table}"' in query['sql'] and 'validator_' not in query['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return ' | '.join(row[-1] for row in cursor.fetchall())
+
+    def assertUsesIndex(self, index, url, params=None, table='inventory_product'):
+        plan = self.plan_for(reverse(url), params or {}, table)
+        self.assertIn(f'USING INDEX {index}', plan)
+
+    def test_product_list_keyset_order(self):
+        self.assertUsesIndex('product_created_id_idx', 'product-list-create')
+
+    def test_product_active_category_filter(self):
+        self.assertUsesIndex('product_active_cat_idx', 'product-list-create', {'is_active': 'true', 'category': self.category.pk})
+
+    def test_product_price_filter(self):
+        self.assertUsesIndex('product_price_idx', 'product-list-create', {'min_price': 1, 'max_price': 10})
+
+    def test_product_quantity_filter(self):
+        self.assertUsesIndex('product_quantity_idx', 'product-list-create', {'min_quantity': 1, 'max_quantity': 2})
+
+    def test_low_stock_endpoint(self):
+        self.assertUsesIndex('product_low_stock_idx', 'product-low-stock')
+
+    def test_sale_list_keyset_order(self):
+        self.assertUsesIndex('sale_created_id_idx', 'sale-list-create', table='inventory_sale')
+
+    def test_sale_product_filter(self):
+        self.assertUsesIndex('sale_product_created_idx', 'sale-list-create', {'product': 1}, table='inventory_sale')
+
+    def test_sale_sold_by_filter(self):
+        self.assertUsesIndex('sale_sold_by_created_idx', 'sale-list-create', {'sold_by': self.user.pk}, table='inventory_sale')
+
+    def test_conditional_validators(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('product-list-create'))
+        sql = next(query['sql'] for query in context.captured_queries if 'validator_' in query['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' | '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('COVERING INDEX product_updated_idx', plan)
+
+    def test_sale_export_date_range(self):
+        self.assertUsesIndex('sale_date_idx', 'sale-export', {'date_from': '2000-01-01', 'date_to': '2000-12-31'}, table='inventory_sale')
+
+    def test_sale_delete_nulls_ledger_by_index(self):
+        with CaptureQueriesContext(connection) as context:
+            services.delete_sale(Sale.objects.get())
+        sql = next(
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "inventory_stockmovement"')
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' | '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('inventory_stockmovement_sale_id', plan)
+        self.assertNotIn('SCAN', plan)
+
+
+class ProductSearchTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.authenticate(self.create_user())
+        self.tools = self.create_category('Tools')
+        self.hammer = self.create_product(self.tools, name='Claw hammer', sku='HAM-001', description='Steel claw hammer')
+        self.mallet = self.create_product(self.tools, name='Rubber mallet', description='Softer than a hammer')
+        self.lamp = self.create_product(self.create_category('Lighting'), name='Desk lamp')
+
+    def search(self, query):
+        response = self.client.get(reverse('product-list-create'), {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return [item['name'] for item in response.data['data']['results']]
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(self.search('hammer'), ['Claw hammer', 'Rubber mallet'])
+
+    def test_prefix_sku_and_category_terms(self):
+        self.assertEqual(self.search('ham'), ['Claw hammer', 'Rubber mallet'])
+        self.assertEqual(self.search('HAM-001'), ['Claw hammer'])
+        self.assertEqual(self.search('lighting'), ['Desk lamp'])
+
+    def test_index_follows_product_and_category_changes(self):
+        self.lamp.name = 'Floor lamp'
+        self.lamp.save()
+        self.assertEqual(self.search('floor'), ['Floor lamp'])
+
+        self.tools.name = 'Hardware'
+        self.tools.save()
+        self.assertCountEqual(self.search('hardware'), ['Claw hammer', 'Rubber mallet'])
+
+        self.mallet.delete()
+        self.assertEqual(self.search('hardware'), ['Claw hammer'])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('"hammer*(:'), ['Claw hammer', 'Rubber mallet'])
+        self.assertEqual(self.search('!!!'), [])
+
+    def test_imported_products_are_searchable(self):
+        import_products_csv(io.StringIO('sku,name,category,price\nTAPE-1,Measuring tape,Tools,4.50\n'))
+        self.assertEqual(self.search('measuring'), ['Measuring tape'])
+
+
+class LowStockFlagTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.tools = self.create_category('Tools')
+        self.product = self.create_product(self.tools, quantity=7, stock_threshold=5)
+
+    def flag(self):
+        return Product.objects.values_list('low_stock', flat=True).get(pk=self.product.pk)
+
+    def test_stock_mutations_maintain_flag(self):
+        self.assertFalse(self.flag())
+        sale = services.record_sale(self.product, 2)
+        self.assertTrue(self.flag())
+        services.delete_sale(sale)
+        self.assertFalse(self.flag())
+        services.record_sales_bulk([{'product': self.product.pk, 'quantity_sold': 3}])
+        self.assertTrue(self.flag())
+
+    def test_threshold_edit_maintains_flag(self):
+        self.client.patch(reverse('product-detail', args=[self.product.pk]), {'stock_threshold': 10})
+        self.assertTrue(self.flag())
+        self.product.refresh_from_db()
+        self.product.stock_threshold = 1
+        self.product.save(update_fields=['stock_threshold'])
+        self.assertFalse(self.flag())
+
+    def test_endpoint_reports_category_counts(self):
+        lighting = self.create_category('Lighting')
+        self.create_product(self.tools, name='Saw', quantity=0)
+        self.create_product(lighting, name='Lamp', quantity=1)
+        self.create_product(lighting, name='Bulb', quantity=100)
+
+        response = self.client.get(reverse('product-low-stock'))
+        self.assertEqual([item['name'] for item in response.data['data']], ['Lamp', 'Saw'])
+        self.assertEqual(
+            [(row['category_name'], row['count']) for row in response.data['category_counts']],
+            [('Lighting', 1), ('Tools', 1)]
+        )
+
+
+class SalesAnalyticsTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.seller = self.create_user(email='seller@example.com', role='user')
+        self.authenticate(self.user)
+        self.tools = self.create_category('Tools')
+        self.hammer = self.create_product(self.tools, name='Hammer', quantity=100, price=Decimal('10.00'))
+        self.saw = self.create_product(self.tools, name='Saw', quantity=100, price=Decimal('25.00'))
+
+    def snapshot(self):
+        return sorted(
+            SaleDailySummary.objects.filter(sale_count__gt=0)
+            .values_list('date', 'product_id', 'category_id', 'sold_by_id', 'units_sold', 'revenue', 'sale_count')
+        )
+
+    def test_incremental_rollup_matches_rebuild(self):
+        services.record_sale(self.hammer, 2, sold_by=self.user)
+        moved = services.record_sale(self.hammer, 1, sold_by=self.seller)
+        removed = services.record_sale(self.saw, 1, sold_by=self.user)
+        services.record_sales_bulk([{'product': self.saw.pk, 'quantity_sold': 3}], sold_by=self.seller)
+        services.update_sale(moved, self.saw, 2)
+        services.delete_sale(removed)
+
+        incremental = self.snapshot()
+        call_command('rebuild_sale_summaries', stdout=io.StringIO())
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_group_by_category_and_month(self):
+        services.record_sale(self.hammer, 2, sold_by=self.user)
+        services.record_sale(self.saw, 1, sold_by=self.seller)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('sales-analytics'), {'group_by': 'category', 'interval': 'month'})
+        self.assertEqual(response.status_code, 200)
+        row, = response.data['data']
+        self.assertEqual(row['period'], timezone.localdate().replace(day=1).isoformat())
+        self.assertEqual((row['category_name'], row['units_sold'], row['revenue'], row['sale_count']), ('Tools', 3, '45.00', 2))
+
+    def test_group_by_user(self):
+        services.record_sale(self.hammer, 2, sold_by=self.user)
+        services.record_sale(self.saw, 1, sold_by=self.seller)
+        response = self.client.get(reverse('sales-analytics'), {'group_by': 'user'})
+        self.assertEqual(
+            [(row['user_name'], row['revenue']) for row in response.data['data']],
+            [(self.user.username, '20.00'), (self.seller.username, '25.00')]
+        )
+
+    def test_deleted_sellers_share_one_unattributed_row(self):
+        other = self.create_user(email='other@example.com', role='user')
+        services.record_sale(self.hammer, 2, sold_by=self.seller)
+        kept = services.record_sale(self.hammer, 1, sold_by=other)
+        self.seller.delete()
+        other.delete()
+
+        summary, = SaleDailySummary.objects.all()
+        self.assertEqual((summary.sold_by_id, summary.units_sold, summary.sale_count), (None, 3, 2))
+        services.delete_sale(Sale.objects.get(pk=kept.pk))
+        response = self.client.get(reverse('sales-analytics'), {'group_by': 'total'})
+        self.assertEqual(
+            [(row['units_sold'], row['sale_count']) for row in response.data['data']], [(2, 1)]
+        )
+        incremental = self.snapshot()
+        call_command('rebuild_sale_summaries', stdout=io.StringIO())
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_rollup_queries_do_not_grow_with_groups(self):
+        services.record_sale(self.hammer, 1, sold_by=self.user)
+        items = [
+            {'product': product.pk, 'quantity_sold': 1, 'sold_by': seller.pk}
+            for product in (self.hammer, self.saw) for seller in (self.user, self.seller)
+        ]
+        # One SELECT, one CASE UPDATE for the existing row and a
+        # savepoint-wrapped INSERT for the three new ones.
+        with CaptureQueriesContext(connection) as context:
+            services.record_sales_bulk(items)
+        summary_queries = [query for query in context.captured_queries if 'inventory_saledailysummary' in query['sql']]
+        self.assertEqual(len(summary_queries), 3)
+        self.assertEqual(SaleDailySummary.objects.count(), 4)
+        self.assertEqual(SaleDailySummary.objects.get(product=self.hammer, sold_by=self.user).units_sold, 2)
+
+    def test_invalid_query(self):
+        response = self.client.get(reverse('sales-analytics'), {'interval': 'hour'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('interval', response.data['errors'])
+
+
+class ReadCacheTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category('Tools')
+        self.product = self.create_product(self.category, name='Hammer', quantity=10)
+
+    def test_category_list_served_from_cache(self):
+        url = reverse('category-list-create')
+        first = self.client.get(url)
+        # Only the conditional-GET aggregate reaches the database.
+        with self.assertNumQueries(1):
+            second = self.client.get(url)
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.data, second.data)
+
+        self.create_category('Paint')
+        third = self.client.get(url)
+        self.assertEqual(third['X-Cache'], 'MISS')
+        self.assertEqual(third.data['count'], 2)
+
+    @override_settings(ALLOW_PROCESS_LOCAL_CACHES=False)
+    def test_disabled_with_process_local_cache(self):
+        # Each worker would keep its own version counters and miss the
+        # other workers' writes.
+        url = reverse('category-list-create')
+        self.client.get(url)
+        self.assertNotIn('X-Cache', self.client.get(url))
+        self.assertFalse(self.client.get(reverse('inventory-cache-stats')).data['data']['enabled'])
+
+    def test_query_params_are_normalized(self):
+        url = reverse('category-list-create')
+        self.client.get(url + '?b=2&a=1')
+        self.assertEqual(self.client.get(url + '?a=1&b=2')['X-Cache'], 'HIT')
+
+    def test_sale_invalidates_product_detail(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        services.record_sale(self.product, 3, sold_by=self.user)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data']['quantity'], 7)
+
+        services.record_sales_bulk([{'product': self.product.pk, 'quantity_sold': 2}], sold_by=self.user)
+        self.assertEqual(self.client.get(url).data['data']['quantity'], 5)
+
+    def test_category_rename_invalidates_product_detail(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        self.client.get(url)
+        self.category.name = 'Hand tools'
+        self.category.save()
+        self.assertEqual(self.client.get(url).data['data']['category_name'], 'Hand tools')
+
+    def test_missing_product_is_not_cached(self):
+        url = reverse('product-detail', args=[self.product.pk + 100])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(cache_stats.as_dict()['hits'], 0)
+
+    def test_stats_endpoint(self):
+        url = reverse('category-list-create')
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(url)
+        data = self.client.get(reverse('inventory-cache-stats')).data['data']
+        self.assertEqual((data['hits'], data['misses']), (2, 1))
+        self.assertEqual(data['hit_ratio'], 0.6667)
+
+    def test_file_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as location:
+            cache = LRUFileBasedCache(location, {'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3}})
+            for index, key in enumerate(['a', 'b', 'c']):
+                cache.set(key, key)
+                os.utime(cache._key_to_file(key), (index, index))
+            self.assertEqual(cache.get('a'), 'a')
+            cache.set('d', 'd')
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual([cache.get(key) for key in 'acd'], ['a', 'c', 'd'])
+
+
+class ConditionalGetTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category('Tools')
+        self.products = [self.create_product(self.category, name=f'Product {i}') for i in range(3)]
+
+    def test_unchanged_list_is_one_query(self):
+        url = reverse('product-list-create')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], first['ETag'])
+
+    def test_if_modified_since(self):
+        url = reverse('category-list-create')
+        first = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        stale = 'Mon, 01 Jan 2001 00:00:00 GMT'
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=stale).status_code, 200)
+
+    def test_etag_changes_on_edit_delete_and_filter(self):
+        url = reverse('product-list-create')
+        etag = self.client.get(url)['ETag']
+
+        self.products[0].delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        services.record_sale(self.products[1], 1, sold_by=self.user)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.assertNotEqual(self.client.get(url, {'is_active': 'true'})['ETag'], self.client.get(url)['ETag'])
+
+    def test_category_rename_changes_product_etag(self):
+        url = reverse('product-detail', args=[self.products[0].pk])
+        etag = self.client.get(url)['ETag']
+        self.category.name = 'Hand tools'
+        self.category.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_seller_rename_changes_sale_etag(self):
+        sale = services.record_sale(self.products[0], 1, sold_by=self.user)
+        for url in (reverse('sale-list-create'), reverse('sale-detail', args=[sale.pk])):
+            etag = self.client.get(url)['ETag']
+            self.user.username = f'{self.user.username}-renamed'
+            self.user.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            data = response.data['data']
+            data = data['results'][0] if 'results' in data else data
+            self.assertEqual(data['sold_by_username'], self.user.username)
+
+    def test_detail_missing_is_404(self):
+        response = self.client.get(reverse('product-detail', args=[999]), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+
+class AsyncReadViewTests(InventoryTestMixin, TestCase):
+    # The async views must answer exactly like their DRF counterparts.
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category('Tools')
+        self.products = [
+            self.create_product(self.category, name=f'Product {i}', quantity=i, stock_threshold=2)
+            for i in range(4)
+        ]
+        self.sale = services.record_sale(self.products[3], 1, sold_by=self.user)
+
+    def assertSameResponse(self, sync_name, async_name, args=(), params=None):
+        sync_response = self.client.get(reverse(sync_name, args=args), params)
+        async_response = self.client.get(reverse(async_name, args=args), params)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        # Cursor links point back at each stack's own path.
+        self.assertEqual(async_response.content.replace(b'/async/', b'/'), sync_response.content)
+        self.assertEqual('ETag' in async_response, 'ETag' in sync_response)
+        return async_response
+
+    def test_lists_match(self):
+        self.assertSameResponse('category-list-create', 'async-category-list')
+        self.assertSameResponse('product-list-create', 'async-product-list', params={'page_size': 2})
+        self.assertSameResponse('product-list-create', 'async-product-list', params={'max_quantity': 1})
+        self.assertSameResponse('product-list-create', 'async-product-list', params={'search': 'product'})
+        self.assertSameResponse('product-low-stock', 'async-product-low-stock')
+        self.assertSameResponse('sale-list-create', 'async-sale-list', params={'search': 'product 3'})
+
+    def test_details_match(self):
+        self.assertSameResponse('category-detail', 'async-category-detail', args=[self.category.pk])
+        self.assertSameResponse('product-detail', 'async-product-detail', args=[self.products[0].pk])
+        self.assertSameResponse('sale-detail', 'async-sale-detail', args=[self.sale.pk])
+        self.assertSameResponse('product-detail', 'async-product-detail', args=[999])
+
+    def test_pagination_cursor(self):
+        first = self.client.get(reverse('async-product-list'), {'page_size': 3}).json()
+        second = self.client.get(first['data']['next']).json()
+        self.assertEqual(
+            [row['id'] for row in first['data']['results'] + second['data']['results']],
+            [product.pk for product in reversed(self.products)]
+        )
+
+    def test_conditional_get(self):
+        url = reverse('async-product-list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    @override_settings(DEBUG=True)
+    def test_middleware_runs_natively_under_asgi(self):
+        # Django logs each sync middleware it has to adapt onto a thread.
+        with self.assertNoLogs('django.request', 'DEBUG'):
+            ASGIHandler()
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(reverse('async-product-list'), {'category': 999}).status_code, 400)
+        self.assertEqual(self.client.post(reverse('async-product-list')).status_code, 405)
+        anonymous = APIClient()
+        response = anonymous.get(reverse('async-product-list'))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+        self.client.force_authenticate(self.create_user(email='user@example.com', role='user'))
+        self.assertEqual(self.client.get(reverse('async-sale-list')).status_code, 200)
+
+
+@override_settings(INVENTORY_PAGE_SIZE=3)
+class FastSerializationTests(InventoryTestMixin, TestCase):
+    # Compiled serializers and the orjson renderer must not change a byte.
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category('Tööls \u2028')
+        self.products = [
+            self.create_product(self.category, name=f'Product {i} ✓', quantity=i, stock_threshold=2,
+                                price=Decimal('1234.5'), description=None if i % 2 else 'Line\u2029break')
+            for i in range(5)
+        ]
+        services.record_sale(self.products[4], 1, sold_by=self.user)
+        services.record_sale(self.products[3], 2)
+
+    def assertSameBytes(self, name, params=None):
+        fast = self.client.get(reverse(name), params)
+        with override_settings(INVENTORY_FAST_SERIALIZATION=False):
+            get_cache().clear()
+            slow = self.client.get(reverse(name), params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+        return fast
+
+    def test_lists_match_model_serializers(self):
+        self.assertSameBytes('category-list-create')
+        self.assertSameBytes('product-low-stock')
+        self.assertSameBytes('product-list-create', {'search': 'product'})
+        self.assertSameBytes('product-list-create', {'ordering': 'price'})
+        sales = self.assertSameBytes('sale-list-create').json()['data']['results']
+        self.assertEqual(['sold_by_username' in row for row in sales], [False, True])
+
+    def test_cursor_pages_match(self):
+        response = self.assertSameBytes('product-list-create')
+        self.assertSameBytes('product-list-create', {'cursor': response.json()['data']['next'].split('cursor=')[1]})
+
+    def test_compiled_serializer(self):
+        from .fast_serializers import compile_serializer
+        from .serializers import ProductSerializer
+
+        compiled = compile_serializer(ProductSerializer, {'is_low_stock': 'low_stock'})
+        self.assertIs(compiled, compile_serializer(ProductSerializer, {'is_low_stock': 'low_stock'}))
+        queryset = Product.objects.with_related().order_by('pk')
+        self.assertEqual(compiled.many(compiled.values(queryset)), ProductSerializer(queryset, many=True).data)
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import ORJSONRenderer
+
+        data = {
+            'decimal': Decimal('12.50'), 'text': 'a\u2028b\u2029c ✓ "q"', 'when': timezone.now(),
+            'date': timezone.now().date(), 'nested': [{'n': None, 'b': True, 'f': 0.5}], 1: 'int key',
+            'big': 2 ** 70,
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        context = {'indent': 2}
+        self.assertEqual(
+            ORJSONRenderer().render(data, renderer_context=context), JSONRenderer().render(data, renderer_context=context)
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+@override_settings(INVENTORY_PAGE_SIZE=2)
+class SparseFieldsetTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category('Tools')
+        self.products = [
+            self.create_product(self.category, name=f'Product {i}', quantity=i, stock_threshold=1, description='Long text')
+            for i in range(3)
+        ]
+        self.sale = services.record_sale(self.products[2], 1, sold_by=self.user)
+
+    def get(self, name, args=(), **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(name, args=args), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['data'], ' '.join(query['sql'] for query in context.captured_queries)
+
+    def test_product_list(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(INVENTORY_FAST_SERIALIZATION=fast):
+                data, sql = self.get('product-list-create', fields='low_stock,name,id,quantity')
+                self.assertEqual(data['results'][0], {'id': self.products[2].pk, 'name': 'Product 2', 'quantity': 1, 'low_stock': True})
+                self.assertNotIn('"description"', sql)
+                self.assertNotIn('inventory_category', sql.split('validator_')[-1])
+
+                page = self.client.get(data['next'].replace('low_stock%2C', '')).json()['data']
+                self.assertEqual(page['results'], [{'id': self.products[0].pk, 'name': 'Product 0', 'quantity': 0}])
+
+    def test_details(self):
+        data, sql = self.get('product-detail', args=[self.products[0].pk], fields='id,category_name,low_stock')
+        self.assertEqual(data, {'id': self.products[0].pk, 'category_name': 'Tools', 'low_stock': True})
+        self.assertNotIn('"description"', sql)
+        data, sql = self.get('sale-detail', args=[self.sale.pk], fields='product_name')
+        self.assertEqual(data, {'product_name': 'Product 2'})
+        self.assertNotIn('user_module_user', sql)
+        data, _ = self.get('category-detail', args=[self.category.pk], fields='name')
+        self.assertEqual(data, {'name': 'Tools'})
+
+    def test_other_lists(self):
+        data, sql = self.get('sale-list-create', fields='id,sold_by_username')
+        self.assertEqual(data['results'], [{'id': self.sale.pk, 'sold_by_username': self.user.username}])
+        self.assertNotIn('inventory_product', sql.split('validator_')[-1])
+        data, _ = self.get('category-list-create', fields='id')
+        self.assertEqual(data, [{'id': self.category.pk}])
+        data, _ = self.get('product-low-stock', fields='name')
+        self.assertEqual(data, [{'name': 'Product 0'}, {'name': 'Product 1'}, {'name': 'Product 2'}])
+
+    def test_async_views_match(self):
+        for name, args in (('product-list-create', ()), ('product-detail', (self.products[0].pk,))):
+            url = reverse(name, args=args)
+            sync = self.client.get(url, {'fields': 'id,low_stock'})
+            async_response = self.client.get(url.replace('/inventory/', '/inventory/async/'), {'fields': 'id,low_stock'})
+            self.assertEqual(async_response.content.replace(b'/async/', b'/'), sync.content)
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse('product-list-create'), {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['fields'][0])
+
+    def test_writes_return_every_field(self):
+        response = self.client.patch(
+            reverse('category-detail', args=[self.category.pk]) + '?fields=id', {'description': 'New'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['description'], 'New')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category('Tools')
+        for i in range(20):
+            self.create_product(self.category, name=f'Product {i}', quantity=0, sku=f'SKU-{i}')
+
+    def test_large_response_is_gzipped(self):
+        plain = self.client.get(reverse('product-list-create'))
+        response = self.client.get(reverse('product-list-create'), HTTP_ACCEPT_ENCODING='br;q=1.0, gzip;q=0.8')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_small_and_unaccepted_responses_are_not_compressed(self):
+        small = self.client.get(reverse('category-detail', args=[self.category.pk]), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(small.has_header('Content-Encoding'))
+        refused = self.client.get(reverse('product-list-create'), HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertFalse(refused.has_header('Content-Encoding'))
+        self.assertEqual(refused.json()['success'], True)
+
+    def test_html_is_not_compressed(self):
+        # Pages carrying a CSRF token are left to BREACH-safe handling.
+        response = self.client.get('/admin/login/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(response.content), 1024)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_export_is_gzipped(self):
+        plain = b''.join(self.client.get(reverse('product-export')).streaming_content)
+        response = self.client.get(reverse('product-export'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    def test_async_streaming_is_gzipped(self):
+        async def chunks():
+            for i in range(200):
+                yield f'{{"row": {i}}}\n'.encode()
+
+        async def get_response(request):
+            return StreamingHttpResponse(chunks(), content_type='application/x-ndjson')
+
+        async def collect(response):
+            return b''.join([chunk async for chunk in response])
+
+        middleware = compression.CompressionMiddleware(get_response)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        request = APIRequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = async_to_sync(middleware)(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = async_to_sync(collect)(response.streaming_content)
+        self.assertEqual(gzip.decompress(body).count(b'\n'), 200)
+
+    def test_cached_payload_is_stored_compressed(self):
+        url = reverse('product-low-stock')
+        plain = self.client.get(url).content
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(first['X-Cache'], 'HIT')
+        self.assertEqual(gzip.decompress(first.content), plain)
+        # The compressed bytes come straight from the cache: only the
+        # conditional-GET validators touch the database.
+        with self.assertNumQueries(1):
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual((second['X-Cache'], second.content), ('HIT', first.content))
+
+        Product.objects.get(name='Product 0').save()
+        changed = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(changed['X-Cache'], 'MISS')
+
+    @unittest.skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli_preferred_when_available(self):
+        response = self.client.get(reverse('product-list-create'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), self.client.get(reverse('product-list-create')).content)
+
+    def test_negotiation(self):
+        factory = APIRequestFactory()
+        cases = {
+            '': None, 'identity': None, 'gzip': 'gzip', 'GZIP;q=0.5': 'gzip', 'gzip;q=0': None,
+            '*': compression.available_encodings()[0], 'br': 'br' if compression.brotli else None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                request = factory.get('/', HTTP_ACCEPT_ENCODING=header)
+                self.assertEqual(compression.negotiate_encoding(request), expected)
+
+
+class VersionedUpdateTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.category = self.create_category()
+        self.product = self.create_product(self.category, quantity=10, stock_threshold=5, description='Keep me')
+
+    def patch(self, url, data, **headers):
+        return self.client.patch(url, data, format='json', **headers)
+
+    def test_if_match(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        self.assertEqual(self.client.get(url).json()['data']['version'], 1)
+
+        response = self.patch(url, {'price': '12.00'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['version'], 2)
+
+        stale = self.patch(url, {'name': 'Renamed'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(stale.status_code, 412)
+        self.assertEqual(stale.json()['current_version'], 2)
+        self.assertEqual(self.patch(url, {'name': 'Renamed'}, HTTP_IF_MATCH='W/"2"').status_code, 412)
+        self.assertEqual(self.patch(url, {'name': 'Renamed'}, HTTP_IF_MATCH='*').status_code, 200)
+
+        product = self.client.get(url).json()['data']
+        self.assertEqual((product['name'], product['price'], product['version']), ('Renamed', '12.00', 3))
+
+    def test_if_match_with_etag_from_get(self):
+        for url in (
+            reverse('product-detail', args=[self.product.pk]),
+            reverse('sale-detail', args=[services.record_sale(self.product, 1).pk]),
+        ):
+            etag = self.client.get(url)['ETag']
+            self.assertFalse(etag.startswith('W/'))
+            data = {'description': 'Edited'} if 'products' in url else {'quantity_sold': 2}
+            self.assertEqual(self.patch(url, data, HTTP_IF_MATCH=etag).status_code, 200)
+            # The ETag changed with the version; the old one is now stale.
+            self.assertNotEqual(self.client.get(url)['ETag'], etag)
+            self.assertEqual(self.patch(url, data, HTTP_IF_MATCH=etag).status_code, 412)
+
+    def test_if_match_with_compressed_etag(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        # Compressed by the middleware when the cache is off, pre-compressed
+        # from the cache when it is on; the tag must work either way.
+        for cache_on in (False, True):
+            with self.subTest(cache_on=cache_on), override_settings(
+                COMPRESSION_MIN_SIZE=200, ALLOW_PROCESS_LOCAL_CACHES=cache_on,
+            ):
+                self.patch(url, {'description': 'x' * 300})
+                response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+                etag = response['ETag']
+                self.assertFalse(etag.startswith('W/'))
+                self.assertTrue(etag.endswith('-gzip"'))
+
+                revalidated = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual((revalidated.status_code, revalidated['ETag']), (304, etag))
+                self.assertEqual(self.patch(url, {'name': f'Renamed {cache_on}'}, HTTP_IF_MATCH=etag).status_code, 200)
+                self.assertEqual(self.patch(url, {'name': 'Stale'}, HTTP_IF_MATCH=etag).status_code, 412)
+
+    def test_unparseable_if_match(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        for header in ('1', '"abc"', 'W/'):
+            with self.subTest(header=header):
+                response = self.patch(url, {'name': 'Renamed'}, HTTP_IF_MATCH=header)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('if_match', response.json()['errors'])
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.name, self.product.version), ('Widget', 1))
+
+    def test_payload_version(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        self.assertEqual(self.patch(url, {'quantity': 3, 'version': 1}).status_code, 200)
+        self.assertEqual(self.patch(url, {'quantity': 4, 'version': 1}).status_code, 412)
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.quantity, self.product.low_stock, self.product.version), (3, True, 2))
+
+    def test_writes_only_changed_columns(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.put(url, {
+                'name': 'Widget', 'category': self.category.pk, 'price': '9.99', 'quantity': 10,
+                'description': 'Keep me', 'stock_threshold': 12,
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['data']['low_stock'])
+        updates = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE "inventory_product"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"stock_threshold"', updates[0])
+        for column in ('"name"', '"price"', '"description"', '"quantity" ='):
+            self.assertNotIn(column, updates[0].split('WHERE')[0])
+
+    def test_stock_movements_bump_version(self):
+        url = reverse('product-detail', args=[self.product.pk])
+        services.record_sale(self.product, 2)
+        response = self.patch(url, {'quantity': 50}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 412)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 8)
+
+    def test_sale_update_conflict_leaves_stock(self):
+        sale = services.record_sale(self.product, 2)
+        url = reverse('sale-detail', args=[sale.pk])
+        self.assertEqual(self.patch(url, {'quantity_sold': 3}, HTTP_IF_MATCH='"1"').status_code, 200)
+        stale = self.patch(url, {'quantity_sold': 5}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(stale.status_code, 412)
+        self.assertEqual(stale.json()['message'], 'Failed to update sale')
+        self.product.refresh_from_db()
+        sale.refresh_from_db()
+        self.assertEqual((self.product.quantity, sale.quantity_sold, sale.version), (7, 3, 2))
+
+    def test_concurrent_edits_of_a_loaded_sale(self):
+        sale = services.record_sale(self.product, 2)
+        first, second = Sale.objects.get(pk=sale.pk), Sale.objects.get(pk=sale.pk)
+        services.update_sale(first, self.product, 4)
+        with self.assertRaises(services.VersionConflictError):
+            services.update_sale(second, self.product, 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 6)
+
+
+class StockLedgerTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.product = self.create_product(self.create_category(), quantity=10)
+
+    def movements(self, product=None):
+        product = product or self.product
+        return list(product.stock_movements.order_by('id').values_list('kind', 'delta'))
+
+    def assertLedgerMatches(self):
+        self.assertEqual(ledger.discrepancies(), [])
+
+    def test_writes_record_movements(self):
+        sale = services.record_sale(self.product, 4)
+        services.update_sale(sale, self.product, 6)
+        services.delete_sale(Sale.objects.get(pk=sale.pk))
+        self.assertEqual(self.movements(), [
+            (StockMovement.RECEIPT, 10),
+            (StockMovement.SALE, -4),
+            (StockMovement.REVERSAL, 4),
+            (StockMovement.SALE, -6),
+            (StockMovement.REVERSAL, 6),
+        ])
+        self.assertLedgerMatches()
+
+    def test_bulk_sales_and_product_edits(self):
+        response = self.client.post(reverse('sale-bulk-create'), {'sales': [
+            {'product': self.product.pk, 'quantity_sold': 1},
+            {'product': self.product.pk, 'quantity_sold': 2},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.patch(
+            reverse('product-detail', args=[self.product.pk]), {'quantity': 20}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.movements()[-1], (StockMovement.ADJUSTMENT, 13))
+        self.assertEqual(sum(delta for _, delta in self.movements()), 20)
+        self.assertLedgerMatches()
+
+    def test_stock_at_uses_snapshots(self):
+        services.record_sale(self.product, 3)
+        self.assertEqual(ledger.take_snapshots(), 1)
+        after_snapshot = timezone.now()
+        services.record_sale(self.product, 2)
+
+        quantity, snapshot, movements = ledger.stock_at(self.product, timezone.now())
+        self.assertEqual((quantity, snapshot.quantity, movements), (5, 7, 1))
+        quantity, snapshot, movements = ledger.stock_at(self.product, after_snapshot)
+        self.assertEqual((quantity, movements), (7, 0))
+
+        # Only products that moved since the last run get a new snapshot.
+        other = self.create_product(self.product.category, name='Other', quantity=1)
+        self.assertEqual(ledger.take_snapshots(), 2)
+        self.assertEqual(ledger.take_snapshots(), 0)
+        self.assertEqual(StockSnapshot.objects.filter(product=other).count(), 1)
+
+    def test_stock_endpoint(self):
+        url = reverse('product-stock', args=[self.product.pk])
+        services.record_sale(self.product, 3)
+        data = self.client.get(url).json()['data']
+        self.assertEqual((data['quantity'], data['snapshot'], data['movements_since_snapshot']), (7, None, 2))
+
+        past = self.client.get(url, {'at': '2000-01-01T00:00:00Z'}).json()['data']
+        self.assertEqual((past['quantity'], past['movements_since_snapshot']), (0, 0))
+
+        ledger.take_snapshots()
+        data = self.client.get(url).json()['data']
+        self.assertEqual((data['quantity'], data['snapshot']['quantity'], data['movements_since_snapshot']), (7, 7, 0))
+
+        self.assertEqual(self.client.get(url, {'at': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('product-stock', args=[0])).status_code, 404)
+
+    def test_reconcile_command(self):
+        call_command('reconcile_stock', stdout=io.StringIO())
+        Product.objects.filter(pk=self.product.pk).update(quantity=15)
+        self.assertEqual(ledger.discrepancies(), [(self.product.pk, 15, 10)])
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_stock', stdout=io.StringIO())
+        out = io.StringIO()
+        call_command('reconcile_stock', '--fix', stdout=out)
+        self.assertIn('Recorded 1 adjustment movements', out.getvalue())
+        self.assertEqual(self.movements()[-1], (StockMovement.ADJUSTMENT, 5))
+        self.assertLedgerMatches()
+
+
+class StockReservationTests(InventoryTestMixin, TestCase):
+
+    def setUp(self):
+        self.admin = self.create_user()
+        self.customer = self.create_user('customer@example.com', role='user')
+        self.authenticate(self.customer)
+        self.product = self.create_product(self.create_category(), quantity=10, stock_threshold=2)
+
+    def reserve(self, quantity, **extra):
+        return self.client.post(
+            reverse('reservation-list-create'), {'product': self.product.pk, 'quantity': quantity, **extra},
+            format='json'
+        )
+
+    def assertStock(self, quantity, reserved, version=None):
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.quantity, self.product.reserved), (quantity, reserved))
+        if version is not None:
+            self.assertEqual(self.product.version, version)
+
+    def test_holds_reduce_available_stock(self):
+        response = self.reserve(6)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['data']['status'], StockReservation.ACTIVE)
+        self.assertStock(10, 6, version=2)
+
+        response = self.reserve(5)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Only 4 available', response.json()['errors']['quantity'][0])
+        with self.assertRaises(services.InsufficientStockError):
+            services.record_sale(self.product, 5)
+        services.record_sale(self.product, 4)
+        self.assertStock(6, 6)
+
+        self.authenticate(self.admin)
+        product = self.client.get(reverse('product-detail', args=[self.product.pk])).json()['data']
+        self.assertEqual(product['reserved'], 6)
+        response = self.client.patch(
+            reverse('product-detail', args=[self.product.pk]), {'quantity': 5}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        # The hold moved the version, so an edit based on the row before it is stale.
+        response = self.client.patch(
+            reverse('product-detail', args=[self.product.pk]), {'quantity': 8}, format='json', HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_confirm_creates_sale(self):
+        reservation_id = self.reserve(3).json()['data']['id']
+        self.authenticate(self.admin)
+        response = self.client.post(reverse('reservation-confirm', args=[reservation_id]))
+        self.assertEqual(response.status_code, 201)
+        sale = Sale.objects.get(pk=response.json()['data']['id'])
+        self.assertEqual((sale.quantity_sold, sale.sold_by, sale.reservation.pk), (3, self.admin, reservation_id))
+        self.assertStock(7, 0)
+        self.assertEqual(ledger.discrepancies(), [])
+        self.assertEqual(SaleDailySummary.objects.get().units_sold, 3)
+
+        self.assertEqual(self.client.post(reverse('reservation-confirm', args=[reservation_id])).status_code, 409)
+        self.assertEqual(self.client.post(reverse('reservation-release', args=[reservation_id])).status_code, 409)
+
+    def test_release(self):
+        reservation_id = self.reserve(4).json()['data']['id']
+        response = self.client.post(reverse('reservation-release', args=[reservation_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['status'], StockReservation.RELEASED)
+        self.assertStock(10, 0, version=3)
+        self.authenticate(self.admin)
+        self.assertEqual(self.client.post(reverse('reservation-confirm', args=[reservation_id])).status_code, 409)
+
+    def test_confirm_is_admin_only(self):
+        reservation_id = self.reserve(3).json()['data']['id']
+        response = self.client.post(reverse('reservation-confirm', args=[reservation_id]))
+        self.assertEqual(response.status_code, 403)
+        self.assertStock(10, 3)
+        self.assertFalse(Sale.objects.exists())
+
+    def test_quantity_cannot_drop_below_reserved(self):
+        Product.objects.filter(pk=self.product.pk).update(sku='HOLD-1')
+        reservation = reservations.reserve(self.product, 6)
+        with self.assertRaises(services.ReservedStockError):
+            services.update_product(self.product, {'quantity': 5})
+        self.assertStock(10, 6)
+
+        result = import_products_csv(io.StringIO(
+            'sku,name,category,price,quantity\nHOLD-1,Renamed,Tools,1,4\n'
+        ))
+        self.assertEqual((result.imported, result.failed, result.errors[0]['line']), (0, 1, 2))
+        self.assertIn('held by active reservations', result.errors[0]['error'])
+        self.assertStock(10, 6)
+
+        # A write that skipped the check leaves the hold unfillable.
+        Product.objects.filter(pk=self.product.pk).update(quantity=4)
+        self.authenticate(self.admin)
+        response = self.client.post(reverse('reservation-confirm', args=[reservation.pk]))
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('Only', response.json()['errors']['quantity'][0])
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.status, StockReservation.ACTIVE)
+        self.assertStock(4, 6)
+        self.assertFalse(Sale.objects.exists())
+
+    def test_expired_holds_are_swept(self):
+        first = reservations.reserve(self.product, 2, ttl=60)
+        second = reservations.reserve(self.product, 3, ttl=60)
+        kept = reservations.reserve(self.product, 1, ttl=3600)
+        later = timezone.now() + timedelta(seconds=120)
+
+        # Past its TTL a hold cannot be confirmed, even before the sweep.
+        StockReservation.objects.filter(pk=first.pk).update(expires_at=timezone.now())
+        with self.assertRaisesMessage(reservations.ReservationStateError, 'it is expired'):
+            reservations.confirm(first)
+
+        # Per batch a savepoint pair around select, mark and release; the
+        # third batch finds nothing and ends the sweep.
+        with self.assertNumQueries(13):
+            self.assertEqual(reservations.expire_reservations(now=later, batch_size=1), 2)
+        self.assertStock(10, 1, version=6)
+        self.assertEqual(
+            dict(StockReservation.objects.values_list('pk', 'status')),
+            {first.pk: 'expired', second.pk: 'expired', kept.pk: 'active'},
+        )
+        out = io.StringIO()
+        call_command('expire_reservations', stdout=out)
+        self.assertIn('Expired 0 reservations', out.getvalue())
+
+    def test_reservations_are_private(self):
+        reservation_id = self.reserve(1).json()['data']['id']
+        other = self.create_user('other@example.com', role='user')
+        self.authenticate(other)
+        self.assertEqual(self.client.get(reverse('reservation-detail', args=[reservation_id])).status_code, 404)
+        self.assertEqual(self.client.post(reverse('reservation-release', args=[reservation_id])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('reservation-list-create')).json()['data']['results'], [])
+
+        self.authenticate(self.admin)
+        results = self.client.get(reverse('reservation-list-create'), {'status': 'active'}).json()['data']['results']
+        self.assertEqual([row['id'] for row in results], [reservation_id])
+
+
+@override_settings(INVENTORY_SALE_QUEUE_ENABLED=True)
+class SaleQueueTests(InventoryTestMixin, TestCase):
+    databases = {'default', 'sale_queue'}
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.product = self.create_product(self.create_category(), quantity=5)
+
+    def post_sale(self, quantity_sold, product=None):
+        return self.client.post(reverse('sale-list-create'), {
+            'product': (product or self.product).pk, 'quantity_sold': quantity_sold
+        }, format='json')
+
+    def receipt(self, response):
+        return self.client.get(response['Location']).json()['data']
+
+    def test_accept_then_record(self):
+        response = self.post_sale(3)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['data']['status'], QueuedSale.PENDING)
+        self.assertFalse(Sale.objects.exists())
+
+        # Queued units count against the stock view.
+        rejected = self.post_sale(3)
+        self.assertEqual(rejected.status_code, 400)
+        self.assertIn('Only 2 available', rejected.json()['errors']['quantity_sold'][0])
+        self.assertEqual(self.post_sale(1, product=Product(pk=0)).status_code, 400)
+
+        out = io.StringIO()
+        call_command('process_sale_queue', '--once', stdout=out)
+        self.assertIn('Recorded 1 and rejected 0', out.getvalue())
+        receipt = self.receipt(response)
+        sale = Sale.objects.get()
+        self.assertEqual((receipt['status'], receipt['sale']), (QueuedSale.RECORDED, sale.pk))
+        self.assertEqual((sale.quantity_sold, sale.sold_by, str(sale.receipt)), (3, self.user, receipt['receipt']))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 2)
+        self.assertEqual(ledger.discrepancies(), [])
+
+    def test_worker_rejects_oversold_sales(self):
+        first, second = self.post_sale(2), self.post_sale(2)
+        # Stock sold elsewhere after the sales were accepted.
+        services.record_sale(self.product, 2)
+        self.assertEqual(sale_queue.drain(batch_size=1), (1, 1))
+        self.assertEqual(self.receipt(first)['status'], QueuedSale.RECORDED)
+        rejected = self.receipt(second)
+        self.assertEqual(rejected['status'], QueuedSale.REJECTED)
+        self.assertIn('Only 1 available', rejected['errors']['quantity_sold'][0])
+
+    def test_stale_claims_are_recovered(self):
+        recorded, retried = self.post_sale(1), self.post_sale(1)
+        stale = timezone.now() - timedelta(hours=1)
+        token, entries = sale_queue._claim_batch(10, stale)
+        # The worker recorded the first sale, then died before settling the batch.
+        services.record_sales_bulk([{'product': self.product.pk, 'quantity_sold': 1, 'receipt': entries[0].receipt}])
+
+        self.assertEqual(sale_queue.drain(), (1, 0))
+        self.assertEqual(Sale.objects.count(), 2)
+        self.assertEqual(
+            [self.receipt(response)['status'] for response in (recorded, retried)],
+            [QueuedSale.RECORDED, QueuedSale.RECORDED],
+        )
+
+    def test_slow_worker_overtaken_by_recovery(self):
+        response = self.post_sale(2)
+        stale = timezone.now() - timedelta(hours=1)
+        token, entries = sale_queue._claim_batch(10, stale)
+        # Worker A is still recording when its claim is taken for dead.
+        self.assertEqual(sale_queue.recover_stale_claims(), 1)
+        items = [{'product': self.product.pk, 'quantity_sold': 2, 'receipt': entries[0].receipt}]
+        sale = services.record_sales_bulk(items)[0][0]
+
+        # Worker B gets the same receipt: it is settled, not recorded twice.
+        self.assertEqual(sale_queue.process_batch(), (1, 0))
+        self.assertEqual(Sale.objects.count(), 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 3)
+        # A's late outcome no longer applies to the row.
+        sale_queue._finish(QueuedSale.objects.filter(claim=token), entries, {}, {entries[0].receipt: {'x': ['late']}})
+        receipt = self.receipt(response)
+        self.assertEqual((receipt['status'], receipt['sale']), (QueuedSale.RECORDED, sale.pk))
+
+    def test_worker_survives_failed_batch(self):
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch(
+            'inventory.management.commands.process_sale_queue.drain',
+            side_effect=[RuntimeError('database is locked'), (1, 0), KeyboardInterrupt],
+        ) as drain:
+            call_command('process_sale_queue', '--interval', '0', stdout=out, stderr=err)
+        self.assertEqual(drain.call_count, 3)
+        self.assertIn('database is locked', err.getvalue())
+        self.assertIn('Recorded 1 and rejected 0', out.getvalue())
+        self.assertIn('Stopped', out.getvalue())
+
+    @override_settings(INVENTORY_SALE_QUEUE_ENABLED=False)
+    def test_disabled_by_default(self):
+        self.assertEqual(self.post_sale(1).status_code, 201)
+        self.assertFalse(QueuedSale.objects.exists())
+
+
+class SQLiteProfileTests(TestCase):
+
+    def test_production_profile_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = production_profile({**connection.settings_dict, 'NAME': os.path.join(directory, 'tuned.sqlite3')})
+            self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (600, True))
+            connections.settings['tuned'] = database
+            try:
+                with connections['tuned'].cursor() as cursor:
+                    values = {}
+                    for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'temp_store'):
+                        cursor.execute(f'PRAGMA {name}')
+                        values[name] = cursor.fetchone()[0]
+            finally:
+                connections['tuned'].close()
+                del connections.settings['tuned']
+        # synchronous NORMAL is 1, temp_store MEMORY is 2.
+        self.assertEqual(values, {
+            'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000, 'cache_size': -65536, 'temp_store': 2,
+        })
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(InventoryTestMixin, TestCase):
+    # The primary is the test database; the replica is a second SQLite file
+    # that deliberately lags behind it. It is added after the test case's
+    # database setup, so it sits outside the per-test transaction.
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.replica_directory = tempfile.TemporaryDirectory()
+        connections.settings['replica'] = {
+            **connections['default'].settings_dict,
+            'NAME': os.path.join(cls.replica_directory.name, 'replica.sqlite3'),
+        }
+        with connections['replica'].schema_editor() as editor:
+            editor.create_model(Category)
+            editor.create_model(Product)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.replica_directory.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.authenticate(self.create_user())
+        self.product = self.create_product(self.create_category(), name='Widget')
+        self.url = reverse('product-detail', args=[self.product.pk])
+        Category.objects.using('replica').bulk_create([Category(pk=self.product.category_id, name='General')])
+        Product.objects.using('replica').bulk_create([
+            Product(pk=self.product.pk, category_id=self.product.category_id, name='Stale widget', price=Decimal('9.99'))
+        ])
+        self.addCleanup(self.clear_replica)
+
+    def clear_replica(self):
+        with connections['replica'].cursor() as cursor:
+            for model in (Product, Category):
+                cursor.execute(f'DELETE FROM {model._meta.db_table}')
+
+    def product_name(self):
+        return self.client.get(self.url).json()['data']['name']
+
+    def test_reads_use_replica_until_the_client_writes(self):
+        self.assertEqual(self.product_name(), 'Stale widget')
+
+        response = self.client.patch(self.url, {'price': '12.00'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Product.objects.using('replica').get().price, Decimal('9.99'))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.price, Decimal('12.00'))
+
+        # Pinned to the primary for the sticky window, by cookie or cache.
+        self.assertEqual(self.product_name(), 'Widget')
+        self.client.cookies.clear()
+        self.assertEqual(self.product_name(), 'Widget')
+        # Once the window has passed (and the primary's rows cached meanwhile
+        # are gone), reads go back to the replica.
+        caches['default'].clear()
+        get_cache().clear()
+        self.assertEqual(self.product_name(), 'Stale widget')
+
+    def test_only_configured_prefixes(self):
+        with override_settings(DATABASE_REPLICA_URL_PREFIXES=('/api/user/',)):
+            self.assertEqual(self.product_name(), 'Widget')
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.product_name(), 'Widget')
+
+    def test_one_replica_per_request(self):
+        # The validators and the body must come from the same replica, or
+        # the ETag could describe newer rows than the body holds.
+        with mock.patch('backend.replicas.random.choice', wraps=random.choice) as choice, \
+                CaptureQueriesContext(connections['replica']) as replica, \
+                CaptureQueriesContext(connection) as primary:
+            self.assertEqual(self.product_name(), 'Stale widget')
+        self.assertEqual(choice.call_count, 1)
+        self.assertGreaterEqual(len(replica), 2)
+        self.assertEqual(len(primary), 0)
+
+    @override_settings(ALLOW_PROCESS_LOCAL_CACHES=False)
+    def test_primary_only_without_shared_sticky_cache(self):
+        # Other workers could not see a pin kept in the local-memory cache.
+        self.assertEqual(self.product_name(), 'Widget')
+
+
+class BenchmarkSuiteTests(TestCase):
+
+    def test_generate_and_run(self):
+        call_command(
+            'generate_benchmark_data', categories=3, products=40, sales=60, users=2, seed=5, stdout=io.StringIO(),
+        )
+        self.assertEqual(Product.objects.count(), 40)
+        self.assertEqual(ledger.discrepancies(), [])
+        with self.assertRaises(CommandError):
+            call_command('generate_benchmark_data', products=1, seed=5, stdout=io.StringIO())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.json')
+            call_command('benchmark_api', requests=3, warmup=1, sale_concurrency=1, output=path, stdout=io.StringIO())
+            out = io.StringIO()
+            call_command(
+                'benchmark_api', scenario=['product_list'], requests=3, warmup=1, compare=path, json=True, stdout=out,
+            )
+            with open(path) as handle:
+                baseline = json.load(handle)
+        results = json.loads(out.getvalue())
+
+        self.assertEqual(baseline['meta']['dataset']['products'], 40)
+        self.assertEqual(
+            [row['scenario'] for row in baseline['scenarios']],
+            ['login', 'product_list', 'product_search', 'product_filter', 'low_stock', 'sale_create', 'user_list'],
+        )
+        for row in baseline['scenarios']:
+            self.assertEqual((row['requests'], row['errors']), (3, 0), row['scenario'])
+            self.assertGreater(row['queries_per_request'], 0)
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+        self.assertIn('throughput', results['comparison']['product_list'])
@@ -2,8 +2,11 @@
 from django.urls import path
 from .views import (
     CategoryListCreateAPIView, CategoryDetailAPIView,
-    ProductListCreateAPIView, ProductDetailAPIView, LowStockProductsAPIView,
-    SaleListCreateAPIView, SaleDetailAPIView
+    ProductListCreateAPIView, ProductDetailAPIView, ProductImportAPIView, ProductExportAPIView, LowStockProductsAPIView,
+    ProductStockAPIView,
+    SaleListCreateAPIView, SaleReceiptAPIView, SaleBulkCreateAPIView, SaleExportAPIView, SaleDetailAPIView,
+    ReservationListCreateAPIView, ReservationDetailAPIView, ReservationConfirmAPIView, ReservationReleaseAPIView,
+    SalesAnalyticsAPIView, CacheStatsAPIView
 )
 
 urlpatterns = [
@@ -13,8 +16,23 @@ urlpatterns = [
 
     path('products/', ProductListCreateAPIView.as_view(), name='product-list-create'),
     path('products/<int:pk>/', ProductDetailAPIView.as_view(), name='product-detail'),
+    path('products/<int:pk>/stock/', ProductStockAPIView.as_view(), name='product-stock'),
+    path('products/import/', ProductImportAPIView.as_view(), name='product-import'),
+    path('products/export/', ProductExportAPIView.as_view(), name='product-export'),
     path('products/low-stock/', LowStockProductsAPIView.as_view(), name='product-low-stock'),
 
     path('sales/', SaleListCreateAPIView.as_view(), name='sale-list-create'),
+    path('sales/bulk/', SaleBulkCreateAPIView.as_view(), name='sale-bulk-create'),
+    path('sales/export/', SaleExportAPIView.as_view(), name='sale-export'),
     path('sales/<int:pk>/', SaleDetailAPIView.as_view(), name='sale-detail'),
+    path('sales/receipts/<uuid:receipt>/', SaleReceiptAPIView.as_view(), name='sale-receipt'),
+
+    path('reservations/', ReservationListCreateAPIView.as_view(), name='reservation-list-create'),
+    path('reservations/<int:pk>/', ReservationDetailAPIView.as_view(), name='reservation-detail'),
+    path('reservations/<int:pk>/confirm/', ReservationConfirmAPIView.as_view(), name='reservation-confirm'),
+    path('reservations/<int:pk>/release/', ReservationReleaseAPIView.as_view(), name='reservation-release'),
+
+    path('analytics/sales/', SalesAnalyticsAPIView.as_view(), name='sales-analytics'),
+
+    path('cache/stats/', CacheStatsAPIView.as_view(), name='inventory-cache-stats'),
 ]
\ No newline at end of file
@@ -1,19 +1,44 @@
 # backend/inventory/views.py
+import io
 from rest_framework import status, permissions, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.db.models import Count
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from .models import Category, Product, Sale
-from .serializers import CategorySerializer, ProductSerializer, SaleSerializer
-from .filters import ProductFilter
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.settings import api_settings
+from django.conf import settings
+from .models import Category, Product, QueuedSale, Sale, StockReservation
+from .serializers import (
+    CategorySerializer, ProductSerializer, SaleSerializer, SaleBulkItemSerializer,
+    SalesAnalyticsQuerySerializer, StockAtQuerySerializer, StockSnapshotSerializer,
+    StockReservationSerializer, QueuedSaleCreateSerializer, QueuedSaleSerializer
+)
+from .parsers import NDJSONParser
+from .renderers import CSVRenderer, ExportRenderer, NDJSONRenderer, ORJSONRenderer
+from .importers import import_products_csv
+from .filters import ProductFilter, SaleFilter
+from .exports import EXPORT_FORMATS, PRODUCT_EXPORT_COLUMNS, SALE_EXPORT_COLUMNS
+from .pagination import KeysetPagination
+from . import ledger, reservations, services
+from .analytics import sales_summary
+from .cache import CachedReadMixin, cache_enabled, stats as cache_stats
+from .conditional import ConditionalGetMixin, InvalidIfMatch, VersionedUpdateMixin
+from .fast_serializers import FastListSerializationMixin
+from backend.fieldsets import SparseFieldsetMixin
 from user_module.permissions import IsAdminUser
 
-class CategoryListCreateAPIView(generics.ListCreateAPIView):
+class CategoryListCreateAPIView(ConditionalGetMixin, CachedReadMixin, FastListSerializationMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Category,)
     
     def get_permissions(self):
         if self.request.method != 'GET':
@@ -21,13 +46,15 @@ class CategoryListCreateAPIView(generics.ListCreateAPIView):
         return [permissions.IsAuthenticated()]
     
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        return Response({
-            'success': True,
-            'message': 'Categories retrieved successfully',
-            'data': response.data,
-            'count': len(response.data)
-        })
+        def build():
+            data = self.serialize_many(self.fast_queryset(self.filter_queryset(self.get_queryset())))
+            return {
+                'success': True,
+                'message': 'Categories retrieved successfully',
+                'data': data,
+                'count': len(data)
+            }
+        return self.cached_response(request, build)
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -44,10 +71,11 @@ class CategoryListCreateAPIView(generics.ListCreateAPIView):
             'errors': serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
 
-class CategoryDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailAPIView(ConditionalGetMixin, CachedReadMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Category,)
     
     def get_permissions(self):
         if self.request.method != 'GET':
@@ -55,12 +83,10 @@ class CategoryDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         return [permissions.IsAuthenticated()]
     
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response({
+        return self.cached_response(request, lambda: {
             'success': True,
             'message': 'Category retrieved successfully',
-            'data': serializer.data
+            'data': self.get_serializer(self.get_object()).data
         })
     
     def update(self, request, *args, **kwargs):
@@ -88,38 +114,47 @@ class CategoryDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             'message': 'Category deleted successfully'
         }, status=status.HTTP_200_OK)
 
-class ProductListCreateAPIView(generics.ListCreateAPIView):
-    queryset = Product.objects.all()
+class ProductListCreateAPIView(ConditionalGetMixin, FastListSerializationMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = Product.objects.with_related()
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend]
     filterset_class = ProductFilter
-    search_fields = ['name', 'description', 'sku', 'category__name']
+    pagination_class = KeysetPagination
+    conditional_related = ('category',)
+    # The materialised flag carries the same value as is_low_stock().
+    fast_value_sources = {'is_low_stock': 'low_stock'}
+    field_dependencies = {'low_stock': ('quantity', 'stock_threshold')}
     
     def get_permissions(self):
         if self.request.method != 'GET':
             return [IsAdminUser()]
         return [permissions.IsAuthenticated()]
     
+    def get_pagination_ordering(self):
+        # ProductFilter.filter_search annotates relevance; rank ties fall back to id.
+        if self.request.query_params.get('search', '').strip():
+            return ('-search_rank', '-id')
+        return KeysetPagination.ordering
+    
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.fast_queryset(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(self.serialize_many(page))
             return Response({
                 'success': True,
                 'message': 'Products retrieved successfully',
                 'data': response.data
             })
         
-        serializer = self.get_serializer(queryset, many=True)
+        data = self.serialize_many(queryset)
         return Response({
             'success': True,
             'message': 'Products retrieved successfully',
-            'data': serializer.data,
-            'count': len(serializer.data)
+            'data': data,
+            'count': len(data)
         })
     
     def create(self, request, *args, **kwargs):
@@ -137,10 +172,15 @@ class ProductListCreateAPIView(generics.ListCreateAPIView):
             'errors': serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
 
-class ProductDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Product.objects.all()
+class ProductDetailAPIView(ConditionalGetMixin, CachedReadMixin, SparseFieldsetMixin, VersionedUpdateMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Product.objects.with_related()
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Sales move stock with queryset updates, which send no Product signals.
+    cache_models = (Category, Product, Sale)
+    conditional_related = ('category',)
+    conditional_version = True
+    field_dependencies = {'low_stock': ('quantity', 'stock_threshold')}
     
     def get_permissions(self):
         if self.request.method != 'GET':
@@ -148,12 +188,10 @@ class ProductDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         return [permissions.IsAuthenticated()]
     
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response({
+        return self.cached_response(request, lambda: {
             'success': True,
             'message': 'Product retrieved successfully',
-            'data': serializer.data
+            'data': self.get_serializer(self.get_object()).data
         })
     
     def update(self, request, *args, **kwargs):
@@ -161,7 +199,18 @@ class ProductDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         if serializer.is_valid():
-            self.perform_update(serializer)
+            try:
+                self.perform_update(serializer)
+            except InvalidIfMatch as exc:
+                return self.invalid_if_match_response(exc, 'Failed to update product')
+            except services.VersionConflictError as exc:
+                return self.version_conflict_response(exc, 'Failed to update product')
+            except services.ReservedStockError as exc:
+                return Response({
+                    'success': False,
+                    'message': 'Failed to update product',
+                    'errors': {'quantity': [str(exc)]}
+                }, status=status.HTTP_400_BAD_REQUEST)
             return Response({
                 'success': True,
                 'message': 'Product updated successfully',
@@ -181,64 +230,196 @@ class ProductDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             'message': 'Product deleted successfully'
         }, status=status.HTTP_200_OK)
 
-class LowStockProductsAPIView(generics.ListAPIView):
+class ProductStockAPIView(APIView):
+    # Stock of one product at any point in time, from the movement ledger.
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        serializer = StockAtQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'message': 'Invalid stock query',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        product = get_object_or_404(Product, pk=pk)
+        at = serializer.validated_data.get('at') or timezone.now()
+        quantity, snapshot, movements = ledger.stock_at(product, at)
+        return Response({
+            'success': True,
+            'message': 'Stock retrieved successfully',
+            'data': {
+                'product': product.pk,
+                'at': serializer.fields['at'].to_representation(at),
+                'quantity': quantity,
+                'snapshot': StockSnapshotSerializer(snapshot).data if snapshot else None,
+                'movements_since_snapshot': movements,
+            }
+        })
+
+class ProductImportAPIView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({
+                'success': False,
+                'message': 'Failed to import products',
+                'errors': {'file': ['A CSV file is required.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        text_stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            result = import_products_csv(text_stream)
+        except UnicodeDecodeError:
+            return Response({
+                'success': False,
+                'message': 'Failed to import products',
+                'errors': {'file': ['The file must be UTF-8 encoded CSV.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            text_stream.detach()
+
+        return Response({
+            'success': result.failed == 0,
+            'message': f'{result.imported} products imported',
+            'data': result.as_dict()
+        }, status=status.HTTP_200_OK)
+
+class LowStockProductsAPIView(ConditionalGetMixin, CachedReadMixin, FastListSerializationMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Unpaginated, so the response is large; sales change stock without
+    # Product signals.
+    cache_models = (Category, Product, Sale)
+    conditional_related = ('category',)
+    fast_value_sources = {'is_low_stock': 'low_stock'}
+    field_dependencies = {'low_stock': ('quantity', 'stock_threshold')}
     
     def get_queryset(self):
-        from django.db.models import F
-        return Product.objects.filter(quantity__lte=F('stock_threshold'))
+        return Product.objects.with_related().low_stock()
     
     def list(self, request, *args, **kwargs):
+        return self.cached_response(request, self.build_body)
+
+    def build_body(self):
+        # Both queries read only the partial low-stock index, so their cost
+        # follows the number of low-stock products, not the catalog size.
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({
+        data = self.serialize_many(self.fast_queryset(queryset))
+        category_counts = (
+            Product.objects.low_stock()
+            .values('category', 'category__name')
+            .annotate(count=Count('id'))
+            .order_by('category__name')
+        )
+        return {
             'success': True,
             'message': 'Low stock products retrieved successfully',
-            'data': serializer.data,
-            'count': len(serializer.data)
-        })
+            'data': data,
+            'count': len(data),
+            'category_counts': [
+                {'category': row['category'], 'category_name': row['category__name'], 'count': row['count']}
+                for row in category_counts
+            ]
+        }
+
+class ExportAPIView(generics.GenericAPIView):
+    # Streams rows straight from values_list() so the response never holds the
+    # full result set or runs a ModelSerializer.
+    # The format is `export_format`, else the one the Accept header asks for.
+    filter_backends = [DjangoFilterBackend]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVRenderer, NDJSONRenderer]
+    export_columns = ()
+    export_name = 'export'
+
+    def get(self, request, *args, **kwargs):
+        accepted = request.accepted_renderer.format
+        export_format = request.query_params.get('export_format', accepted if accepted in EXPORT_FORMATS else 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({
+                'success': False,
+                'message': 'Unsupported export format',
+                'errors': {'export_format': [f'Choose one of: {", ".join(EXPORT_FORMATS)}.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(queryset, self.export_columns), content_type=content_type)
+        filename = f'{self.export_name}-{timezone.now():%Y%m%d%H%M%S}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response) and isinstance(response.accepted_renderer, ExportRenderer):
+            response.accepted_renderer = ORJSONRenderer()
+            response.accepted_media_type = ORJSONRenderer.media_type
+        return response
 
-class SaleListCreateAPIView(generics.ListCreateAPIView):
+class ProductExportAPIView(ExportAPIView):
+    queryset = Product.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+    filterset_class = ProductFilter
+    export_columns = PRODUCT_EXPORT_COLUMNS
+    export_name = 'products'
+
+class SaleExportAPIView(ExportAPIView):
     queryset = Sale.objects.all()
+    permission_classes = [IsAdminUser]
+    filterset_class = SaleFilter
+    export_columns = SALE_EXPORT_COLUMNS
+    export_name = 'sales'
+
+class SaleListCreateAPIView(ConditionalGetMixin, FastListSerializationMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = Sale.objects.with_related()
     serializer_class = SaleSerializer
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['product', 'sold_by']
+    filterset_class = SaleFilter
     search_fields = ['product__name']
+    pagination_class = KeysetPagination
+    conditional_related = ('product', 'sold_by')
     
     def perform_create(self, serializer):
-        sale = serializer.save(sold_by=self.request.user)
-        
-        product = sale.product
-        product.quantity -= sale.quantity_sold
-        product.save()
+        serializer.save(sold_by=self.request.user)
     
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.fast_queryset(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(self.serialize_many(page))
             return Response({
                 'success': True,
                 'message': 'Sales retrieved successfully',
                 'data': response.data
             })
         
-        serializer = self.get_serializer(queryset, many=True)
+        data = self.serialize_many(queryset)
         return Response({
             'success': True,
             'message': 'Sales retrieved successfully',
-            'data': serializer.data,
-            'count': len(serializer.data)
+            'data': data,
+            'count': len(data)
         })
     
     def create(self, request, *args, **kwargs):
+        if settings.INVENTORY_SALE_QUEUE_ENABLED:
+            return self.enqueue(request)
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            self.perform_create(serializer)
+            try:
+                self.perform_create(serializer)
+            except services.InsufficientStockError as exc:
+                return Response({
+                    'success': False,
+                    'message': 'Failed to record sale',
+                    'errors': {'quantity_sold': [str(exc)]}
+                }, status=status.HTTP_400_BAD_REQUEST)
             return Response({
                 'success': True,
                 'message': 'Sale recorded successfully',
@@ -250,28 +431,95 @@ class SaleListCreateAPIView(generics.ListCreateAPIView):
             'errors': serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
 
-class SaleDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Sale.objects.all()
+    def enqueue(self, request):
+        # Write-behind: the sale is recorded later by `manage.py
+        # process_sale_queue`; the receipt tells the client where to look.
+        serializer = QueuedSaleCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'message': 'Failed to record sale',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        entry = serializer.save(sold_by=request.user)
+        location = request.build_absolute_uri(reverse('sale-receipt', args=[entry.receipt]))
+        return Response({
+            'success': True,
+            'message': 'Sale accepted for processing',
+            'data': {**QueuedSaleSerializer(entry).data, 'status_url': location}
+        }, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+class SaleReceiptAPIView(APIView):
+    # Outcome of a sale accepted by the write-behind queue.
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, receipt):
+        entry = get_object_or_404(QueuedSale, receipt=receipt)
+        return Response({
+            'success': True,
+            'message': 'Sale receipt retrieved successfully',
+            'data': QueuedSaleSerializer(entry).data
+        })
+
+class SaleBulkCreateAPIView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request):
+        items = request.data.get('sales') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({
+                'success': False,
+                'message': 'Failed to record sales',
+                'errors': {'sales': ['Expected a non-empty list of sales.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        max_items = getattr(settings, 'INVENTORY_BULK_SALE_MAX_ITEMS', 10000)
+        if len(items) > max_items:
+            return Response({
+                'success': False,
+                'message': 'Failed to record sales',
+                'errors': {'sales': [f'Ensure this list has no more than {max_items} sales.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # One serializer instance validates every item, so field setup is
+        # paid once per batch instead of once per sale.
+        item_serializer = SaleBulkItemSerializer()
+        errors = {}
+        valid_items = []
+        valid_indexes = []
+        for index, item in enumerate(items):
+            try:
+                valid_items.append(item_serializer.run_validation(item))
+            except ValidationError as exc:
+                errors[index] = exc.detail
+                continue
+            valid_indexes.append(index)
+
+        sales, stock_errors = services.record_sales_bulk(valid_items, sold_by=request.user)
+        for position, item_errors in stock_errors.items():
+            errors[valid_indexes[position]] = item_errors
+
+        return Response({
+            'success': not errors,
+            'message': f'{len(sales)} of {len(items)} sales recorded',
+            'data': {
+                'created': len(sales),
+                'ids': [sale.pk for sale in sales],
+            },
+            'errors': [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
+        }, status=status.HTTP_201_CREATED if sales else status.HTTP_400_BAD_REQUEST)
+
+class SaleDetailAPIView(ConditionalGetMixin, SparseFieldsetMixin, VersionedUpdateMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Sale.objects.with_related()
     serializer_class = SaleSerializer
     permission_classes = [IsAdminUser]
-    
-    def perform_update(self, serializer):
-        sale = self.get_object()
-        old_quantity = sale.quantity_sold
-        
-        updated_sale = serializer.save()
-        
-        product = updated_sale.product
-        quantity_difference = updated_sale.quantity_sold - old_quantity
-        product.quantity -= quantity_difference
-        product.save()
+    conditional_related = ('product', 'sold_by')
+    conditional_version = True
     
     def perform_destroy(self, instance):
-        product = instance.product
-        product.quantity += instance.quantity_sold
-        product.save()
-        
-        instance.delete()
+        if not services.delete_sale(instance):
+            raise NotFound()
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -287,7 +535,18 @@ class SaleDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         if serializer.is_valid():
-            self.perform_update(serializer)
+            try:
+                self.perform_update(serializer)
+            except services.InsufficientStockError as exc:
+                return Response({
+                    'success': False,
+                    'message': 'Failed to update sale',
+                    'errors': {'quantity_sold': [str(exc)]}
+                }, status=status.HTTP_400_BAD_REQUEST)
+            except InvalidIfMatch as exc:
+                return self.invalid_if_match_response(exc, 'Failed to update sale')
+            except services.VersionConflictError as exc:
+                return self.version_conflict_response(exc, 'Failed to update sale')
             return Response({
                 'success': True,
                 'message': 'Sale updated successfully',
@@ -305,4 +564,146 @@ class SaleDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         return Response({
             'success': True,
             'message': 'Sale deleted successfully'
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+class ReservationQuerysetMixin:
+    # Admins see every hold; anyone else only their own.
+    queryset = StockReservation.objects.select_related('product')
+    serializer_class = StockReservationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.request.user.is_admin():
+            queryset = queryset.filter(reserved_by=self.request.user)
+        return queryset
+
+class ReservationListCreateAPIView(ReservationQuerysetMixin, generics.ListCreateAPIView):
+    pagination_class = KeysetPagination
+
+    def filter_queryset(self, queryset):
+        reservation_status = self.request.query_params.get('status')
+        if reservation_status:
+            queryset = queryset.filter(status=reservation_status)
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(reserved_by=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response({
+            'success': True,
+            'message': 'Reservations retrieved successfully',
+            'data': response.data
+        })
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                self.perform_create(serializer)
+            except services.InsufficientStockError as exc:
+                return Response({
+                    'success': False,
+                    'message': 'Failed to reserve stock',
+                    'errors': {'quantity': [str(exc)]}
+                }, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'success': True,
+                'message': 'Stock reserved successfully',
+                'data': serializer.data
+            }, status=status.HTTP_201_CREATED)
+        return Response({
+            'success': False,
+            'message': 'Failed to reserve stock',
+            'errors': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+class ReservationDetailAPIView(ReservationQuerysetMixin, generics.RetrieveAPIView):
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response({
+            'success': True,
+            'message': 'Reservation retrieved successfully',
+            'data': self.get_serializer(self.get_object()).data
+        })
+
+class ReservationConfirmAPIView(ReservationQuerysetMixin, generics.GenericAPIView):
+    # Confirming records a Sale, which only admins may do.
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        reservation = self.get_object()
+        try:
+            sale = reservations.confirm(reservation, sold_by=request.user)
+        except reservations.ReservationStateError as exc:
+            return Response({
+                'success': False,
+                'message': 'Failed to confirm reservation',
+                'errors': {'status': [str(exc)]}
+            }, status=status.HTTP_409_CONFLICT)
+        except services.InsufficientStockError as exc:
+            return Response({
+                'success': False,
+                'message': 'Failed to confirm reservation',
+                'errors': {'quantity': [str(exc)]}
+            }, status=status.HTTP_409_CONFLICT)
+        return Response({
+            'success': True,
+            'message': 'Reservation confirmed successfully',
+            'data': SaleSerializer(sale).data
+        }, status=status.HTTP_201_CREATED)
+
+class ReservationReleaseAPIView(ReservationQuerysetMixin, generics.GenericAPIView):
+
+    def post(self, request, *args, **kwargs):
+        reservation = self.get_object()
+        try:
+            reservations.release(reservation)
+        except reservations.ReservationStateError as exc:
+            return Response({
+                'success': False,
+                'message': 'Failed to release reservation',
+                'errors': {'status': [str(exc)]}
+            }, status=status.HTTP_409_CONFLICT)
+        return Response({
+            'success': True,
+            'message': 'Reservation released successfully',
+            'data': self.get_serializer(reservation).data
+        })
+
+class SalesAnalyticsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        serializer = SalesAnalyticsQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'message': 'Invalid analytics query',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        results = sales_summary(**serializer.validated_data)
+        return Response({
+            'success': True,
+            'message': 'Sales analytics retrieved successfully',
+            'data': results,
+            'count': len(results)
+        })
+
+class CacheStatsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'success': True,
+            'message': 'Cache statistics retrieved successfully',
+            'data': {
+                'backend': settings.CACHES[settings.INVENTORY_CACHE_ALIAS]['BACKEND'],
+                'enabled': cache_enabled(),
+                **cache_stats.as_dict(),
+            }
+        })
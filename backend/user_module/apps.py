@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UserModuleConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user_module'
+
+    def ready(self):
+        from . import signals  # noqa: F401
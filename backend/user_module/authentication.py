@@ -0,0 +1,129 @@
+# backend/user_module/authentication.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+from rest_framework.authentication import (
+    BaseAuthentication, SessionAuthentication, TokenAuthentication, get_authorization_header
+)
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    # Small in-process LRU of user rows keyed by id, each entry valid for
+    # `ttl` seconds. Writes in this process invalidate through signals;
+    # other processes converge within the TTL. Keys are str(id): token
+    # claims carry the id as a string, model signals pass an int.
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Each request gets its own instance, so a view mutating request.user
+        # cannot leak into other requests.
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        user_id = str(user_id)
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, copy.copy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_TTL, settings.AUTH_USER_CACHE_MAX_ENTRIES)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    # JWTAuthentication loads the user row on every request. The token's
+    # role/email claims are not enough on their own: views need a real
+    # CustomUser (is_admin(), sold_by foreign keys), so the row is cached
+    # for a short TTL instead.
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or not settings.AUTH_USER_CACHE_TTL:
+            return super().get_user(validated_token)
+
+        user = user_cache.get(user_id)
+        if user is None:
+            # The parent rejects missing and inactive users; only active
+            # users are cached.
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        return user
+
+
+class SchemeDispatchAuthentication(BaseAuthentication):
+    # Picks the one backend the Authorization header can belong to instead
+    # of walking Token -> JWT -> OAuth2 -> Session:
+    #   Token <key>       -> TokenAuthentication
+    #   Bearer <a.b.c>    -> CachedJWTAuthentication (JWTs have three segments)
+    #   Bearer <opaque>   -> OAuth2Authentication
+    #   no header         -> SessionAuthentication (with its CSRF check),
+    #                        after OAuth2Authentication when the query or
+    #                        form body carries an `access_token` (RFC 6750)
+    # Any other scheme is left unauthenticated, as the chain would.
+
+    def __init__(self):
+        self.token = TokenAuthentication()
+        self.jwt = CachedJWTAuthentication()
+        self.oauth2 = OAuth2Authentication()
+        self.session = SessionAuthentication()
+
+    def select_backend(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth:
+            if 'access_token' in request.GET or 'access_token' in request.POST:
+                return self.oauth2
+            return self.session
+        scheme = auth[0].lower()
+        if scheme == b'token':
+            return self.token
+        if scheme == b'bearer':
+            if len(auth) == 2 and auth[1].count(b'.') == 2:
+                return self.jwt
+            return self.oauth2
+        return None
+
+    def authenticate(self, request):
+        backend = self.select_backend(request)
+        if backend is None:
+            return None
+        result = backend.authenticate(request)
+        if result is None and backend is self.oauth2 and not get_authorization_header(request):
+            # The chain went on to the session when the parameter's token
+            # was rejected.
+            return self.session.authenticate(request)
+        return result
+
+    def authenticate_header(self, request):
+        # Same challenge the chain produced (its first class was Token), so
+        # unauthenticated requests keep getting 401 rather than 403.
+        return self.token.authenticate_header(request)
@@ -0,0 +1,93 @@
+# backend/user_module/management/commands/benchmark_auth.py
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user, get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+from oauth2_provider.models import get_access_token_model, get_application_model
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user_module.authentication import SchemeDispatchAuthentication, user_cache
+
+User = get_user_model()
+
+CHAINS = {
+    # The DEFAULT_AUTHENTICATION_CLASSES list before dispatching.
+    'chain': [TokenAuthentication, JWTAuthentication, OAuth2Authentication, SessionAuthentication],
+    'dispatch': [SchemeDispatchAuthentication],
+}
+
+
+class Command(BaseCommand):
+    help = 'Measures per-request authentication cost of the old chain against scheme dispatch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        # Fixtures are created inside a transaction that is rolled back.
+        with transaction.atomic():
+            scenarios = self.build_scenarios()
+            self.stdout.write(f"{'scenario':<10} {'auth':<9} {'us/request':>11} {'queries':>8}  outcome")
+            for scenario, request in scenarios.items():
+                for name, classes in CHAINS.items():
+                    user_cache.clear()
+                    micros, queries, outcome = self.measure(request, classes, options['requests'])
+                    self.stdout.write(f'{scenario:<10} {name:<9} {micros:>11.1f} {queries:>8.2f}  {outcome}')
+            transaction.set_rollback(True)
+
+    def build_scenarios(self):
+        user = User.objects.create_user(
+            username='auth-bench', email='auth-bench@example.com', password=None, role='admin'
+        )
+        token = Token.objects.create(user=user)
+        application = get_application_model().objects.create(
+            name='auth-bench', client_type='confidential', authorization_grant_type='password', user=user
+        )
+        oauth2_token = get_access_token_model().objects.create(
+            user=user, application=application, token='authbenchopaquetoken',
+            expires=timezone.now() + timedelta(hours=1), scope='read write',
+        )
+        session = SessionStore()
+        session['_auth_user_id'] = str(user.pk)
+        session['_auth_user_backend'] = 'django.contrib.auth.backends.ModelBackend'
+        session['_auth_user_hash'] = user.get_session_auth_hash()
+        session.create()
+
+        factory = RequestFactory()
+        session_request = factory.get('/api/inventory/products/')
+        session_request.session = SessionStore(session.session_key)
+        session_request.user = SimpleLazyObject(lambda: get_user(session_request))
+        return {
+            'token': factory.get('/api/inventory/products/', HTTP_AUTHORIZATION=f'Token {token.key}'),
+            'jwt': factory.get('/api/inventory/products/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'),
+            'oauth2': factory.get('/api/inventory/products/', HTTP_AUTHORIZATION=f'Bearer {oauth2_token.token}'),
+            'session': session_request,
+            'anonymous': factory.get('/api/inventory/products/'),
+        }
+
+    def measure(self, django_request, classes, count):
+        outcome = None
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            for _ in range(count):
+                # DRF instantiates the authenticators for every request.
+                request = Request(django_request, authenticators=[cls() for cls in classes])
+                try:
+                    outcome = 'authenticated' if request.user.is_authenticated else 'anonymous'
+                except APIException as exc:
+                    outcome = f'rejected ({exc.status_code})'
+            elapsed = time.perf_counter() - started
+        return elapsed / count * 1_000_000, len(context.captured_queries) / count, outcome
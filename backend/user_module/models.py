@@ -22,10 +22,18 @@ class CustomUser(AbstractUser):
 
     bio = models.TextField(blank=True, null=True)
     date_joined = models.DateTimeField(auto_now_add=True)
+    # Bumped by every save(); conditional GETs whose payload shows user
+    # fields (e.g. a sale's sold_by_username) validate against it.
+    updated_at = models.DateTimeField(auto_now=True)
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['updated_at'], name='user_updated_idx'),
+        ]
+
     def __str__(self):
         return self.email
 
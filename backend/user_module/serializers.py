@@ -6,6 +6,8 @@ from allauth.account.adapter import get_adapter
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework.authtoken.models import Token as TokenModel
 
+from backend.fieldsets import SparseFieldsetSerializerMixin
+
 User = get_user_model()
 
 class CustomRegistrationSerializer(serializers.ModelSerializer):
@@ -61,13 +63,13 @@ class CustomLoginSerializer(serializers.Serializer):
         else:
             raise serializers.ValidationError("Must include 'email' and 'password'.")
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'role', 'bio')
         read_only_fields = ('id', 'email')
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class UserDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'role', 'bio', 'date_joined')
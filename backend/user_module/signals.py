@@ -0,0 +1,15 @@
+# backend/user_module/signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers UserDetailAPIView put/delete, profile edits and admin changes.
+    user_cache.invalidate(instance.pk)
@@ -1,3 +1,164 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model, get_application_model
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import CachedJWTAuthentication, SchemeDispatchAuthentication, user_cache
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password=None, role='admin'
+        )
+        self.user = User.objects.create_user(
+            username='user', email='user@example.com', password=None, role='user'
+        )
+
+    def authenticate(self, user):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_second_request_skips_user_lookup(self):
+        self.authenticate(self.user)
+        with self.assertNumQueries(0):
+            resolved = self.authenticate(self.user)
+        self.assertEqual(resolved, self.user)
+        self.assertIsNot(resolved, self.authenticate(self.user))
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_disabled(self):
+        self.authenticate(self.user)
+        with self.assertNumQueries(1):
+            self.authenticate(self.user)
+
+    def test_user_detail_put_and_delete_invalidate(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.admin)}')
+        self.assertEqual(self.authenticate(self.user).role, 'user')
+
+        response = client.put(reverse('user-detail', args=[self.user.pk]), {'role': 'admin'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.authenticate(self.user).role, User.objects.get(pk=self.user.pk).role)
+
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(client.delete(reverse('user-detail', args=[self.user.pk])).status_code, 200)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(client.get(reverse('user-profile')).status_code, 401)
+
+    def test_inactive_user_rejected_after_save(self):
+        self.authenticate(self.user)
+        self.user.is_active = False
+        self.user.save()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.assertEqual(client.get(reverse('user-profile')).status_code, 401)
+
+
+class SchemeDispatchAuthenticationTests(TestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            username='user', email='user@example.com', password=None, role='user'
+        )
+        self.client = APIClient()
+
+    def get_profile(self, authorization=None):
+        if authorization:
+            self.client.credentials(HTTP_AUTHORIZATION=authorization)
+        return self.client.get(reverse('user-profile'))
+
+    def test_selects_backend_by_scheme(self):
+        authenticator = SchemeDispatchAuthentication()
+        factory = APIRequestFactory()
+        cases = [
+            (None, authenticator.session),
+            ('Token abc', authenticator.token),
+            ('Bearer aaa.bbb.ccc', authenticator.jwt),
+            ('Bearer opaque', authenticator.oauth2),
+            ('Basic dXNlcjpwYXNz', None),
+        ]
+        for header, backend in cases:
+            extra = {'HTTP_AUTHORIZATION': header} if header else {}
+            self.assertIs(authenticator.select_backend(factory.get('/', **extra)), backend, header)
+        self.assertIs(authenticator.select_backend(factory.get('/', {'access_token': 'x'})), authenticator.oauth2)
+        self.assertIs(authenticator.select_backend(factory.post('/', {'access_token': 'x'})), authenticator.oauth2)
+
+    def create_oauth2_token(self):
+        application = get_application_model().objects.create(
+            name='client', client_type='confidential', authorization_grant_type='password', user=self.user
+        )
+        return get_access_token_model().objects.create(
+            user=self.user, application=application, token='opaque-token',
+            expires=timezone.now() + timedelta(hours=1), scope='read write',
+        )
+
+    def test_each_scheme_authenticates(self):
+        token = Token.objects.create(user=self.user)
+        oauth2_token = self.create_oauth2_token()
+        for authorization in (
+            f'Token {token.key}',
+            f'Bearer {AccessToken.for_user(self.user)}',
+            f'Bearer {oauth2_token.token}',
+        ):
+            response = self.get_profile(authorization)
+            self.assertEqual(response.status_code, 200, authorization)
+            self.assertEqual(response.data['data']['email'], self.user.email)
+
+    def test_access_token_parameter(self):
+        oauth2_token = self.create_oauth2_token()
+        response = self.client.get(reverse('user-profile'), {'access_token': oauth2_token.token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['email'], self.user.email)
+        self.assertEqual(self.client.get(reverse('user-profile'), {'access_token': 'unknown'}).status_code, 401)
+
+        # A rejected parameter still leaves the session to authenticate.
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('user-profile'), {'access_token': 'unknown'}).status_code, 200)
+
+    def test_session(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.get_profile().status_code, 200)
+
+    def test_unauthenticated_keeps_401(self):
+        self.assertEqual(self.get_profile().status_code, 401)
+        self.assertEqual(self.get_profile('Basic dXNlcjpwYXNz').status_code, 401)
+        self.assertEqual(self.get_profile('Bearer not.a.jwt').status_code, 401)
+
+
+class SparseFieldsetTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password=None, role='admin', bio='Long biography'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_user_list_and_detail(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('user-list'), {'fields': 'email,id'})
+        self.assertEqual(response.json()['data'], [{'id': self.admin.pk, 'email': 'admin@example.com'}])
+        self.assertNotIn('"bio"', context.captured_queries[-1]['sql'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('user-detail', args=[self.admin.pk]), {'fields': 'username'})
+        self.assertEqual(response.json()['data'], {'username': 'admin'})
+        self.assertNotIn('"bio"', context.captured_queries[-1]['sql'])
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse('user-list'), {'fields': 'password'})
+        self.assertEqual(response.status_code, 400)
@@ -11,6 +11,7 @@ from .serializers import (
     CustomLoginSerializer, CustomRegistrationSerializer
 )
 from .permissions import IsUserOrAdmin, IsAdminUser
+from backend.fieldsets import project_queryset, sparse_fields
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
@@ -152,8 +153,9 @@ class UserListAPIView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
+        fields = sparse_fields(request, UserSerializer)
+        users = project_queryset(User.objects.all(), UserSerializer, fields)
+        serializer = UserSerializer(users, many=True, fields=fields)
         return Response({
             'success': True,
             'message': 'Users retrieved successfully',
@@ -165,13 +167,14 @@ class UserListAPIView(APIView):
 class UserDetailAPIView(APIView):
     permission_classes = [IsUserOrAdmin]
 
-    def get_object(self, pk):
-        return get_object_or_404(User, pk=pk)
+    def get_object(self, pk, queryset=None):
+        return get_object_or_404(User if queryset is None else queryset, pk=pk)
     
     def get(self, request, pk):
-        user = self.get_object(pk)
+        fields = sparse_fields(request, UserDetailSerializer)
+        user = self.get_object(pk, project_queryset(User.objects.all(), UserDetailSerializer, fields))
         self.check_object_permissions(request, user)
-        serializer = UserDetailSerializer(user)
+        serializer = UserDetailSerializer(user, fields=fields)
         return Response({
             'success': True,
             'message': 'User details retrieved successfully',
@@ -1,7 +1,7 @@
 // client/src/pages/Dashboard.tsx
 import { useState, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
-import { getLowStockProducts, getProducts, getCategories,Product } from '../services/inventoryService';
+import { getLowStockProducts, getAllProducts, getCategories,Product } from '../services/inventoryService';
 import LoadingSpinner from '../components/LoadingSpinner';
 import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, PieChart, Pie, Cell, Legend } from 'recharts';
 
@@ -44,8 +44,8 @@ const Dashboard = () => {
         const categoriesResponse = await getCategories();
         const categories = categoriesResponse.success ? categoriesResponse.data : [];
         
-        // Fetch general product stats
-        const productsResponse = await getProducts();
+        // Fetch general product stats over every page, not just the first
+        const productsResponse = await getAllProducts();
         if (productsResponse.success) {
           const products = productsResponse.data;
           const activeProducts = products.filter((p: Product) => p.is_active);
@@ -7,6 +7,15 @@ import { useAuth } from '../../contexts/AuthContext';
 import ProductModal from '../../components/inventory/ProductModal';
 import DeleteConfirmationModal from '../../components/DeleteConfirmationModal';
 
+const withCategoryNames = (products: Product[], categories: Category[]): Product[] =>
+  products.map(product => {
+    const category = categories.find(cat => cat.id === product.category);
+    return {
+      ...product,
+      category_name: category ? category.name : 'Unknown'
+    };
+  });
+
 const ProductList = () => {
   const navigate = useNavigate();
   const { user } = useAuth();
@@ -18,6 +27,8 @@ const ProductList = () => {
   const [categories, setCategories] = useState<Category[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   const [showAddModal, setShowAddModal] = useState(false);
   const [editingProduct, setEditingProduct] = useState<Product | null>(null);
@@ -36,15 +47,8 @@ const ProductList = () => {
           getCategories()
         ]);
         
-        const productsWithCategoryNames = productsResponse.data.map(product => {
-          const category = categoriesResponse.data.find(cat => cat.id === product.category);
-          return {
-            ...product,
-            category_name: category ? category.name : 'Unknown'
-          };
-        });
-        
-        setProducts(productsWithCategoryNames);
+        setProducts(withCategoryNames(productsResponse.data, categoriesResponse.data));
+        setNextCursor(productsResponse.next);
         setCategories(categoriesResponse.data);
         setError(null);
       } catch (err) {
@@ -58,6 +62,21 @@ const ProductList = () => {
     fetchData();
   }, [filters]);
   
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const productsResponse = await getProducts(filters, nextCursor);
+      setProducts([...products, ...withCategoryNames(productsResponse.data, categories)]);
+      setNextCursor(productsResponse.next);
+    } catch (err) {
+      setError('Failed to load more products. Please try again.');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+  
   const handleSearch = () => {
     setFilters({
       ...filters,
@@ -316,6 +335,17 @@ const ProductList = () => {
               </tbody>
             </table>
           </div>
+          {nextCursor && (
+            <div className="p-4 text-center border-t border-gray-200">
+              <button
+                className="btn btn-secondary"
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
       
@@ -47,8 +47,12 @@ export interface ProductFilters {
   max_quantity?: number;
   low_stock?: boolean;
   search?: string;
+  page_size?: number;
 }
 
+// The server's INVENTORY_MAX_PAGE_SIZE.
+const MAX_PAGE_SIZE = 500;
+
 export interface ApiResponse<T> {
   success: boolean;
   message: string;
@@ -56,6 +60,38 @@ export interface ApiResponse<T> {
   count?: number;
 }
 
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  page_size: number;
+  results: T[];
+}
+
+export interface PagedResponse<T> extends ApiResponse<T[]> {
+  next: string | null;
+  previous: string | null;
+}
+
+const unwrapPage = <T>(body: ApiResponse<CursorPage<T>>): PagedResponse<T> => ({
+  ...body,
+  data: body.data.results,
+  next: body.data.next,
+  previous: body.data.previous,
+});
+
+// Follows `next` until the last page; for screens that need every row.
+const fetchAllPages = async <T>(first: PagedResponse<T>): Promise<PagedResponse<T>> => {
+  const data = [...first.data];
+  let next = first.next;
+  while (next) {
+    const response = await api.get(next);
+    const page = unwrapPage<T>(response.data);
+    data.push(...page.data);
+    next = page.next;
+  }
+  return { ...first, data, next: null };
+};
+
 // Categories
 export const getCategories = async (): Promise<ApiResponse<Category[]>> => {
   const response = await api.get('/inventory/categories/');
@@ -83,7 +119,12 @@ export const deleteCategory = async (id: number): Promise<ApiResponse<null>> =>
 };
 
 // Products
-export const getProducts = async (filters?: ProductFilters): Promise<ApiResponse<Product[]>> => {
+// `cursor` is the `next`/`previous` link of an earlier page.
+export const getProducts = async (filters?: ProductFilters, cursor?: string | null): Promise<PagedResponse<Product>> => {
+  if (cursor) {
+    const response = await api.get(cursor);
+    return unwrapPage<Product>(response.data);
+  }
   const params = new URLSearchParams();
   
   if (filters) {
@@ -95,7 +136,11 @@ export const getProducts = async (filters?: ProductFilters): Promise<ApiResponse
   }
   
   const response = await api.get(`/inventory/products/?${params.toString()}`);
-  return response.data;
+  return unwrapPage<Product>(response.data);
+};
+
+export const getAllProducts = async (filters?: ProductFilters): Promise<PagedResponse<Product>> => {
+  return fetchAllPages(await getProducts({ ...filters, page_size: MAX_PAGE_SIZE }));
 };
 
 export const getLowStockProducts = async (): Promise<ApiResponse<Product[]>> => {
@@ -124,9 +169,13 @@ export const deleteProduct = async (id: number): Promise<ApiResponse<null>> => {
 };
 
 // Sales
-export const getSales = async (): Promise<ApiResponse<Sale[]>> => {
-  const response = await api.get('/inventory/sales/');
-  return response.data;
+export const getSales = async (cursor?: string | null): Promise<PagedResponse<Sale>> => {
+  const response = await api.get(cursor || '/inventory/sales/');
+  return unwrapPage<Sale>(response.data);
+};
+
+export const getAllSales = async (): Promise<PagedResponse<Sale>> => {
+  return fetchAllPages(await getSales(`/inventory/sales/?page_size=${MAX_PAGE_SIZE}`));
 };
 
 export const getSale = async (id: number): Promise<ApiResponse<Sale>> => {